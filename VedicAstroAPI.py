@@ -6,12 +6,17 @@ from typing import Optional, List, Dict, Sequence, Set, TypedDict
 from pydantic import BaseModel, field_validator, validator
 from fastapi import FastAPI, Response, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
-from concurrent.futures import ThreadPoolExecutor
-from vedicastro import VedicAstro, horary_chart
-from vedicastro.utils import pretty_data_table
+from fastapi.responses import FileResponse, StreamingResponse
+from fastapi.encoders import jsonable_encoder
+from starlette.concurrency import iterate_in_threadpool
+from vedicastro import VedicAstro, horary_chart, transit_engine, transit_cache, result_store, chart_cache
+from vedicastro.utils import pretty_data_table, resolve_time_zone, local_datetime_to_jd, jd_to_local_datetime, jds_to_local_datetime64
 from vedicastro.astrocartography import AstrocartographyCalculator
-from vedicastro.compute_dasha import compute_vimshottari_dasa_enahanced, filter_vimshottari_dasa_by_years, flatten_vimshottari_dasa
+from vedicastro.chart_context import ChartContext
+from vedicastro.dasa_engine import VimshottariDasa, MAX_DASA_LEVEL, RECORDS_CHUNK_SIZE
+from vedicastro.pipeline import Pipeline
+from vedicastro.process_pool import ChartProcessPool
+from vedicastro.single_flight import AsyncSingleFlight
 from d_chart_calculation import (calculate_d2_position,
                                  calculate_d3_position,
                                  calculate_d4_position,
@@ -25,23 +30,29 @@ from d_chart_calculation import (calculate_d2_position,
                                  calculate_d24_position,
                                  calculate_d27_position,
                                  calculate_d30_position,
-                                 calculate_d40_position)
+                                 calculate_d40_position,
+                                 VARGAS,
+                                 get_varga_positions)
 import os
 import csv
-from datetime import datetime, timedelta, date
+import asyncio
+import time
+from datetime import datetime, timedelta, date, timezone
 import io
 from flatlib import const
 from flatlib import aspects
-import concurrent.futures
-from vedicastro.yogas import check_raj_yogas, check_dhana_yogas, check_pancha_mahapurusha_yogas, check_nabhasa_yogas, check_other_yogas
-from vedicastro.extended_yogas import check_additional_benefic_yogas, check_malefic_yogas, check_intellectual_yogas
+from vedicastro.yoga_engine import ChartIndex, evaluate_yogas, YOGA_CATEGORIES
+from vedicastro.yoga_timeline import scan_yoga_timeline, TRANSIT_YOGA_PLANETS
+from vedicastro.ashtakavarga import (ASHTAKAVARGA_PLANETS, CONTRIBUTORS as ASHTAKAVARGA_CONTRIBUTORS,
+                                     calculate_bhinnashtakavarga, calculate_sarvashtakavarga, score_transits,
+                                     sample_transit_signs)
 import json
 import pandas as pd
 import numpy as np
 from flatlib.datetime import Datetime
 from flatlib.geopos import GeoPos
 from flatlib.chart import Chart
-from transit_tools import merge_transits_for_dasha
+from transit_tools import join_transits_for_dashas
 
 app = FastAPI()
 
@@ -80,6 +91,113 @@ class HoraryChartInput(BaseModel):
     house_system: str = "Placidus"
     return_style: Optional[str] = None
 
+def get_chart_context(horo_input: ChartInput):
+    """
+    Returns a ChartContext for the chart configuration of a ChartInput. Handlers that need several views of
+    the same chart should create the context once and pass it down, so that each chart is computed only once.
+    """
+    return ChartContext(year=horo_input.year, month=horo_input.month, day=horo_input.day,
+                        hour=horo_input.hour, minute=horo_input.minute, second=horo_input.second,
+                        tz=horo_input.utc, latitude=horo_input.latitude, longitude=horo_input.longitude,
+                        ayanamsa=horo_input.ayanamsa, house_system=horo_input.house_system)
+
+def get_chart_input_key(horo_input: ChartInput):
+    """Returns the canonical chart key of a ChartInput, under which its results are stored in the result store"""
+    return result_store.canonical_chart_key(horo_input.year, horo_input.month, horo_input.day, horo_input.hour,
+                                            horo_input.minute, horo_input.second, horo_input.latitude,
+                                            horo_input.longitude, horo_input.utc, horo_input.ayanamsa,
+                                            horo_input.house_system)
+
+def run_with_chart_context(builder, horo_input: ChartInput, *args):
+    """
+    Entry point of chart jobs dispatched to the process pool: creates the ChartContext of `horo_input`
+    in the worker and returns `builder(chart_context, *args)`.
+    When the result store is enabled, the result is read from / written to it, keyed by the builder name.
+    """
+    store = result_store.get_result_store()
+    if store is None:
+        return builder(get_chart_context(horo_input), *args)
+    return store.get_or_compute(builder.__name__, get_chart_input_key(horo_input), args,
+                                lambda: builder(get_chart_context(horo_input), *args))
+
+## Identical chart jobs in flight at the same time (Eg: the parallel requests of a client opening a profile)
+## share one pool job
+chart_jobs = AsyncSingleFlight()
+
+async def run_chart_job(builder, horo_input: ChartInput, *args):
+    """
+    Runs `builder(chart_context, *args)` for the chart of `horo_input` on the process pool. A job identical to
+    one already in flight (same builder, chart input and arguments) awaits the result of that job instead.
+    """
+    key = (builder.__name__, horo_input.model_dump_json(), json.dumps(args, default=str))
+    return await chart_jobs.run(key, chart_pool.run, run_with_chart_context, builder, horo_input, *args)
+
+## Formats of the streamed list responses
+STREAM_FORMATS = {"ndjson": "application/x-ndjson", "json": "application/json"}
+
+def streaming_records_response(records, stream_format: str = "ndjson"):
+    """
+    Streams an iterable or an async iterable of records as they are produced, as NDJSON lines or as a chunked
+    JSON array, so that the client gets the first record immediately and the full list is never held in memory.
+    Plain iterables are iterated in a thread, so they must not compute charts (use `iter_pool_chunks` instead).
+    An error while producing the records is sent as a last {"status": "error", "message"} record.
+    """
+    if stream_format not in STREAM_FORMATS:
+        raise HTTPException(status_code=400, detail=f"stream_format must be one of {', '.join(STREAM_FORMATS)}")
+    async def json_records():
+        try:
+            async for record in records if hasattr(records, "__aiter__") else iterate_in_threadpool(records):
+                yield json.dumps(jsonable_encoder(record))
+        except Exception as e:
+            yield json.dumps({"status": "error", "message": str(e)})
+
+    async def chunks():
+        if stream_format == "ndjson":
+            async for record in json_records():
+                yield record + "\n"
+        else:
+            yield "["
+            index = 0
+            async for record in json_records():
+                yield record if index == 0 else "," + record
+                index += 1
+            yield "]"
+
+    return StreamingResponse(chunks(), media_type=STREAM_FORMATS[stream_format])
+
+async def iter_pool_chunks(func, chunks_args):
+    """
+    Yields the records of `func(*args)` (a list) for each tuple of arguments of `chunks_args`, computed on the
+    process pool chunk by chunk, for the streamed responses. The next chunk is computed while the records of
+    the current one are sent, and is cancelled if the client disconnects.
+    """
+    chunks_args = iter(chunks_args)
+    def submit():
+        args = next(chunks_args, None)
+        return None if args is None else asyncio.ensure_future(chart_pool.run(func, *args))
+
+    pending = submit()
+    try:
+        while pending is not None:
+            records = await pending
+            pending = submit()
+            for record in records:
+                yield record
+    finally:
+        if pending is not None:
+            pending.cancel()
+
+## Worker processes for the CPU-bound handlers, so that heavy requests don't block the event loop
+chart_pool = ChartProcessPool()
+
+@app.on_event("startup")
+async def start_chart_pool():
+    await asyncio.to_thread(chart_pool.wait_ready)
+
+@app.on_event("shutdown")
+async def shutdown_chart_pool():
+    chart_pool.shutdown()
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -94,6 +212,25 @@ async def read_root():
     return {"message": "Welcome to VedicAstro FastAPI Service!",
             "info": "Visit http://127.0.0.1:8088/docs to test the API functions"}
 
+@app.get("/get_pool_stats")
+async def get_pool_stats():
+    """Returns the process pool configuration, queue depth and job counters, and the coalesced chart jobs"""
+    return {**chart_pool.get_stats(), "coalescing": chart_jobs.get_stats()}
+
+@app.get("/get_chart_cache_stats")
+async def get_chart_cache_stats():
+    """
+    Returns the size and hit / miss counters of the in-memory chart cache of the server process and of one
+    worker process of the pool
+    """
+    return {"server": chart_cache.get_stats(), "worker": await chart_pool.run(chart_cache.get_stats)}
+
+@app.get("/get_result_store_stats")
+async def get_result_store_stats():
+    """Returns the size of the result store per endpoint and the hit / miss counters of the server process"""
+    store = result_store.get_result_store()
+    return store.get_stats() if store is not None else {"enabled": False}
+
 
 @app.post("/get_vimshottari_dasa")
 async def get_chart_data(horo_input: ChartInput):
@@ -101,21 +238,35 @@ async def get_chart_data(horo_input: ChartInput):
     Generates all data for a given time and location, based on the selected ayanamsa & house system
     """
 
-    vimshottari_dasa = compute_vimshottari_dasa_enahanced(
-        horo_input.year,
-        horo_input.month,
-        horo_input.day,
-        horo_input.hour,
-        horo_input.minute,
-        horo_input.second,
-        horo_input.latitude,
-        horo_input.longitude,
-        horo_input.utc,
-        horo_input.ayanamsa,
-        horo_input.house_system
-    )
+    return await run_chart_job(build_vimshottari_dasa, horo_input)
+
+def build_vimshottari_dasa(chart_context: ChartContext):
+    return chart_context.vimshottari_dasa
 
-    return vimshottari_dasa
+@app.post("/get_vimshottari_dasa_dump")
+async def get_vimshottari_dasa_dump(horo_input: ChartInput, level: int = MAX_DASA_LEVEL, stream: bool = False,
+                                    stream_format: str = "ndjson", date_format: str = "%Y-%m-%d"):
+    """
+    Returns all the dasa periods of a level (1: Maha Dasa ... 5: Prana, 9^level periods) as a flat chronological
+    list of records. With `stream=true` the records are formatted on the process pool in chunks of
+    RECORDS_CHUNK_SIZE periods and streamed as NDJSON lines or a JSON array (`stream_format`).
+    """
+    if not 1 <= level <= MAX_DASA_LEVEL:
+        raise HTTPException(status_code=400, detail=f"level must be between 1 and {MAX_DASA_LEVEL}")
+    if not stream:
+        return await run_chart_job(build_vimshottari_dasa_dump, horo_input, level, date_format)
+    count = 9 ** level
+    record_chunks = [(build_vimshottari_dasa_records, horo_input, level, date_format,
+                      first, min(first + RECORDS_CHUNK_SIZE, count))
+                     for first in range(0, count, RECORDS_CHUNK_SIZE)]
+    return streaming_records_response(iter_pool_chunks(run_with_chart_context, record_chunks), stream_format)
+
+def build_vimshottari_dasa_dump(chart_context: ChartContext, level: int, date_format: str):
+    return chart_context.dasa.to_records(level, date_format)
+
+def build_vimshottari_dasa_records(chart_context: ChartContext, level: int, date_format: str, first: int, last: int):
+    """Returns the dasa records of the periods `first` to `last` (excluded) of a level, for the streamed dump"""
+    return chart_context.dasa.to_records(level, date_format, indices=np.arange(first, last))
 
 class VimshottariDasaDataRequest(BaseModel):
     horo_input:ChartInput
@@ -131,52 +282,82 @@ async def get_vimshottari_dasa_data(vimshottari_dasa_data_request: VimshottariDa
     Returns a flattened list of dashas with only entries where mahadasha, antardasha, and pratyantardasha are all present.
     Includes age_at_start for each dasha period.
     """
-    # Get complete vimshottari dasa data
-    vimshottari_dasa = compute_vimshottari_dasa_enahanced(
-        vimshottari_dasa_data_request.horo_input.year,
-        vimshottari_dasa_data_request.horo_input.month,
-        vimshottari_dasa_data_request.horo_input.day,
-        vimshottari_dasa_data_request.horo_input.hour,
-        vimshottari_dasa_data_request.horo_input.minute,
-        vimshottari_dasa_data_request.horo_input.second,
-        vimshottari_dasa_data_request.horo_input.latitude,
-        vimshottari_dasa_data_request.horo_input.longitude,
-        vimshottari_dasa_data_request.horo_input.utc,
-        vimshottari_dasa_data_request.horo_input.ayanamsa,
-        vimshottari_dasa_data_request.horo_input.house_system
-    )
+    return await run_chart_job(build_vimshottari_dasa_data,
+                                vimshottari_dasa_data_request.horo_input,
+                                vimshottari_dasa_data_request.start_year,
+                                vimshottari_dasa_data_request.end_year,
+                                vimshottari_dasa_data_request.birth_date)
 
-    # Filter the dasa data by start and end years
-    filtered_dasa = filter_vimshottari_dasa_by_years(
-        vimshottari_dasa,
-        vimshottari_dasa_data_request.start_year,
-        vimshottari_dasa_data_request.end_year
-    )
+def build_vimshottari_dasa_data(chart_context: ChartContext, start_year: int, end_year: int, birth_date: str):
+    """Builds the `/get_vimshottari_dasa_data` response from the (memoized) dasa of a ChartContext"""
+    return get_vimshottari_dasa_records(chart_context.dasa, start_year, end_year, birth_date)
+
+def get_vimshottari_dasa_records(dasa: VimshottariDasa, start_year: int, end_year: int, birth_date: str):
+    """
+    Returns the pratyantar dasas of the maha dasas overlapping the start and end years, whose age at start is
+    between 18 and 35, as a flat list of dicts with the age_at_start
+    """
+    maha_dasas, pratyantars = dasa.get_level(1), dasa.get_level(3)
 
-    # Flatten the dasa data structure
-    flattened_dasa = flatten_vimshottari_dasa(filtered_dasa)
+    # Filter the maha dasas overlapping the start and end years (on their local dates)
+    maha_start_years = dasa.format_dates(maha_dasas.start_jds, "%Y")
+    maha_end_years = dasa.format_dates(maha_dasas.end_jds, "%Y")
+    maha_mask = np.array([int(start) <= end_year and int(end) >= start_year
+                          for start, end in zip(maha_start_years, maha_end_years)])
 
-    # Filter to include only entries with all three levels present
-    complete_entries = [dasa for dasa in flattened_dasa if dasa['mahadasha'] and dasa['antardasha'] and dasa['pratyantardasha']]
+    # Calculate age at start (in years with decimal precision) of each pratyantar dasa, from its local start date
+    birth_day = np.datetime64(datetime.strptime(birth_date, "%Y-%m-%d").date(), "D")
+    start_days = jds_to_local_datetime64(pratyantars.start_jds, dasa.time_zone).astype("datetime64[D]")
+    ages = np.round((start_days - birth_day).astype(int) / 365.25, 2)
 
-    # Parse birth date
-    birth_date = datetime.strptime(vimshottari_dasa_data_request.birth_date, "%Y-%m-%d")
+    # Keep the pratyantar dasas of the selected maha dasas, where the age at start is between 18 and 35
+    mask = np.repeat(maha_mask, 81) & (ages >= 18) & (ages <= 35)
+    filtered_entries = dasa.to_records(3, "%Y-%m-%d", mask)
+    for entry, age in zip(filtered_entries, ages[mask].tolist()):
+        entry['age_at_start'] = age
 
-    # Calculate age at start for each period and convert dates to ISO format
-    for dasa in complete_entries:
-        # Calculate age at start (in years with decimal precision)
-        days_diff = (dasa['start_date'] - birth_date).days
-        dasa['age_at_start'] = round(days_diff / 365.25, 2)
+    return filtered_entries
 
-        # Convert datetime objects to ISO strings
-        dasa['start_date'] = dasa['start_date'].strftime('%Y-%m-%d')
-        dasa['end_date'] = dasa['end_date'].strftime('%Y-%m-%d')
 
-    # Filter out dashas where age was smaller than 20
-    filtered_entries = [dasa for dasa in complete_entries if dasa['age_at_start'] >= 18 and dasa['age_at_start'] <=35]
+class RunningDasaRequest(BaseModel):
+    horo_input: ChartInput
+    timestamps: List[str]
+    level: int = 4
+    date_format: str = "%Y-%m-%d"
 
 
-    return filtered_entries
+@app.post("/get_running_dasa")
+async def get_running_dasa(running_dasa_request: RunningDasaRequest):
+    """
+    Returns the dasa periods (mahadasha, antardasha, pratyantardasha, sookshma ... down to `level`) running at each
+    of the given ISO timestamps, in the same order, with the start and end dates of the innermost period.
+    Timestamps without a UTC offset are taken in the birth chart's timezone. Instants outside the dasa return null.
+    """
+    if not 1 <= running_dasa_request.level <= MAX_DASA_LEVEL:
+        raise HTTPException(status_code=400, detail=f"level must be between 1 and {MAX_DASA_LEVEL}")
+    try:
+        date_times = [datetime.fromisoformat(timestamp) for timestamp in running_dasa_request.timestamps]
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid timestamp: {e}")
+    return await run_chart_job(build_running_dasa,
+                                running_dasa_request.horo_input,
+                                date_times,
+                                running_dasa_request.level,
+                                running_dasa_request.date_format)
+
+def build_running_dasa(chart_context: ChartContext, date_times: List[datetime], level: int, date_format: str):
+    """Builds the `/get_running_dasa` response with a vectorized lookup in the (memoized) dasa of a ChartContext"""
+    dasa = chart_context.dasa
+    jds = [datetime_to_jd(date_time, dasa.time_zone) for date_time in date_times]
+    running_periods = dasa.get_running_periods(jds, level, date_format)
+    return [{"timestamp": date_time.isoformat(), "periods": periods}
+            for date_time, periods in zip(date_times, running_periods)]
+
+def datetime_to_jd(date_time: datetime, time_zone: str):
+    """Converts a datetime to a Julian Day (UT). Naive datetimes are local to `time_zone`"""
+    if date_time.tzinfo is None:
+        return local_datetime_to_jd(date_time, time_zone)
+    return local_datetime_to_jd(date_time.astimezone(timezone.utc).replace(tzinfo=None), "UTC")
 
 
 @app.post("/get_dasha_data")
@@ -185,21 +366,7 @@ async def get_chart_data(horo_input: ChartInput):
     Generates all data for a given time and location, based on the selected ayanamsa & house system
     """
 
-    vimshottari_dasa = compute_vimshottari_dasa_enahanced(
-        horo_input.year,
-        horo_input.month,
-        horo_input.day,
-        horo_input.hour,
-        horo_input.minute,
-        horo_input.second,
-        horo_input.latitude,
-        horo_input.longitude,
-        horo_input.utc,
-        horo_input.ayanamsa,
-        horo_input.house_system
-    )
-
-    return vimshottari_dasa
+    return await run_chart_job(build_vimshottari_dasa, horo_input)
 
 
 @app.post("/get_chart_data")
@@ -208,18 +375,7 @@ async def get_chart_data(horo_input: ChartInput):
     Generates all data for a given time and location as per KP Astrology system
     Returns data as a list of dictionaries with named fields for each planet/point
     """
-    horoscope = VedicAstro.VedicHoroscopeData(year=horo_input.year, month=horo_input.month, day=horo_input.day,
-                                           hour=horo_input.hour, minute=horo_input.minute, second=horo_input.second,
-                                           tz=horo_input.utc, latitude=horo_input.latitude, longitude=horo_input.longitude,
-                                           ayanamsa=horo_input.ayanamsa, house_system=horo_input.house_system)
-    chart = horoscope.generate_chart()
-    planets_data = horoscope.get_planets_data_from_chart(chart)
-    houses_data = horoscope.get_houses_data_from_chart(chart)
-    consolidated_chart_data = horoscope.get_consolidated_chart_data(planets_data=planets_data,
-                                                                    houses_data=houses_data,
-                                                                    return_style = horo_input.return_style)
-
-    return format_consolidated_chart_data(consolidated_chart_data)
+    return await run_chart_job(build_chart_data, horo_input, horo_input.return_style)
     # # Convert NamedTuple to list of dictionaries with named fields
     # formatted_data = []
     # for planet in planets_data:
@@ -243,35 +399,26 @@ async def get_chart_data(horo_input: ChartInput):
     # return (formatted_data)
 
 
+def build_chart_data(chart_context: ChartContext, return_style: str = None):
+    consolidated_chart_data = chart_context.get_consolidated_chart_data(return_style=return_style)
+    return format_consolidated_chart_data(consolidated_chart_data)
+
+
 @app.post("/get_rashi_chart_data")
 async def get_rashi_chart_data(horo_input: ChartInput):
-    horoscope = VedicAstro.VedicHoroscopeData(
-        year=horo_input.year,
-        month=horo_input.month,
-        day=horo_input.day,
-        hour=horo_input.hour,
-        minute=horo_input.minute,
-        second=horo_input.second,
-        tz=horo_input.utc,
-        latitude=horo_input.latitude,
-        longitude=horo_input.longitude,
-        ayanamsa="Lahiri",
-        house_system="Equal"
-    )
+    return await run_chart_job(build_rashi_chart_data, horo_input)
 
-    # Generate the chart
-    chart = horoscope.generate_chart()
-
-    # Get planets and houses data
-    planets_data = horoscope.get_planets_data_from_chart(chart)
-    houses_data = horoscope.get_houses_data_from_chart(chart)
+def build_rashi_chart_data(chart_context: ChartContext):
+    """
+    Builds the rasi chart (Lahiri ayanamsa, Equal houses) of the birth data of a ChartContext.
+    The result is memoized on the Lahiri / Equal sibling context.
+    """
+    return chart_context.with_settings("Lahiri", "Equal").memoize("rashi_chart", format_rashi_chart_data)
 
+def format_rashi_chart_data(chart_context: ChartContext):
+    """Groups the houses and planets of a chart by sign (rasi)"""
     # Add consolidated chart data by sign (rasi)
-    consolidated_chart_data = horoscope.get_consolidated_chart_data(
-        planets_data=planets_data,
-        houses_data=houses_data,
-        return_style="dataframe_records"
-    )
+    consolidated_chart_data = chart_context.get_consolidated_chart_data(return_style="dataframe_records")
 
     # Reformat the consolidated chart data to be more readable
     reformatted_chart_data = []
@@ -315,26 +462,13 @@ async def get_kp_data(horo_input: ChartInput):
     Returns both planets and cusps with their detailed positions and lord information.
     Also includes comprehensive KP significator analysis including sub-lord relationships.
     """
-    horoscope = VedicAstro.VedicHoroscopeData(
-        year=horo_input.year,
-        month=horo_input.month,
-        day=horo_input.day,
-        hour=horo_input.hour,
-        minute=horo_input.minute,
-        second=horo_input.second,
-        tz=horo_input.utc,
-        latitude=horo_input.latitude,
-        longitude=horo_input.longitude,
-        ayanamsa=horo_input.ayanamsa,
-        house_system=horo_input.house_system
-    )
-
-    # Generate the chart
-    chart = horoscope.generate_chart()
+    return await run_chart_job(build_kp_data, horo_input)
 
+def build_kp_data(chart_context: ChartContext):
+    """Builds the `/get_kp_data` response from a ChartContext"""
     # Get planets and houses data
-    planets_data = horoscope.get_planets_data_from_chart(chart)
-    houses_data = horoscope.get_houses_data_from_chart(chart)
+    planets_data = chart_context.planets_data
+    houses_data = chart_context.houses_data
 
     # Format both planets and houses data with detailed information
     formatted_data = {
@@ -380,14 +514,13 @@ async def get_kp_data(horo_input: ChartInput):
         formatted_data["cusps"].append(house_dict)
 
     # Calculate planetary aspects for KP analysis
-    aspects = horoscope.get_planetary_aspects(chart)
-    formatted_data["aspects"] = aspects
+    formatted_data["aspects"] = chart_context.aspects
 
-    formatted_data["rasi_chart"] = await get_rashi_chart_data(horo_input)
+    formatted_data["rasi_chart"] = build_rashi_chart_data(chart_context)
 
     # Generate significators for KP analysis with more descriptive names
-    planet_significators = horoscope.get_planet_wise_significators(planets_data, houses_data)
-    house_significators = horoscope.get_house_wise_significators(planets_data, houses_data)
+    planet_significators = chart_context.planet_significators
+    house_significators = chart_context.house_significators
 
     # Convert planet significators with descriptive names
     formatted_planet_significators = []
@@ -556,47 +689,88 @@ OBSTRUCTION_HOUSES = {1, 6, 10}
 SUPPORT_HOUSES     = {5, 8, 12}
 
 
-async def apply_transit_to_dasa_and_chart(horo_input: ChartInput, planets: list, planet_significators_map: dict):
+## Planets whose transits the marriage windows can use: the slow movers and any marriage significator planet
+MARRIAGE_TRANSIT_PLANETS = ["Sun", "Moon", "Mars", "Mercury", "Jupiter", "Venus", "Saturn", "Rahu", "Ketu"]
+
+def get_marriage_pipeline(horo_input: ChartInput):
     """
-    Applies the Vishmottari Dasa system to the given chart.
+    Declares the marriage windows pipeline. The natal KP chart (with its rashi chart, and the moon longitude used
+    by the dasa) is computed once in the "natal" stage. The transits don't depend on it and run concurrently
+    with it. They are computed for all MARRIAGE_TRANSIT_PLANETS, so that they don't wait for the marriage
+    planets: find_marriage_windows only uses those of the slow movers and the marriage planets.
     """
-    vishmottari_dasa = await get_vimshottari_dasa_data(VimshottariDasaDataRequest(
-        horo_input=horo_input,
-        start_year=horo_input.year + 18,
-        end_year=horo_input.year + 35,
-        birth_date=f"{horo_input.year}-{horo_input.month}-{horo_input.day}"
-    ))
-
-    transit_data = await generate_compact_transit_data(TransitDataRequest(
+    pipeline = Pipeline("marriage")
+    pipeline.add_stage("natal", build_marriage_natal_data, horo_input)
+    pipeline.add_stage("transits", build_compact_transit_data, TransitDataRequest(
         horo_input=horo_input,
         start_year=horo_input.year + 18,
         end_year=horo_input.year + 35,
-        birth_date=f"{horo_input.year}-{horo_input.month}-{horo_input.day}",
-        planets=list(set(planets + ["Jupiter", "Saturn", "Rahu", "Ketu", "Sun", "Venus"]))
+        planets=MARRIAGE_TRANSIT_PLANETS
     ))
+    pipeline.add_stage("dasha", build_marriage_dasa_data, horo_input, requires=["natal"])
+    pipeline.add_stage("windows", build_marriage_windows, requires=["natal", "dasha", "transits"])
+    return pipeline
 
-
-    rashi_chart = await get_rashi_chart_data(horo_input)
-
-    # Extract unique mahadasha planets
-    mahadasha_planets = []
-    mahadasha_set = set()
-
-    for dasa in vishmottari_dasa:
-        if dasa["mahadasha"] not in mahadasha_set:
-            mahadasha_set.add(dasa["mahadasha"])
-            mahadasha_planets.append(dasa["mahadasha"])
-
-    result = find_marriage_windows(vishmottari_dasa, transit_data['transit_data'], planets, rashi_chart, planet_significators_map)
-
-    return result
+def build_marriage_natal_data(horo_input: ChartInput):
+    """
+    Natal stage of the marriage pipeline: the marriage significator planets and the rashi chart of the KP data,
+    and the inputs of the dasa (birth instant, moon longitude and timezone), from a single chart
+    """
+    chart_context = get_chart_context(horo_input)
+    kp_data = build_kp_data(chart_context)
+    marriage_planets, planet_significators_map = get_marriage_planets(kp_data)
+    dasa = chart_context.dasa
+    return {"marriage_planets": marriage_planets, "planet_significators_map": planet_significators_map,
+            "rasi_chart": kp_data["rasi_chart"], "birth_jd": dasa.birth_jd, "moon_lon": dasa.moon_lon, "time_zone": dasa.time_zone}
+
+def build_marriage_dasa_data(horo_input: ChartInput, natal_data: dict):
+    """Dasa stage of the marriage pipeline: the pratyantar dasas starting between the ages of 18 and 35"""
+    dasa = VimshottariDasa(natal_data["birth_jd"], natal_data["moon_lon"], natal_data["time_zone"])
+    return get_vimshottari_dasa_records(dasa, horo_input.year + 18, horo_input.year + 35,
+                                        f"{horo_input.year}-{horo_input.month}-{horo_input.day}")
+
+def build_marriage_windows(natal_data: dict, dasa_data: list, transit_data: dict):
+    """Final stage of the marriage pipeline: ranks the dasa periods with the transits over the rashi chart"""
+    return find_marriage_windows(dasa_data, transit_data['transit_data'], natal_data["marriage_planets"],
+                                 natal_data["rasi_chart"], natal_data["planet_significators_map"])
 
 @app.post("/get_marriage_significate_planets")
-async def get_marriage_significate_planets(horo_input: ChartInput):
+async def get_marriage_significate_planets(horo_input: ChartInput, response: Response):
     """
     Generates the marriage significant planets data.
+    The independent stages run concurrently on the worker pool, their wall times are returned in the
+    `Server-Timing` response header. With the result store enabled, a stored result is returned directly (with a
+    "result_store" hit timing). The store is read and written in a thread, off the event loop.
+    """
+    lookup_start = time.perf_counter()
+    windows = await asyncio.to_thread(get_stored_marriage_windows, horo_input)
+    if windows is not result_store.MISSING:
+        response.headers["Server-Timing"] = f'result_store;desc="hit";dur={(time.perf_counter() - lookup_start) * 1000:.1f}'
+        return windows
+    pipeline = get_marriage_pipeline(horo_input)
+    results = await pipeline.run(chart_pool.run)
+    response.headers["Server-Timing"] = pipeline.server_timing()
+    await asyncio.to_thread(put_stored_marriage_windows, horo_input, results["windows"])
+    return results["windows"]
+
+def get_stored_marriage_windows(horo_input: ChartInput):
+    """Returns the stored marriage windows of a chart, or result_store.MISSING (also when the store is disabled)"""
+    store = result_store.get_result_store()
+    if store is None:
+        return result_store.MISSING
+    return store.get("marriage_significate_planets", get_chart_input_key(horo_input))
+
+def put_stored_marriage_windows(horo_input: ChartInput, windows: list):
+    """Stores the marriage windows of a chart when the result store is enabled"""
+    store = result_store.get_result_store()
+    if store is not None:
+        store.put("marriage_significate_planets", get_chart_input_key(horo_input), (), windows)
+
+def get_marriage_planets(kp_data: dict):
+    """
+    Returns the marriage significator planets of the KP data, and the house significations of each planet,
+    its nakshatra lord and its sub lord
     """
-    kp_data = await get_kp_data(horo_input)
     planets_data = kp_data["planets"]
     planet_significators = kp_data["planet_significators"]
     rashi_chart = kp_data["rasi_chart"]
@@ -830,18 +1004,7 @@ async def get_marriage_significate_planets(horo_input: ChartInput):
     # Get unique marriage planets
     unique_marriage_planets = list(dict.fromkeys(marriage_planets))
 
-    # Get unique mahadasha planets
-    result= await apply_transit_to_dasa_and_chart(horo_input, unique_marriage_planets,planets_with_nakshatra_and_sub_lord)
-    return result
-    return {
-        "number_of_periods": len(result),
-        "result": result
-    }
-    return {
-       "planets_with_nakshatra_and_sub_lord": planets_with_nakshatra_and_sub_lord,
-       "planet_strength_data": planet_strength_data,
-       "marriage_planets": unique_marriage_planets,
-    }
+    return unique_marriage_planets, planets_with_nakshatra_and_sub_lord
 
 
 
@@ -882,16 +1045,18 @@ def find_marriage_windows(dasha_list, transit_list, marriage_significators_plane
 
     slow_moving_planets = slow_moving_planets + fast_moving_planets
 
-    for dasha in valid_dasha_list:
-        uniq, simult = merge_transits_for_dasha(
-            transit_list=transit_list,
-            dasha=dasha,
-            slow_moving_planets=slow_moving_planets,
-            rashi_lords_map=rashi_lords_map,
-            min_duration_days=10,
-            min_simult_planets=2,
-            filter_houses=MARRIAGE_HOUSES
-        )
+    # Join all the dasha slices against the transits with one shared transit index
+    merged_transits = join_transits_for_dashas(
+        transit_list=transit_list,
+        dashas=valid_dasha_list,
+        slow_moving_planets=set(slow_moving_planets),
+        rashi_lords_map=rashi_lords_map,
+        min_duration_days=10,
+        min_simult_planets=2,
+        filter_houses=MARRIAGE_HOUSES
+    )
+
+    for dasha, (uniq, simult) in zip(valid_dasha_list, merged_transits):
         dasha["simultaneous_windows"] = simult
 
         # Analyze double transits of Jupiter and Saturn on marriage houses
@@ -1109,26 +1274,12 @@ async def get_kp_chart_with_cusps(horo_input: ChartInput):
     Generates KP Astrology data for a given time and location including house cusps.
     Returns both planets and cusps with their detailed positions and lord information.
     """
-    horoscope = VedicAstro.VedicHoroscopeData(
-        year=horo_input.year,
-        month=horo_input.month,
-        day=horo_input.day,
-        hour=horo_input.hour,
-        minute=horo_input.minute,
-        second=horo_input.second,
-        tz=horo_input.utc,
-        latitude=horo_input.latitude,
-        longitude=horo_input.longitude,
-        ayanamsa=horo_input.ayanamsa,
-        house_system=horo_input.house_system
-    )
-
-    # Generate the chart
-    chart = horoscope.generate_chart()
+    return await run_chart_job(build_kp_chart_with_cusps, horo_input)
 
+def build_kp_chart_with_cusps(chart_context: ChartContext):
     # Get planets and houses data
-    planets_data = horoscope.get_planets_data_from_chart(chart)
-    houses_data = horoscope.get_houses_data_from_chart(chart)
+    planets_data = chart_context.planets_data
+    houses_data = chart_context.houses_data
 
     # Format both planets and houses data with detailed information
     formatted_data = {
@@ -1174,15 +1325,14 @@ async def get_kp_chart_with_cusps(horo_input: ChartInput):
         formatted_data["cusps"].append(house_dict)
 
     # Calculate planetary aspects for KP analysis
-    aspects = horoscope.get_planetary_aspects(chart)
-    formatted_data["aspects"] = aspects
+    formatted_data["aspects"] = chart_context.aspects
 
 
-    formatted_data["rasi_chart"] = await get_rashi_chart_data(horo_input)
+    formatted_data["rasi_chart"] = build_rashi_chart_data(chart_context)
 
     # Generate significators for KP analysis with more descriptive names
-    planet_significators = horoscope.get_planet_wise_significators(planets_data, houses_data)
-    house_significators = horoscope.get_house_wise_significators(planets_data, houses_data)
+    planet_significators = chart_context.planet_significators
+    house_significators = chart_context.house_significators
 
     # Convert planet significators with descriptive names
     formatted_planet_significators = []
@@ -1239,15 +1389,10 @@ async def get_chart_data(horo_input: ChartInput, method: str = "yavana"):
     """
     Generates the Hora (D-2) chart data as per the selected method.
     """
-    # Generate the natal chart using the VedicAstro library
-    horoscope = VedicAstro.VedicHoroscopeData(
-        year=horo_input.year, month=horo_input.month, day=horo_input.day,
-        hour=horo_input.hour, minute=horo_input.minute, second=horo_input.second,
-        tz=horo_input.utc, latitude=horo_input.latitude, longitude=horo_input.longitude,
-        ayanamsa=horo_input.ayanamsa, house_system=horo_input.house_system
-    )
-    chart = horoscope.generate_chart()
-    planets_data = horoscope.get_planets_data_from_chart(chart)
+    return await run_chart_job(build_d2_chart_data, horo_input)
+
+def build_d2_chart_data(chart_context: ChartContext):
+    planets_data = chart_context.planets_data
 
     # Format the natal chart data into a list of dictionaries
     formatted_data = []
@@ -1287,15 +1432,10 @@ async def get_d3_chart_data(horo_input: ChartInput, method: str = "yavana"):
     """
     Generates the Drekkana (D-3) chart data as per the selected method.
     """
-    # Generate the natal chart using the VedicAstro library
-    horoscope = VedicAstro.VedicHoroscopeData(
-        year=horo_input.year, month=horo_input.month, day=horo_input.day,
-        hour=horo_input.hour, minute=horo_input.minute, second=horo_input.second,
-        tz=horo_input.utc, latitude=horo_input.latitude, longitude=horo_input.longitude,
-        ayanamsa=horo_input.ayanamsa, house_system=horo_input.house_system
-    )
-    chart = horoscope.generate_chart()
-    planets_data = horoscope.get_planets_data_from_chart(chart)
+    return await run_chart_job(build_d3_chart_data, horo_input)
+
+def build_d3_chart_data(chart_context: ChartContext):
+    planets_data = chart_context.planets_data
 
     # Format the natal chart data into a list of dictionaries
     formatted_data = []
@@ -1334,15 +1474,10 @@ async def get_d4_chart_data(horo_input: ChartInput):
     """
     Generates the Chaturthamsa (D-4) chart data as per Yavana Paddhati.
     """
-    # Generate the natal chart using the VedicAstro library
-    horoscope = VedicAstro.VedicHoroscopeData(
-        year=horo_input.year, month=horo_input.month, day=horo_input.day,
-        hour=horo_input.hour, minute=horo_input.minute, second=horo_input.second,
-        tz=horo_input.utc, latitude=horo_input.latitude, longitude=horo_input.longitude,
-        ayanamsa=horo_input.ayanamsa, house_system=horo_input.house_system
-    )
-    chart = horoscope.generate_chart()
-    planets_data = horoscope.get_planets_data_from_chart(chart)
+    return await run_chart_job(build_d4_chart_data, horo_input)
+
+def build_d4_chart_data(chart_context: ChartContext):
+    planets_data = chart_context.planets_data
 
     # Format the natal chart data into a list of dictionaries
     formatted_data = []
@@ -1381,15 +1516,10 @@ async def get_d5_chart_data(horo_input: ChartInput):
     """
     Generates the Panchamsha (D-5) chart data as per Yavana Paddhati.
     """
-    # Generate the natal chart using the VedicAstro library
-    horoscope = VedicAstro.VedicHoroscopeData(
-        year=horo_input.year, month=horo_input.month, day=horo_input.day,
-        hour=horo_input.hour, minute=horo_input.minute, second=horo_input.second,
-        tz=horo_input.utc, latitude=horo_input.latitude, longitude=horo_input.longitude,
-        ayanamsa=horo_input.ayanamsa, house_system=horo_input.house_system
-    )
-    chart = horoscope.generate_chart()
-    planets_data = horoscope.get_planets_data_from_chart(chart)
+    return await run_chart_job(build_d5_chart_data, horo_input)
+
+def build_d5_chart_data(chart_context: ChartContext):
+    planets_data = chart_context.planets_data
 
     # Format the natal chart data into a list of dictionaries
     formatted_data = []
@@ -1427,15 +1557,10 @@ async def get_d7_chart_data(horo_input: ChartInput):
     """
     Generates the Saptamsha (D-7) chart data based on the image logic.
     """
-    # Generate the natal chart using the VedicAstro library
-    horoscope = VedicAstro.VedicHoroscopeData(
-        year=horo_input.year, month=horo_input.month, day=horo_input.day,
-        hour=horo_input.hour, minute=horo_input.minute, second=horo_input.second,
-        tz=horo_input.utc, latitude=horo_input.latitude, longitude=horo_input.longitude,
-        ayanamsa=horo_input.ayanamsa, house_system=horo_input.house_system
-    )
-    chart = horoscope.generate_chart()
-    planets_data = horoscope.get_planets_data_from_chart(chart)
+    return await run_chart_job(build_d7_chart_data, horo_input)
+
+def build_d7_chart_data(chart_context: ChartContext):
+    planets_data = chart_context.planets_data
 
     # Format the natal chart data into a list of dictionaries
     formatted_data = []
@@ -1474,20 +1599,11 @@ async def get_d9_chart_data(horo_input: ChartInput):
     """
     Generates the Navamsa (D-9) chart data based on the element of the signs.
     """
-    try:
-        # Generate the natal chart using the VedicAstro library
-        horoscope = VedicAstro.VedicHoroscopeData(
-            year=horo_input.year, month=horo_input.month, day=horo_input.day,
-            hour=horo_input.hour, minute=horo_input.minute, second=horo_input.second,
-            tz=horo_input.utc, latitude=horo_input.latitude, longitude=horo_input.longitude,
-            ayanamsa=horo_input.ayanamsa, house_system=horo_input.house_system
-        )
-
-
-        chart = horoscope.generate_chart()
+    return await run_chart_job(build_d9_chart_data, horo_input)
 
-
-        planets_data = horoscope.get_planets_data_from_chart(chart)
+def build_d9_chart_data(chart_context: ChartContext):
+    try:
+        planets_data = chart_context.planets_data
 
 
         formatted_data = []
@@ -1538,15 +1654,10 @@ async def get_d10_chart_data(horo_input: ChartInput):
     """
     Generates the Dasamsa (D-10) chart data based on the rules of odd and even signs.
     """
-    # Generate the natal chart using the VedicAstro library
-    horoscope = VedicAstro.VedicHoroscopeData(
-        year=horo_input.year, month=horo_input.month, day=horo_input.day,
-        hour=horo_input.hour, minute=horo_input.minute, second=horo_input.second,
-        tz=horo_input.utc, latitude=horo_input.latitude, longitude=horo_input.longitude,
-        ayanamsa=horo_input.ayanamsa, house_system=horo_input.house_system
-    )
-    chart = horoscope.generate_chart()
-    planets_data = horoscope.get_planets_data_from_chart(chart)
+    return await run_chart_job(build_d10_chart_data, horo_input)
+
+def build_d10_chart_data(chart_context: ChartContext):
+    planets_data = chart_context.planets_data
 
     # Format the natal chart data into a list of dictionaries
     formatted_data = []
@@ -1585,15 +1696,10 @@ async def get_d12_chart_data(horo_input: ChartInput):
     """
     Generates the Dwadasamsa (D-12) chart data based on the specified rules.
     """
-    # Generate the natal chart using the VedicAstro library
-    horoscope = VedicAstro.VedicHoroscopeData(
-        year=horo_input.year, month=horo_input.month, day=horo_input.day,
-        hour=horo_input.hour, minute=horo_input.minute, second=horo_input.second,
-        tz=horo_input.utc, latitude=horo_input.latitude, longitude=horo_input.longitude,
-        ayanamsa=horo_input.ayanamsa, house_system=horo_input.house_system
-    )
-    chart = horoscope.generate_chart()
-    planets_data = horoscope.get_planets_data_from_chart(chart)
+    return await run_chart_job(build_d12_chart_data, horo_input)
+
+def build_d12_chart_data(chart_context: ChartContext):
+    planets_data = chart_context.planets_data
 
     # Format the natal chart data into a list of dictionaries
     formatted_data = []
@@ -1632,15 +1738,10 @@ async def get_d16_chart_data(horo_input: ChartInput):
     """
     Generates the Shodasamsa (D-16) chart data based on the specified rules.
     """
-    # Generate the natal chart using the VedicAstro library
-    horoscope = VedicAstro.VedicHoroscopeData(
-        year=horo_input.year, month=horo_input.month, day=horo_input.day,
-        hour=horo_input.hour, minute=horo_input.minute, second=horo_input.second,
-        tz=horo_input.utc, latitude=horo_input.latitude, longitude=horo_input.longitude,
-        ayanamsa=horo_input.ayanamsa, house_system=horo_input.house_system
-    )
-    chart = horoscope.generate_chart()
-    planets_data = horoscope.get_planets_data_from_chart(chart)
+    return await run_chart_job(build_d16_chart_data, horo_input)
+
+def build_d16_chart_data(chart_context: ChartContext):
+    planets_data = chart_context.planets_data
 
     # Format the natal chart data into a list of dictionaries
     formatted_data = []
@@ -1679,15 +1780,10 @@ async def get_d20_chart_data(horo_input: ChartInput):
     """
     Generates the Vimsamsa (D-20) chart data using the mapping directly from the table.
     """
-    # Generate the natal chart using the VedicAstro library
-    horoscope = VedicAstro.VedicHoroscopeData(
-        year=horo_input.year, month=horo_input.month, day=horo_input.day,
-        hour=horo_input.hour, minute=horo_input.minute, second=horo_input.second,
-        tz=horo_input.utc, latitude=horo_input.latitude, longitude=horo_input.longitude,
-        ayanamsa=horo_input.ayanamsa, house_system=horo_input.house_system
-    )
-    chart = horoscope.generate_chart()
-    planets_data = horoscope.get_planets_data_from_chart(chart)
+    return await run_chart_job(build_d20_chart_data, horo_input)
+
+def build_d20_chart_data(chart_context: ChartContext):
+    planets_data = chart_context.planets_data
 
     # Predefined mapping of D-20 positions
     d20_mapping = {
@@ -1744,15 +1840,10 @@ async def get_d24_chart_data(horo_input: ChartInput):
     """
     Generates the Siddhamsa (D-24) chart data based on the provided table logic.
     """
-    # Generate the natal chart using the VedicAstro library
-    horoscope = VedicAstro.VedicHoroscopeData(
-        year=horo_input.year, month=horo_input.month, day=horo_input.day,
-        hour=horo_input.hour, minute=horo_input.minute, second=horo_input.second,
-        tz=horo_input.utc, latitude=horo_input.latitude, longitude=horo_input.longitude,
-        ayanamsa=horo_input.ayanamsa, house_system=horo_input.house_system
-    )
-    chart = horoscope.generate_chart()
-    planets_data = horoscope.get_planets_data_from_chart(chart)
+    return await run_chart_job(build_d24_chart_data, horo_input)
+
+def build_d24_chart_data(chart_context: ChartContext):
+    planets_data = chart_context.planets_data
 
     # Format the natal chart data into a list of dictionaries
     formatted_data = []
@@ -1791,15 +1882,10 @@ async def get_d27_chart_data(horo_input: ChartInput):
     """
     Generates the Bhamsa (D-27) chart data based on the provided table logic.
     """
-    # Generate the natal chart using the VedicAstro library
-    horoscope = VedicAstro.VedicHoroscopeData(
-        year=horo_input.year, month=horo_input.month, day=horo_input.day,
-        hour=horo_input.hour, minute=horo_input.minute, second=horo_input.second,
-        tz=horo_input.utc, latitude=horo_input.latitude, longitude=horo_input.longitude,
-        ayanamsa=horo_input.ayanamsa, house_system=horo_input.house_system
-    )
-    chart = horoscope.generate_chart()
-    planets_data = horoscope.get_planets_data_from_chart(chart)
+    return await run_chart_job(build_d27_chart_data, horo_input)
+
+def build_d27_chart_data(chart_context: ChartContext):
+    planets_data = chart_context.planets_data
 
     # Format the natal chart data into a list of dictionaries
     formatted_data = []
@@ -1839,22 +1925,10 @@ async def get_d30_chart_data(horo_input: ChartInput):
     Generates the Trimsamsa (D-30) chart data based on Vedic astrology rules.
     Each sign is divided into 30 parts of 1° each.
     """
-    horoscope = VedicAstro.VedicHoroscopeData(
-        year=horo_input.year,
-        month=horo_input.month,
-        day=horo_input.day,
-        hour=horo_input.hour,
-        minute=horo_input.minute,
-        second=horo_input.second,
-        tz=horo_input.utc,
-        latitude=horo_input.latitude,
-        longitude=horo_input.longitude,
-        ayanamsa=horo_input.ayanamsa,
-        house_system=horo_input.house_system
-    )
+    return await run_chart_job(build_d30_chart_data, horo_input)
 
-    chart = horoscope.generate_chart()
-    planets_data = horoscope.get_planets_data_from_chart(chart)
+def build_d30_chart_data(chart_context: ChartContext):
+    planets_data = chart_context.planets_data
 
     d30_chart = []
     for planet in planets_data:
@@ -1881,22 +1955,10 @@ async def get_d40_chart_data(horo_input: ChartInput):
     """
     Generates the D-40 chart data based on the provided table mapping.
     """
-    horoscope = VedicAstro.VedicHoroscopeData(
-        year=horo_input.year,
-        month=horo_input.month,
-        day=horo_input.day,
-        hour=horo_input.hour,
-        minute=horo_input.minute,
-        second=horo_input.second,
-        tz=horo_input.utc,
-        latitude=horo_input.latitude,
-        longitude=horo_input.longitude,
-        ayanamsa=horo_input.ayanamsa,
-        house_system=horo_input.house_system
-    )
+    return await run_chart_job(build_d40_chart_data, horo_input)
 
-    chart = horoscope.generate_chart()
-    planets_data = horoscope.get_planets_data_from_chart(chart)
+def build_d40_chart_data(chart_context: ChartContext):
+    planets_data = chart_context.planets_data
 
     d40_chart = []
     for planet in planets_data:
@@ -1917,16 +1979,191 @@ async def get_d40_chart_data(horo_input: ChartInput):
     return d40_chart
 
 
+@app.post("/get_varga_charts")
+async def get_varga_charts(horo_input: ChartInput, divisions: str = None):
+    """
+    Generates several divisional charts (Eg: `divisions=2,3,9,60`) of the planets and house cusps from a single chart.
+    All the supported divisions are returned when `divisions` is not given.
+    """
+    try:
+        division_list = [int(division) for division in divisions.split(",")] if divisions else list(VARGAS)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="divisions must be a comma separated list of numbers (Eg: 2,3,9)")
+    unknown = [division for division in division_list if division not in VARGAS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unsupported divisions {unknown}. Available: {', '.join(map(str, VARGAS))}")
+    return await run_chart_job(build_varga_charts, horo_input, division_list)
+
+def build_varga_charts(chart_context: ChartContext, divisions: List[int]):
+    """
+    Maps the longitudes of all the planets (with the ascendant) and of the house cusps through each division
+    with one vectorized lookup per division. Degrees are the longitudes within the varga sign.
+    """
+    chart = chart_context.chart
+    planets_data, houses_data = chart_context.planets_data, chart_context.houses_data
+    ## Full precision longitudes, in the order of planets_data (ascendant first) and houses_data
+    longitudes = np.array([chart.get(const.ASC).lon] + [planet.lon for planet in chart.objects]
+                          + [house.lon for house in chart.houses])
+    natal_signs = (longitudes // 30).astype(int).tolist()
+    objects = [(planet.Object, planet.HouseNr) for planet in planets_data] + [(house.Object, house.HouseNr) for house in houses_data]
+
+    varga_charts = {}
+    for division in divisions:
+        signs, degrees = get_varga_positions(longitudes, division)
+        positions = [{"Object": name,
+                      "Current Sign": zodiac_signs[natal_sign],
+                      "Current Sign Index": natal_sign + 1,
+                      "Rasi": zodiac_signs[sign],
+                      "Sign Index": sign + 1,
+                      "Degree": round(degree, 4),
+                      "House Number": house_nr}
+                     for (name, house_nr), natal_sign, sign, degree in zip(objects, natal_signs, signs.tolist(), degrees.tolist())]
+        varga_charts[f"D-{division}"] = {"name": VARGAS[division].name,
+                                         "planets": positions[:len(planets_data)],
+                                         "cusps": positions[len(planets_data):]}
+    return varga_charts
+
+@app.post("/get_yogas")
+async def get_yogas(horo_input: ChartInput, categorize_by_influence: bool = False, categories: str = None,
+                    include_timings: bool = False):
+    """
+    Analyzes a birth chart to identify important Hindu astrological yogas (planetary combinations).
+    Returns a list of yogas present in the chart with descriptions.
+
+    Args:
+        horo_input: Chart input data
+        categorize_by_influence: If True, yogas will be categorized as benefic or malefic
+                               If False (default), yogas will be categorized by traditional types
+        categories: comma separated yoga categories to evaluate (Eg: raj_yogas,dhana_yogas), all of them by default
+        include_timings: If True, the time taken by each yoga rule (in ms) is returned in "timings_ms"
+    """
+    category_list = [category.strip() for category in categories.split(",")] if categories else YOGA_CATEGORIES
+    unknown = [category for category in category_list if category not in YOGA_CATEGORIES]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown yoga categories {unknown}. Available: {', '.join(YOGA_CATEGORIES)}")
+    return await run_chart_job(build_yogas, horo_input, categorize_by_influence, category_list, include_timings)
+
+## Order of the categories when yogas are categorized by influence, and the other yogas which are malefic
+INFLUENCE_CATEGORY_ORDER = ["raj_yogas", "dhana_yogas", "pancha_mahapurusha_yogas", "additional_benefic_yogas",
+                            "intellectual_yogas", "other_yogas", "nabhasa_yogas", "malefic_yogas"]
+MALEFIC_OTHER_YOGAS = ["Kemadruma Yoga", "Kala Sarpa Yoga", "Shakata Yoga"]
+
+def build_yogas(chart_context: ChartContext, categorize_by_influence: bool, categories: List[str], include_timings: bool):
+    """
+    Evaluates the registered yoga rules of the requested categories on a single ChartIndex. Planets are placed
+    by their sidereal sign in the rasi chart (Lahiri), in the house of the first cusp of that sign.
+    """
+    cusps = {house.HouseNr: house for house in chart_context.houses_data}
+    retrograde = {planet.Object: planet.isRetroGrade for planet in chart_context.planets_data}
+    house_nrs = {planet.Object: planet.HouseNr for planet in chart_context.planets_data}
+
+    planet_positions = {}
+    for sign_data in build_rashi_chart_data(chart_context):
+        rasi = sign_data["Rasi"]
+        ## House of the sign, falling back to the house of the planet when no cusp is in the sign
+        sign_house = next((house_nr for house_nr, cusp in cusps.items() if cusp.Rasi == rasi), None)
+        for planet_entry in sign_data["Planets"]:
+            planet_name = planet_entry["Name"]
+            house_nr = sign_house if sign_house is not None else house_nrs.get(planet_name)
+            if house_nr is None:
+                continue
+            planet_positions[planet_name] = {
+                "Object": planet_name,
+                "Rasi": rasi,
+                "RasiLord": VedicAstro.SIGN_LORDS[zodiac_signs.index(rasi)],
+                "HouseNr": house_nr,
+                "isRetroGrade": retrograde.get(planet_name, False),
+                "SignLonDecDeg": planet_entry.get("Longitude", 0),
+            }
+    houses_data = {house_nr: {"Rasi": cusp.Rasi, "RasiLord": VedicAstro.SIGN_LORDS[zodiac_signs.index(cusp.Rasi)]}
+                   for house_nr, cusp in cusps.items()}
+
+    timings = {} if include_timings else None
+    traditional_yogas = evaluate_yogas(ChartIndex(planet_positions, houses_data), categories, timings)
+
+    if categorize_by_influence:
+        benefic_yogas, malefic_yogas = [], []
+        for category in INFLUENCE_CATEGORY_ORDER:
+            for yoga in traditional_yogas.get(category, []):
+                if category == "malefic_yogas" or (category == "other_yogas" and yoga["name"] in MALEFIC_OTHER_YOGAS):
+                    malefic_yogas.append(yoga)
+                else:
+                    benefic_yogas.append(yoga)
+        result = {
+            "benefic_yogas": benefic_yogas,
+            "malefic_yogas": malefic_yogas,
+            "total_yogas": len(benefic_yogas) + len(malefic_yogas)
+        }
+    else:
+        result = traditional_yogas
+
+    if include_timings:
+        result["timings_ms"] = timings
+    return result
+
+class YogaTimelineRequest(BaseModel):
+    horo_input: ChartInput
+    start_year: int
+    end_year: int
+    categories: Optional[List[str]] = None
+    dasa_level: int = 2
+
+@app.post("/get_yoga_timeline")
+async def get_yoga_timeline(yoga_timeline_request: YogaTimelineRequest):
+    """
+    Returns the date ranges in which the transiting planets form each yoga, from 1st Jan of `start_year` to 31st Dec
+    of `end_year`, with the natal dasa periods (of `dasa_level`, 2: Antar Dasa by default) running during each range.
+    Transit houses are counted from the natal ascendant sign.
+    """
+    request = yoga_timeline_request
+    if request.start_year > request.end_year:
+        raise HTTPException(status_code=400, detail="start_year must not be after end_year")
+    if not 1 <= request.dasa_level <= MAX_DASA_LEVEL:
+        raise HTTPException(status_code=400, detail=f"dasa_level must be between 1 and {MAX_DASA_LEVEL}")
+    unknown = [category for category in request.categories or [] if category not in YOGA_CATEGORIES]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown yoga categories {unknown}. Available: {', '.join(YOGA_CATEGORIES)}")
+    return await run_chart_job(build_yoga_timeline, request.horo_input, request.start_year, request.end_year,
+                               request.categories, request.dasa_level)
+
+def build_yoga_timeline(chart_context: ChartContext, start_year: int, end_year: int, categories: List[str],
+                        dasa_level: int):
+    """
+    Scans the transit yogas over the sign ingresses of the range and attaches the overlapping dasa periods.
+    Yogas are keyed by name, each with the list of its date ranges.
+    """
+    time_zone = chart_context.horoscope.time_zone
+    jd_start = local_datetime_to_jd(datetime(start_year, 1, 1), time_zone)
+    jd_end = local_datetime_to_jd(datetime(end_year, 12, 31, 23, 59, 59), time_zone)
+    transit_periods = transit_cache.get_transit_periods(TRANSIT_YOGA_PLANETS, jd_start, jd_end, chart_context.key.ayanamsa)
+    ascendant_sign = zodiac_signs.index(next(planet.Rasi for planet in chart_context.planets_data if planet.Object == "Asc"))
+
+    dasa = chart_context.dasa
+    yoga_timeline = {}
+    for interval in scan_yoga_timeline(transit_periods, ascendant_sign, jd_start, jd_end, categories):
+        yoga_timeline.setdefault(interval.name, []).append({
+            "category": interval.category,
+            "description": interval.description,
+            "start_date": format_transit_timestamp(interval.start_jd, time_zone),
+            "end_date": format_transit_timestamp(interval.end_jd, time_zone),
+            "dashas": dasa.to_records(dasa_level, indices=dasa.get_overlapping_indices(interval.start_jd, interval.end_jd, dasa_level)),
+        })
+    return {"ascendant": zodiac_signs[ascendant_sign], "yogas": yoga_timeline}
+
 @app.post("/get_all_horary_data")
 async def get_horary_data(input: HoraryChartInput):
     """
     Generates all data for a given horary number, time and location as per KP Astrology system
     """
+    return await chart_pool.run(build_horary_data, input)
+
+def build_horary_data(input: HoraryChartInput):
     matched_time, vhd_hora_houses_chart, houses_data  = horary_chart.find_exact_ascendant_time(input.year, input.month, input.day, input.utc, input.latitude, input.longitude, input.horary_number, input.ayanamsa)
-    vhd_hora = VedicAstro.VedicHoroscopeData(input.year, input.month, input.day,
-                                              input.hour, input.minute, input.second,
-                                              input.utc, input.latitude, input.longitude,
-                                              input.ayanamsa, input.house_system)
+    vhd_hora = VedicAstro.VedicHoroscopeData(year=input.year, month=input.month, day=input.day,
+                                              hour=input.hour, minute=input.minute, second=input.second,
+                                              latitude=input.latitude, longitude=input.longitude,
+                                              ayanamsa=input.ayanamsa, house_system=input.house_system)
+    vhd_hora.utc = input.utc  ## `utc` of a horary input is the predictor's UTC offset (Eg: +5:30)
 
     vhd_hora_planets_chart = vhd_hora.generate_chart()
     planets_data = vhd_hora.get_planets_data_from_chart(vhd_hora_planets_chart, vhd_hora_houses_chart)
@@ -1976,8 +2213,12 @@ def roman_to_int(roman):
         return 0  # Return 0 for invalid Roman numerals
 
 
+## Years of transit details computed per pool job of a streamed /get_planet_transit_data
+TRANSIT_STREAM_CHUNK_YEARS = 10
+
 @app.post("/get_planet_transit_data")
-async def get_planet_transit_data(horo_input: ChartInput, start_year: int = 2000, end_year: int = 2050, filename: str = None):
+async def get_planet_transit_data(horo_input: ChartInput, start_year: int = 2000, end_year: int = 2050, filename: str = None,
+                            stream: bool = False, stream_format: str = "ndjson"):
     """
     Generates the simplified planet transit data for a range of years.
     Returns only timestamp, planet name, and planet sign.
@@ -1993,10 +2234,10 @@ async def get_planet_transit_data(horo_input: ChartInput, start_year: int = 2000
         The ending year for transit calculations
     filename: str, optional (default=None)
         Custom filename for the CSV output. If None, a default name will be generated.
+    stream: bool, optional (default=False)
+        Stream the transit records as they are computed, as NDJSON lines or a JSON array (see `stream_format`)
     """
     try:
-        all_transit_data = []
-
         # Validate input years
         if start_year >= end_year:
             return {"status": "error", "message": "start_year must be less than end_year"}
@@ -2004,40 +2245,11 @@ async def get_planet_transit_data(horo_input: ChartInput, start_year: int = 2000
         if end_year - start_year > 100:
             return {"status": "error", "message": "Maximum range of 100 years is allowed"}
 
-        # Loop through each year in the range
-        for year in range(start_year, end_year + 1):
-            # Create a new VedicHoroscopeData object for each year
-            horoscope = VedicAstro.VedicHoroscopeData(
-                year=year,
-                month=horo_input.month,
-                day=horo_input.day,
-                hour=horo_input.hour,
-                minute=horo_input.minute,
-                second=horo_input.second,
-                latitude=horo_input.latitude,
-                longitude=horo_input.longitude,
-                tz=horo_input.utc,
-                ayanamsa=horo_input.ayanamsa,
-                house_system=horo_input.house_system
-            )
-
-            # Get transit details for this year
-            transit_data = horoscope.get_transit_details()
-
-            # Extract only timestamp, PlanetName, and PlanetSign
-            for transit in transit_data:
-                simplified_transit = {
-                    "timestamp": transit.timestamp,
-                    "PlanetName": transit.PlanetName,
-                    "PlanetSign": transit.PlanetSign,
-                    "isRetrograde": transit.isRetrograde,
-                    "Nakshatra": transit.Nakshatra,
-                    "NakshatraLord": transit.NakshatraLord,
-                    "SubLord": transit.SubLord,
-                    "SubLordSign": transit.SubLordSign
-                }
-                all_transit_data.append(simplified_transit)
-
+        if stream:
+            year_chunks = [(horo_input, year, min(year + TRANSIT_STREAM_CHUNK_YEARS - 1, end_year))
+                           for year in range(start_year, end_year + 1, TRANSIT_STREAM_CHUNK_YEARS)]
+            return streaming_records_response(iter_pool_chunks(build_planet_transit_details, year_chunks), stream_format)
+        all_transit_data = await chart_pool.run(build_planet_transit_details, horo_input, start_year, end_year)
 
         return {
             "status": "success",
@@ -2046,9 +2258,50 @@ async def get_planet_transit_data(horo_input: ChartInput, start_year: int = 2000
             "total_records": len(all_transit_data),
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         return {"status": "error", "message": str(e)}
 
+def build_planet_transit_details(horo_input: ChartInput, start_year: int, end_year: int):
+    return list(iter_planet_transit_details(horo_input, start_year, end_year))
+
+def iter_planet_transit_details(horo_input: ChartInput, start_year: int, end_year: int):
+    """Yields the simplified transit details of all planets at the chart time of each year of the range"""
+    # Loop through each year in the range
+    for year in range(start_year, end_year + 1):
+        # Create a new VedicHoroscopeData object for each year
+        horoscope = VedicAstro.VedicHoroscopeData(
+            year=year,
+            month=horo_input.month,
+            day=horo_input.day,
+            hour=horo_input.hour,
+            minute=horo_input.minute,
+            second=horo_input.second,
+            latitude=horo_input.latitude,
+            longitude=horo_input.longitude,
+            tz=horo_input.utc,
+            ayanamsa=horo_input.ayanamsa,
+            house_system=horo_input.house_system
+        )
+
+        # Get transit details for this year
+        transit_data = horoscope.get_transit_details()
+
+        # Extract only timestamp, PlanetName, and PlanetSign
+        for transit in transit_data:
+            simplified_transit = {
+                "timestamp": transit.timestamp,
+                "PlanetName": transit.PlanetName,
+                "PlanetSign": transit.PlanetSign,
+                "isRetrograde": transit.isRetrograde,
+                "Nakshatra": transit.Nakshatra,
+                "NakshatraLord": transit.NakshatraLord,
+                "SubLord": transit.SubLord,
+                "SubLordSign": transit.SubLordSign
+            }
+            yield simplified_transit
+
 
 
 
@@ -2063,6 +2316,9 @@ class TransitDataRequest(BaseModel):
 async def generate_compact_transit_data(
     transit_data_request: TransitDataRequest
 ):
+    return await chart_pool.run(build_compact_transit_data, transit_data_request)
+
+def build_compact_transit_data(transit_data_request: TransitDataRequest):
     try:
         start_year = transit_data_request.start_year
         end_year = transit_data_request.end_year
@@ -2073,96 +2329,20 @@ async def generate_compact_transit_data(
         if start_year >= end_year:
             return {"status": "error", "message": "start_year must be less than end_year"}
 
-        # Always exclude these planets
-        excluded_planets = ["Uranus", "Neptune", "Pluto"]
-
-        # If planets parameter is provided, use it for filtering
-        # Otherwise, include all valid planets by default
-        include_planets = None
-        if planets:
-            # Convert to set for faster lookups
-            include_planets = set(planets)
+        time_zone, transit_periods = get_transit_periods_for_range(horo_input, start_year, end_year, planets)
 
-        # Flattened list for transit data
+        # Flattened list for transit data, with exact ingress / station timestamps in local time
         transit_records = []
-
-        # Create start and end dates
-        start_date = datetime(start_year, 1, 1)
-        end_date = datetime(end_year, 12, 31)
-
-        # Current state tracking for each planet
-        current_planet_states = {}  # {planet_name: (sign, start_date, is_retrograde)}
-
-        # Loop through each day in the range
-        current_date = start_date
-        while current_date <= end_date:
-            # Create a new VedicHoroscopeData object for each day
-            horoscope = VedicAstro.VedicHoroscopeData(
-                year=current_date.year,
-                month=current_date.month,
-                day=current_date.day,
-                hour=horo_input.hour,
-                minute=horo_input.minute,
-                second=horo_input.second,
-                latitude=horo_input.latitude,
-                longitude=horo_input.longitude,
-                tz=horo_input.utc,
-                ayanamsa=horo_input.ayanamsa,
-                house_system=horo_input.house_system
-            )
-
-            # Get transit details for this day
-            transit_data = horoscope.get_transit_details()
-
-            # Format date string (YYYY-MM-DD)
-            date_str = f"{current_date.year}-{current_date.month:02d}-{current_date.day:02d}"
-
-            # Process each planet's transit
-            for transit in transit_data:
-                planet_name = transit.PlanetName
-
-                # Skip excluded planets
-                if planet_name in excluded_planets:
-                    continue
-
-                # Skip planets not in the include list (if specified)
-                if include_planets is not None and planet_name not in include_planets:
-                    continue
-
-                sign = transit.PlanetSign
-                is_retrograde = transit.isRetrograde
-
-                # Check if this is a new entry or the sign has changed
-                if planet_name not in current_planet_states:
-                    # First time seeing this planet
-                    current_planet_states[planet_name] = (sign, date_str, is_retrograde)
-                elif current_planet_states[planet_name][0] != sign or current_planet_states[planet_name][2] != is_retrograde:
-                    # Sign or retrograde status changed - record the previous state
-                    prev_sign, prev_start, prev_retro = current_planet_states[planet_name]
-                    transit_records.append({
-                        "planet": planet_name,
-                        "sign": prev_sign,
-                        "start_date": prev_start,
-                        "end_date": date_str,  # Yesterday's date as end date
-                        "is_retrograde": prev_retro,
-                    })
-
-                    # Update current state with new sign
-                    current_planet_states[planet_name] = (sign, date_str, is_retrograde)
-
-            # Move to the next day
-            current_date += timedelta(days=1)
-
-        # Record final states for all planets (using end_date as the end)
-        end_date_str = f"{end_date.year}-{end_date.month:02d}-{end_date.day:02d}"
-        for planet_name, (sign, start_date, is_retrograde) in current_planet_states.items():
-            transit_records.append({
-                "planet": planet_name,
-                "sign": sign,
-                "start_date": start_date,
-                "end_date": end_date_str,
-                "is_retrograde": is_retrograde,
-            })
+        for periods in transit_periods.values():
+            for period in periods:
+                transit_records.append({
+                    "planet": period.PlanetName,
+                    "sign": period.Rasi,
+                    "start_date": format_transit_timestamp(period.start_jd, time_zone),
+                    "end_date": format_transit_timestamp(period.end_jd, time_zone),
+                    "is_retrograde": period.isRetrograde,
+                })
+        transit_records.sort(key=lambda record: record["start_date"])
         return {"transit_data": transit_records}
     except Exception as e:
         return {"status": "error", "message": str(e)}
@@ -2170,7 +2350,35 @@ async def generate_compact_transit_data(
 @app.post("/generate_transit_data")
 async def generate_transit_data(
     transit_data_request: TransitDataRequest,
+    stream: bool = False,
+    stream_format: str = "ndjson"
 ):
+    """
+    Returns each planet's sign / retrograde periods over the year range. With `stream=true` the periods are
+    streamed planet by planet as they are read or computed, as NDJSON lines or a JSON array (`stream_format`),
+    each with a "planet" key.
+    """
+    if not stream:
+        return await chart_pool.run(build_transit_data, transit_data_request)
+    if transit_data_request.start_year >= transit_data_request.end_year:
+        raise HTTPException(status_code=400, detail="start_year must be less than end_year")
+    planet_chunks = [(transit_data_request, planet) for planet in get_transit_planets(transit_data_request.planets)]
+    return streaming_records_response(iter_pool_chunks(build_transit_records, planet_chunks), stream_format)
+
+def build_transit_records(transit_data_request: TransitDataRequest, planet: str):
+    """Returns the transit period records of a planet for the `/generate_transit_data` stream"""
+    time_zone, _, jd_start, jd_end = get_transit_range(transit_data_request.horo_input,
+                                                       transit_data_request.start_year,
+                                                       transit_data_request.end_year)
+    return [{
+        "planet": period.PlanetName,
+        "sign": period.Rasi,
+        "start_date": format_transit_timestamp(period.start_jd, time_zone),
+        "end_date": format_transit_timestamp(period.end_jd, time_zone),
+        "isRetrograde": period.isRetrograde
+    } for period in transit_cache.iter_transit_periods([planet], jd_start, jd_end, transit_data_request.horo_input.ayanamsa)]
+
+def build_transit_data(transit_data_request: TransitDataRequest):
     try:
         start_year = transit_data_request.start_year
         end_year = transit_data_request.end_year
@@ -2181,119 +2389,17 @@ async def generate_transit_data(
         if start_year >= end_year:
             return {"status": "error", "message": "start_year must be less than end_year"}
 
-        # Always exclude these planets
-        excluded_planets = ["Uranus", "Neptune", "Pluto"]
+        time_zone, transit_periods = get_transit_periods_for_range(horo_input, start_year, end_year, planets)
 
-        # If planets parameter is provided, use it for filtering
-        # Otherwise, include all valid planets by default
-        include_planets = None
-        if planets:
-            # Convert to set for faster lookups
-            include_planets = set(planets)
-
-        # Dictionary to track each planet's position over time
+        # Dictionary of each planet's sign / retrograde periods over time
         planet_transits = {}
-
-        # Create start and end dates
-        start_date = datetime(start_year, 1, 1)
-        end_date = datetime(end_year, 12, 31)
-
-        # Current state tracking for each planet
-        current_planet_states = {}  # {planet_name: (sign, start_date, is_retrograde)}
-
-        # Loop through each day in the range
-        current_date = start_date
-        while current_date <= end_date:
-            # Create a new VedicHoroscopeData object for each day
-            horoscope = VedicAstro.VedicHoroscopeData(
-                year=current_date.year,
-                month=current_date.month,
-                day=current_date.day,
-                hour=horo_input.hour,
-                minute=horo_input.minute,
-                second=horo_input.second,
-                latitude=horo_input.latitude,
-                longitude=horo_input.longitude,
-                tz=horo_input.utc,
-                ayanamsa=horo_input.ayanamsa,
-                house_system=horo_input.house_system
-            )
-
-            # Get transit details for this day
-            transit_data = horoscope.get_transit_details()
-
-            # Format date string (YYYY-MM-DD)
-            date_str = f"{current_date.year}-{current_date.month:02d}-{current_date.day:02d}"
-
-            # Process each planet's transit
-            for transit in transit_data:
-                planet_name = transit.PlanetName
-
-                # Skip excluded planets
-                if planet_name in excluded_planets:
-                    continue
-
-                # Skip planets not in the include list (if specified)
-                if include_planets is not None and planet_name not in include_planets:
-                    continue
-
-                sign = transit.PlanetSign
-                is_retrograde = transit.isRetrograde
-
-                # Initialize if this planet hasn't been seen before
-                if planet_name not in planet_transits:
-                    planet_transits[planet_name] = []
-
-                # Check if this is a new entry or the sign has changed
-                if planet_name not in current_planet_states:
-                    # First time seeing this planet
-                    current_planet_states[planet_name] = (sign, date_str, is_retrograde)
-                elif current_planet_states[planet_name][0] != sign or current_planet_states[planet_name][2] != is_retrograde:
-                    # Sign or retrograde status changed - record the previous state
-                    prev_sign, prev_start, prev_retro = current_planet_states[planet_name]
-
-                    planet_transits[planet_name].append({
-                        "sign": prev_sign,
-                        "start_date": prev_start,
-                        "end_date": date_str,  # Yesterday's date as end date
-                        "isRetrograde": prev_retro
-                    })
-
-                    # Update current state with new sign
-                    current_planet_states[planet_name] = (sign, date_str, is_retrograde)
-
-            # Move to the next day
-            current_date += timedelta(days=1)
-
-        # Record final states for all planets (using end_date as the end)
-        end_date_str = f"{end_date.year}-{end_date.month:02d}-{end_date.day:02d}"
-        for planet_name, (sign, start_date, is_retrograde) in current_planet_states.items():
-            planet_transits[planet_name].append({
-                "sign": sign,
-                "start_date": start_date,
-                "end_date": end_date_str,
-                "isRetrograde": is_retrograde
-            })
-
-        # # Special handling for Moon planet only - convert to compact string format
-        # if "Moon" in planet_transits:
-        #     moon_data = []
-        #     for transit in planet_transits["Moon"]:
-        #         # Convert sign to number (1-12)
-        #         sign_number = zodiac_signs.index(transit["sign"]) + 1
-
-        #         # Calculate days in this transit period
-        #         start_date_obj = datetime.strptime(transit["start_date"], "%Y-%m-%d")
-        #         end_date_obj = datetime.strptime(transit["end_date"], "%Y-%m-%d")
-        #         days = (end_date_obj - start_date_obj).days
-
-        #         # Format as "sign:start_date:days:is_retrograde"
-        #         is_retro_int = 1 if transit["isRetrograde"] else 0
-        #         moon_data.append(f"{sign_number}:{transit['start_date']}:{days}:{is_retro_int}")
-
-        #     # Replace the Moon's data with the compact string format
-        #     planet_transits["Moon"] = "|".join(moon_data)
-
+        for planet_name, periods in transit_periods.items():
+            planet_transits[planet_name] = [{
+                "sign": period.Rasi,
+                "start_date": format_transit_timestamp(period.start_jd, time_zone),
+                "end_date": format_transit_timestamp(period.end_jd, time_zone),
+                "isRetrograde": period.isRetrograde
+            } for period in periods]
 
         return planet_transits
 
@@ -2304,6 +2410,43 @@ async def generate_transit_data(
         return {"status": "error", "message": str(e), "details": error_details}
 
 
+# Planets excluded from the transit timelines
+EXCLUDED_TRANSIT_PLANETS = ["Uranus", "Neptune", "Pluto"]
+
+def get_transit_periods_for_range(horo_input: ChartInput, start_year: int, end_year: int, planets: List[str] = None):
+    """
+    Computes the sign / retrograde transit periods from 1st Jan of `start_year` to 31st Dec of `end_year`
+    (local time of the chart location) using the event-driven transit engine.
+    Returns the resolved timezone name and a dict of TransitPeriod lists keyed by planet name.
+    """
+    time_zone, include_planets, jd_start, jd_end = get_transit_range(horo_input, start_year, end_year, planets)
+    transit_periods = transit_cache.get_transit_periods(include_planets, jd_start, jd_end, horo_input.ayanamsa)
+    return time_zone, transit_periods
+
+def get_transit_planets(planets: List[str] = None):
+    """Returns the planets of the transit timelines, filtered by `planets` when given"""
+    # If planets are provided, use them for filtering. Otherwise, include all valid planets by default
+    include_planets = [planet for planet in transit_engine.SWE_PLANETS if planet not in EXCLUDED_TRANSIT_PLANETS]
+    if planets:
+        include_planets = [planet for planet in include_planets if planet in set(planets)]
+    return include_planets
+
+def get_transit_range(horo_input: ChartInput, start_year: int, end_year: int, planets: List[str] = None):
+    """
+    Returns the resolved timezone name, the planets to include and the Julian Days (UT) of the start of
+    `start_year` and the end of `end_year`, in local time of the chart location
+    """
+    include_planets = get_transit_planets(planets)
+    time_zone = resolve_time_zone(horo_input.latitude, horo_input.longitude, horo_input.utc)
+    jd_start = local_datetime_to_jd(datetime(start_year, 1, 1), time_zone)
+    jd_end = local_datetime_to_jd(datetime(end_year, 12, 31, 23, 59, 59), time_zone)
+    return time_zone, include_planets, jd_start, jd_end
+
+def format_transit_timestamp(jd: float, time_zone: str):
+    """Formats a Julian Day (UT) as a local ISO-8601 timestamp string"""
+    return jd_to_local_datetime(jd, time_zone).strftime("%Y-%m-%dT%H:%M:%S")
+
+
 
 def format_consolidated_chart_data(data):
     formatted_data = []
@@ -2339,195 +2482,139 @@ async def generate_ashtakavarga_data(horo_input: ChartInput):
     Generates the Ashtakavarga data for a birth chart.
     """
     try:
-        # Create a VedicHoroscopeData object
-        horoscope = VedicAstro.VedicHoroscopeData(
-            year=horo_input.year,
-            month=horo_input.month,
-            day=horo_input.day,
-            hour=horo_input.hour,
-            minute=horo_input.minute,
-            second=horo_input.second,
-            latitude=horo_input.latitude,
-            longitude=horo_input.longitude,
-            tz=horo_input.utc,
-            ayanamsa=horo_input.ayanamsa,
-            house_system=horo_input.house_system
-        )
-
-        # Generate chart
-        chart = horoscope.generate_chart()
-        planets_data = horoscope.get_planets_data_from_chart(chart)
-        houses_data = horoscope.get_houses_data_from_chart(chart)
-
-        # Get consolidated chart data
-        consolidated_chart_data = horoscope.get_consolidated_chart_data(
-            planets_data=planets_data,
-            houses_data=houses_data
-        )
-
-
-        # Calculate Ashtakavarga using the chart data
-        ashtakavarga_data = get_ashtakavarga_data(consolidated_chart_data)
-        return ashtakavarga_data
+        return await run_chart_job(build_ashtakavarga_data, horo_input)
 
     except Exception as e:
         import traceback
         error_details = traceback.format_exc()
         return {"status": "error", "message": str(e), "details": error_details}
 
+def build_ashtakavarga_data(chart_context: ChartContext):
+    return format_ashtakavarga_data(get_natal_bhinnashtakavarga(chart_context))
+
+def get_natal_bhinnashtakavarga(chart_context: ChartContext):
+    """(7, 12) Bhinnashtakavarga of a chart, from the signs of the planets and of the ascendant"""
+    signs = {planet.Object: zodiac_signs.index(planet.Rasi) for planet in chart_context.planets_data}
+    signs["Ascendant"] = signs.get("Asc", -1)
+    return calculate_bhinnashtakavarga([signs.get(name, -1) for name in ASHTAKAVARGA_CONTRIBUTORS])
+
 def get_ashtakavarga_data(chart_data):
     """
-    Calculate Ashtakavarga tables using traditional Vedic astrology rules.
+    Calculate Ashtakavarga tables using traditional Vedic astrology rules, from consolidated chart data
+    (objects grouped by sign).
     """
-    # Define the planets (7 planets + Lagna)
-    planets = ["Sun", "Moon", "Mars", "Mercury", "Jupiter", "Venus", "Saturn", "Ascendant"]
-
-    # Get planetary positions from chart data
-    planet_positions = {}
-
-    # Extract planetary positions and ascendant from the chart data
+    signs = {}
     for sign, objects in chart_data.items():
-        for obj_name, obj_data in objects.items():
-            if obj_name in ["Sun", "Moon", "Mars", "Mercury", "Jupiter", "Venus", "Saturn"]:
-                # Store each planet's sign position (1-12)
-                planet_positions[obj_name] = zodiac_signs.index(sign) + 1
+        for obj_name in objects:
+            if obj_name in ASHTAKAVARGA_PLANETS:
+                signs[obj_name] = zodiac_signs.index(sign)
             elif obj_name == "Asc" or obj_name == "I":  # The ascendant
-                planet_positions["Ascendant"] = zodiac_signs.index(sign) + 1
-
-    # Define classical benefic houses from each planet's position
-    sun_benefic_houses = {
-        "Sun": [1, 2, 4, 7, 8, 9, 10, 11],
-        "Moon": [3, 6, 10, 11],
-        "Mars": [1,2,4,7,8,9,10,11],
-        "Mercury": [3, 5, 6, 9, 10, 11, 12],
-        "Jupiter": [5, 6, 9, 11],
-        "Venus": [6, 7, 12],
-        "Saturn": [1, 2, 4, 7, 8, 9, 10, 11],
-        "Ascendant": [3, 4, 6, 10, 11, 12]
-    }
-
-    moon_benefic_houses = {
-        "Sun": [3, 6, 7, 8, 10, 11],
-        "Moon": [1, 3, 6, 7, 10, 11],
-        "Mars": [ 2, 3, 5, 6, 9, 10, 11 ],
-        "Mercury": [1, 3, 4, 5, 7, 8, 10, 11],
-        "Jupiter": [ 1, 4, 7, 8, 10, 11, 12],
-        "Venus": [ 3, 4, 5, 7, 9, 10, 11],
-        "Saturn": [3, 5, 6, 11],
-        "Ascendant": [3, 6, 10, 11]
-    }
-
-    mercury_benefic_houses = {
-        "Sun": [5,6,9,11, 12],
-        "Moon": [2,4,6,8,10,11],
-        "Mars": [1,2,4,7,8,9,10,11],
-        "Mercury": [1,3,5,6,9,10,11,12],
-        "Jupiter": [6,8,11,12],
-        "Venus": [1,2,3,4,5,8,9,11],
-        "Saturn": [1,2,4,7,8,9,10,11],
-        "Ascendant": [1,2,4,6,8,10,11],
-    }
-
-    venus_benefic_houses = {
-        "Sun": [8,11,12],
-        "Moon": [1,2,3,4,5,8,9,11,12],
-        "Mars": [3,5,6,9,11,12],
-        "Mercury": [3,5,6,9,11],
-        "Jupiter": [5,8,9,10,11],
-        "Venus": [1,2,3,4,5,8,9,10,11],
-        "Saturn": [3,4,5,8,9,10,11],
-        "Ascendant": [1,2,3,4,5,8,9,11],
-    }
+                signs["Ascendant"] = zodiac_signs.index(sign)
+    return format_ashtakavarga_data(calculate_bhinnashtakavarga([signs.get(name, -1) for name in ASHTAKAVARGA_CONTRIBUTORS]))
 
-    mars_benefic_houses = {
-        "Sun": [3,5,6,10,11],
-        "Moon": [3,6,11],
-        "Mars": [1,2,4,7,8,10,11],
-        "Mercury": [3,5,6,11],
-        "Jupiter": [6,10,11,12],
-        "Venus": [6,8,11,12],
-        "Saturn": [1,4,7,8,9,10,11],
-        "Ascendant": [1,3,6,10,11],
+def format_ashtakavarga_data(bhinnashtakavarga: np.ndarray):
+    """Formats a (7, 12) Bhinnashtakavarga and its Sarvashtakavarga as dicts keyed by sign"""
+    sarvashtakavarga = calculate_sarvashtakavarga(bhinnashtakavarga).tolist()
+    return {
+        "sarvashtaka_varga": dict(zip(zodiac_signs, sarvashtakavarga)),
+        "bhinnashtaka_varga": {planet: dict(zip(zodiac_signs, bindus))
+                               for planet, bindus in zip(ASHTAKAVARGA_PLANETS, bhinnashtakavarga.tolist())}
     }
 
-    jupiter_benefic_houses = {
-        "Sun": [1,2,3,4,7,8,9,10,11],
-        "Moon": [2,5,7,9,11],
-        "Mars": [1,2,4,7,8,10,11],
-        "Mercury": [1,2,4,5,6,9,10,11],
-        "Jupiter": [1,2,3,4,7,8,10,11],
-        "Venus": [2,5,6,9,10,11],
-        "Saturn": [3,5,6,12],
-        "Ascendant": [1,2,4,5,6,7,9,10,11],
-    }
+class AshtakavargaTransitRequest(BaseModel):
+    horo_input: ChartInput
+    start_year: int
+    end_year: int
 
-    saturn_benefic_houses = {
-        "Sun": [1,2,4,7,8,10,11],
-        "Moon": [3,6,11],
-        "Mars": [3,5,6,10,11,12],
-        "Mercury": [6,8,9,10,11,12],
-        "Jupiter": [5,6,11,12],
-        "Venus": [6,11,12],
-        "Saturn": [3,5,6,11],
-        "Ascendant": [1,3,4,6,10,11],
+@app.post("/get_ashtakavarga_transits")
+async def get_ashtakavarga_transits(ashtakavarga_transit_request: AshtakavargaTransitRequest):
+    """
+    Scores the daily signs of the transiting planets, from 1st Jan of `start_year` to 31st Dec of `end_year`,
+    against the natal Ashtakavarga: for each day and planet, the bindus of the transited sign in the planet's own
+    natal BAV table ("bav_scores") and in the natal SAV ("sav_scores"). Rows are days, columns are "planets".
+    """
+    request = ashtakavarga_transit_request
+    if request.start_year > request.end_year:
+        raise HTTPException(status_code=400, detail="start_year must not be after end_year")
+    return await run_chart_job(build_ashtakavarga_transits, request.horo_input, request.start_year, request.end_year)
+
+def build_ashtakavarga_transits(chart_context: ChartContext, start_year: int, end_year: int):
+    """Samples the transit tables at local midnight of every day of the range and scores them in one array operation"""
+    time_zone = chart_context.horoscope.time_zone
+    first_day, last_day = date(start_year, 1, 1), date(end_year, 12, 31)
+    days = [first_day + timedelta(days=offset) for offset in range((last_day - first_day).days + 1)]
+    jd_start = local_datetime_to_jd(datetime(start_year, 1, 1), time_zone)
+    jd_end = local_datetime_to_jd(datetime(end_year, 12, 31, 23, 59, 59), time_zone)
+    ## Local midnights (exact for days without a UTC offset change)
+    jds = jd_start + np.arange(len(days), dtype=float)
+    transit_periods = transit_cache.get_transit_periods(ASHTAKAVARGA_PLANETS, jd_start, jd_end, chart_context.key.ayanamsa)
+
+    bhinnashtakavarga = get_natal_bhinnashtakavarga(chart_context)
+    bav_scores, sav_scores = score_transits(bhinnashtakavarga, sample_transit_signs(transit_periods, jds))
+    return {
+        "planets": ASHTAKAVARGA_PLANETS,
+        "dates": [day.isoformat() for day in days],
+        "bav_scores": bav_scores.tolist(),
+        "sav_scores": sav_scores.tolist(),
+        **format_ashtakavarga_data(bhinnashtakavarga),
     }
 
 
-    # Initialize Bhinnashtakavarga tables
-    bhinnashtakavarga = {planet: [0] * 12 for planet in planets}
-
-    # Calculate bindus for each sign in each planet's Ashtakavarga
-    for sign_index in range(12):
-        sign_num = sign_index + 1  # Convert to 1-12 format
 
-        # For each contributing planet
-        for contributor in planets:
-            contributor_pos = planet_positions.get(contributor)
-            if contributor_pos is None:
-                continue
-
-            # Calculate relative position
-            relative_pos = ((sign_num - contributor_pos + 1) % 12)
-            if relative_pos == 0:
-                relative_pos = 12
-
-            # Check if this relative position gets a bindu
-            # Use the appropriate benefic houses dictionary based on which planet's table we're calculating
-            if relative_pos in sun_benefic_houses[contributor]:
-                bhinnashtakavarga["Sun"][sign_index] += 1
-            if relative_pos in moon_benefic_houses[contributor]:
-                bhinnashtakavarga["Moon"][sign_index] += 1
-            if relative_pos in mercury_benefic_houses[contributor]:
-                bhinnashtakavarga["Mercury"][sign_index] += 1
-            if relative_pos in venus_benefic_houses[contributor]:
-                bhinnashtakavarga["Venus"][sign_index] += 1
-            if relative_pos in mars_benefic_houses[contributor]:
-                bhinnashtakavarga["Mars"][sign_index] += 1
-            if relative_pos in jupiter_benefic_houses[contributor]:
-                bhinnashtakavarga["Jupiter"][sign_index] += 1
-            if relative_pos in saturn_benefic_houses[contributor]:
-                bhinnashtakavarga["Saturn"][sign_index] += 1
-
-    # Calculate Sarvashtakavarga
-    sarvashtakavarga = [0] * 12
-    for i in range(12):
-        for planet in planets:
-            sarvashtakavarga[i] += bhinnashtakavarga[planet][i]
-
-
-    # Also calculate the sarvashtakavarga in the same format
-    sarva_total = {zodiac_signs[i]: sarvashtakavarga[i] for i in range(12)}
-
-    bhinnashtakavarga_data = {planet: {zodiac_signs[i]: bhinnashtakavarga[planet][i] for i in range(12)}
-                             for planet in planets if planet != "Ascendant"}
+## Batched chart endpoints
+## Max number of charts in one batch request
+BATCH_MAX_ITEMS = int(os.environ.get("VEDICASTRO_BATCH_MAX_ITEMS", 1000))
 
-    return {
+## Endpoint name → (ChartContext builder, ChartInput fields passed as extra builder arguments)
+BATCH_BUILDERS = {
+    "get_vimshottari_dasa": (build_vimshottari_dasa, ()),
+    "get_chart_data": (build_chart_data, ("return_style",)),
+    "get_rashi_chart_data": (build_rashi_chart_data, ()),
+    "get_kp_data": (build_kp_data, ()),
+    "get_kp_chart_with_cusps": (build_kp_chart_with_cusps, ()),
+    "get_ashtakavarga_data": (build_ashtakavarga_data, ()),
+}
 
-        "sarvashtaka_varga": sarva_total,
-
-        "bhinnashtaka_varga": bhinnashtakavarga_data
-    }
+class BatchChartRequest(BaseModel):
+    items: List[ChartInput]
 
+@app.post("/batch/{endpoint}")
+async def batch_chart_data(endpoint: str, batch_request: BatchChartRequest, stream: bool = False):
+    """
+    Computes `/{endpoint}` (Eg: get_kp_data, get_chart_data) for many charts in one request, fanned out across
+    the process pool. Each item returns {"index", "status": "ok", "result"} or {"index", "status": "error", "error"},
+    so a failing chart doesn't fail the batch.
+    Returns a JSON array in the order of the items, or with `stream=true` NDJSON lines as each chart completes.
+    """
+    if endpoint not in BATCH_BUILDERS:
+        raise HTTPException(status_code=404, detail=f"Unknown batch endpoint {endpoint}. Available: {', '.join(BATCH_BUILDERS)}")
+    if len(batch_request.items) > BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"A batch can contain at most {BATCH_MAX_ITEMS} items")
+
+    builder, arg_fields = BATCH_BUILDERS[endpoint]
+
+    async def run_item(index: int, horo_input: ChartInput):
+        try:
+            args = [getattr(horo_input, field) for field in arg_fields]
+            result = await run_chart_job(builder, horo_input, *args)
+            return {"index": index, "status": "ok", "result": jsonable_encoder(result)}
+        except Exception as e:
+            return {"index": index, "status": "error", "error": f"{type(e).__name__}: {e}"}
+
+    tasks = [asyncio.ensure_future(run_item(index, horo_input)) for index, horo_input in enumerate(batch_request.items)]
+    if not stream:
+        return await asyncio.gather(*tasks)
+
+    async def ndjson_lines():
+        try:
+            for completed in asyncio.as_completed(tasks):
+                yield json.dumps(await completed) + "\n"
+        finally:
+            ## Client disconnected: don't compute the remaining charts
+            for task in tasks:
+                task.cancel()
+
+    return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
 
 
 if __name__ == "__main__":
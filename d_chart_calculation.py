@@ -1,3 +1,5 @@
+import collections
+import numpy as np
 from typing import List, Tuple
 
 zodiac_signs = ["Aries", "Taurus", "Gemini", "Cancer", "Leo", "Virgo",
@@ -563,3 +565,117 @@ def calculate_d40_position(current_sign: str, sign_lon_dec_deg: float) -> Tuple[
 
     # If we get here, something is wrong with the degree value
     raise ValueError(f"Degree {sign_lon_dec_deg} not found in any range. Must be between 0 and 30.")
+
+
+## Table-driven varga engine
+## Each division is a (12 signs x N parts) table of varga sign indices (0 = Aries), built once, so that
+## the longitudes of all the objects of a chart are mapped through any set of divisions with array lookups.
+## The rules are those of the calculate_dN_position functions above, with exact part sizes (30 / N).
+
+Varga = collections.namedtuple("Varga", ["division", "name", "signs", "bounds"])
+
+def _varga_signs(starts, step: int, parts: int):
+    """Table of the signs counted from `starts[sign]` by `step` signs per part"""
+    return (np.asarray(starts)[:, None] + step * np.arange(parts)[None, :]) % 12
+
+_SIGNS = np.arange(12)
+_ODD = _SIGNS % 2 == 0                              # Aries, Gemini, ... (index 0, 2, ...)
+_MODALITY = _SIGNS % 3                              # 0: movable, 1: fixed, 2: dual
+_ELEMENT = _SIGNS % 4                               # 0: fire, 1: earth, 2: air, 3: water
+
+def _varga(division: int, name: str, signs, bounds=None):
+    signs = np.asarray(signs, dtype=np.int8)
+    return Varga(division, name, signs, None if bounds is None else np.asarray(bounds, dtype=float))
+
+VARGAS = {varga.division: varga for varga in [
+    _varga(1, "Rasi", _SIGNS[:, None]),
+    _varga(2, "Hora", np.where(_ODD[:, None], [4, 3], [3, 4])),
+    _varga(3, "Drekkana", _varga_signs(_SIGNS, 4, 3)),
+    _varga(4, "Chaturthamsa", _varga_signs(_SIGNS, 3, 4)),
+    _varga(5, "Panchamsa", _varga_signs(_ELEMENT, 4, 5)),
+    _varga(6, "Shashthamsa", _varga_signs(np.where(_ODD, 0, 6), 1, 6)),
+    _varga(7, "Saptamsa", _varga_signs(np.where(_ODD, _SIGNS, _SIGNS + 6), 1, 7)),
+    _varga(8, "Ashtamsa", _varga_signs(np.array([0, 8, 4])[_MODALITY], 1, 8)),
+    _varga(9, "Navamsa", _varga_signs(np.array([0, 9, 6, 3])[_ELEMENT], 1, 9)),
+    _varga(10, "Dasamsa", _varga_signs(np.where(_ODD, _SIGNS, _SIGNS + 8), 1, 10)),
+    _varga(12, "Dwadasamsa", _varga_signs(_SIGNS, 1, 12)),
+    _varga(16, "Shodasamsa", _varga_signs(np.array([0, 4, 8])[_MODALITY], 1, 16)),
+    _varga(20, "Vimsamsa", _varga_signs(np.array([0, 8, 4])[_MODALITY], 1, 20)),
+    _varga(24, "Chaturvimsamsa", _varga_signs(np.where(_ODD, 4, 3), 1, 24)),
+    _varga(27, "Saptavimsamsa", _varga_signs(np.array([0, 3, 6, 9])[_ELEMENT], 1, 27)),
+    ## Unequal parts of 5, 5, 8, 7 and 5 degrees, ruled by Mars, Saturn, Jupiter, Mercury, Venus in odd signs
+    _varga(30, "Trimsamsa", np.where(_ODD[:, None], [0, 10, 8, 2, 6], [1, 5, 11, 9, 7]), bounds=[0, 5, 10, 18, 25, 30]),
+    _varga(40, "Khavedamsa", _varga_signs(np.where(_ODD, 0, 6), 1, 40)),
+    _varga(45, "Akshavedamsa", _varga_signs(np.array([0, 4, 8])[_MODALITY], 1, 45)),
+    _varga(60, "Shashtiamsa", _varga_signs(_SIGNS, 1, 60)),
+]}
+
+def _map_varga(varga: Varga, signs: np.ndarray, sign_lons: np.ndarray):
+    """Varga signs and degrees of the natal sign indices and the longitudes within the signs (arrays of any shape)"""
+    parts = varga.signs.shape[1]
+    if varga.bounds is None:
+        part_lons = sign_lons * parts
+        ## Truncation is the floor of the non negative positions, and much faster than `//`
+        part_numbers = np.minimum((part_lons * (1 / 30)).astype(np.intp), parts - 1)
+        degrees = part_lons - 30 * part_numbers
+    else:
+        part_numbers = np.searchsorted(varga.bounds, sign_lons, side="right") - 1
+        part_numbers = np.clip(part_numbers, 0, parts - 1)
+        part_starts = varga.bounds[part_numbers]
+        degrees = (sign_lons - part_starts) / (varga.bounds[part_numbers + 1] - part_starts) * 30
+    return varga.signs.ravel()[signs * parts + part_numbers], degrees
+
+def get_varga_positions(longitudes, division: int):
+    """
+    Maps sidereal longitudes through a divisional chart.
+
+    Parameters
+    ==========
+    longitudes: array of sidereal longitudes, in degrees (0 - 360)
+    division: number of the divisional chart (Eg: 9 for D-9), one of VARGAS
+
+    Returns
+    =======
+    Two arrays of the shape of `longitudes`: the varga sign indices (0 = Aries) and the longitudes within the
+    varga sign (0 - 30 degrees), i.e. the position within the part scaled to 30 degrees.
+    """
+    longitudes = np.asarray(longitudes, dtype=float) % 360
+    signs = np.minimum((longitudes // 30).astype(np.intp), 11)
+    return _map_varga(VARGAS[division], signs, longitudes - 30 * signs)
+
+def calculate_varga_arrays(longitudes, divisions=(9,), degrees_dtype=np.float64):
+    """
+    Batch divisional chart computation, for cohorts of charts: maps an (n_charts x n_objects) array of sidereal
+    longitudes through several divisions with array operations only. The natal signs are computed once and
+    shared by all the divisions. Missing longitudes (NaN) get a sign of -1 and a NaN degree.
+
+    Parameters
+    ==========
+    longitudes: array of sidereal longitudes in degrees, of any shape (Eg: n_charts x n_objects)
+    divisions: numbers of the divisional charts (Eg: (9, 10)), each one of VARGAS
+    degrees_dtype: dtype of the returned degrees (Eg: np.float32 to halve the memory of large cohorts)
+
+    Returns
+    =======
+    signs: int8 array of shape (len(divisions), *longitudes.shape), the varga sign indices (0 = Aries)
+    degrees: array of the same shape, the longitudes within the varga signs (0 - 30 degrees)
+    """
+    unknown = [division for division in divisions if division not in VARGAS]
+    if unknown:
+        raise ValueError(f"Unsupported divisions {unknown}. Available: {', '.join(map(str, VARGAS))}")
+    longitudes = np.asarray(longitudes, dtype=float)
+    missing = np.isnan(longitudes)
+    has_missing = missing.any()
+    longitudes = np.where(missing, 0.0, longitudes) if has_missing else longitudes
+    longitudes = longitudes % 360
+    natal_signs = np.minimum((longitudes * (1 / 30)).astype(np.intp), 11)
+    sign_lons = longitudes - 30 * natal_signs
+
+    signs = np.empty((len(divisions), *longitudes.shape), dtype=np.int8)
+    degrees = np.empty((len(divisions), *longitudes.shape), dtype=degrees_dtype)
+    for index, division in enumerate(divisions):
+        signs[index], degrees[index] = _map_varga(VARGAS[division], natal_signs, sign_lons)
+    if has_missing:
+        signs[:, missing] = -1
+        degrees[:, missing] = np.nan
+    return signs, degrees
@@ -21,7 +21,7 @@ setup(
         "Operating System :: OS Independent",
     ],
     python_requires='>=3.11',
-    install_requires=["tqdm","polars","fastapi","uvicorn","prettytable","ipykernel","pyswisseph"],
+    install_requires=["tqdm","polars","fastapi","uvicorn","prettytable","ipykernel","pyswisseph","numpy"],
     dependency_links=["git+https://github.com/diliprk/flatlib.git@sidereal#egg=flatlib"]
 )
 
@@ -1,12 +1,13 @@
 import pandas as pd
 from tqdm import tqdm
 from datetime import datetime, timedelta
-from vedicastro.horary_chart import find_exact_ascendant_time, get_horary_ascendant_degree
+from vedicastro.horary_chart import find_exact_ascendant_time, get_horary_ascendant_degree, get_horary_day_table
 
 """
-This test takes bout 5 hours, to cycle through 1440 mins * 249 horary numbers for 1 day,
-which is about 374,400 combinations. Some combinations take slightly longer because of the cyclical
-clockwise procession through linear time across the zodiac, and some take a very short time. 
+This test cycles through 1440 mins * 249 horary numbers for 1 day, which is about 374,400 combinations.
+The ascendant of the test day is swept only once (see `get_horary_day_table`): every horary number is then
+a cached lookup, and the run time is dominated by building the houses chart of each match, i.e a few minutes
+instead of the ~5 hours taken by the earlier per-call ascendant search.
 For quick testing, you can change the `range(24*60)` to something minimal like `range(10)` in `minutes_progress`
 Running this script will create a .csv file in this same directory
 """
@@ -19,6 +20,10 @@ def run_horary_func_tests():
     # Initialize an empty list to store test results
     test_results = []
 
+    # Sweep the ascendant of the test day once, for all 249 horary numbers
+    get_horary_day_table(test_date["year"], test_date["month"], test_date["day"], test_date["utc"],
+                         test_date["latitude"], test_date["longitude"], test_date["ayan"])
+
     # Iterate through all horary numbers from 1 to 249 with a tqdm progress bar
     horary_progress = tqdm(range(1, 250), desc="Horary Ascendant Validation Progress")
     for horary_number in horary_progress:
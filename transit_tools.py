@@ -2,9 +2,10 @@
 #  transit_tools.py  –  "slow-moving planet" marriage scanner
 # ============================================================
 
-from copy import deepcopy
+import bisect
+from itertools import accumulate
 from datetime import timedelta,datetime
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Tuple, Iterable
 from utility import get_planets_aspecting_houses
 
 # ─────────────────────────────────────────────────────────────────────────
@@ -39,6 +40,128 @@ MARRIAGE_HOUSES     = {2, 7, 11}    # Match with VedicAstroAPI.py
 MIN_SIMULT_PLANETS  = 2                # ≥ 2 planets = "simultaneous"
 
 
+def houses_to_mask(houses: Iterable[int]) -> int:
+    """House numbers → bitmask (bit h set for house h). None / 0 are ignored."""
+    mask = 0
+    for house in houses:
+        if house:
+            mask |= 1 << house
+    return mask
+
+
+def mask_to_houses(mask: int) -> List[int]:
+    """Bitmask → sorted list of house numbers."""
+    return [house for house in range(1, 13) if mask >> house & 1]
+
+
+def _day(x: datetime) -> datetime:
+    """Midnight of the day of x."""
+    return datetime(x.year, x.month, x.day)
+
+
+class TransitIndex:
+    """
+    Sorted-interval index of the transit records, built once per request.
+
+    Records of `slow_moving_planets` are merged into one row per contiguous
+    stay of a planet in a sign (a stay split at retrograde stations is one
+    row), annotated once with the transiting / aspected houses and their
+    house bitmask, and their dates are parsed once. The master list is never
+    mutated. Rows are kept sorted by start date along with the running
+    maximum of the end dates, so the rows overlapping a date range are found
+    with two binary searches instead of a scan of the whole list.
+
+    The simultaneity segments of the whole horizon are swept once (per set
+    of block parameters) and each dasha slice cuts its blocks from them by
+    binary search. Rows are shared by all queries and must not be mutated.
+    """
+
+    def __init__(self, transit_list: List[Dict[str, Any]], slow_moving_planets: set,
+                 rashi_lords_map: Dict[int, str]):
+        #  house number via rashi → house map (first house of the sign) ------
+        house_of_sign = {}
+        for house, sign in rashi_lords_map.items():
+            house_of_sign.setdefault(sign, house)
+
+        records = sorted(((_to_dt(tr["start_date"]), _to_dt(tr["end_date"]), tr)
+                          for tr in transit_list if tr["planet"] in slow_moving_planets),
+                         key=lambda r: r[0])
+
+        #  merge contiguous stays of a planet in the same sign ---------------
+        runs = []                      # [start, end, row]
+        last_run = {}                  # planet → its latest run
+        for start, end, tr in records:
+            run = last_run.get(tr["planet"])
+            if run is not None and run[2]["sign"] == tr["sign"] and start <= run[1] + timedelta(days=1):
+                if end > run[1]:
+                    run[1], run[2]["end_date"] = end, tr["end_date"]
+                continue
+            house_number = house_of_sign.get(tr["sign"])
+            row = dict(tr,
+                       transiting_house=house_number,
+                       aspecting_houses=(get_planets_aspecting_houses(tr["planet"], house_number)
+                                         if house_number is not None else []))
+            run = last_run[tr["planet"]] = [start, end, row]
+            runs.append(run)
+
+        self.starts  = [r[0] for r in runs]
+        self.ends    = [r[1] for r in runs]
+        self.rows    = [r[2] for r in runs]
+        self.masks   = [houses_to_mask([r["transiting_house"], *r["aspecting_houses"]]) for r in self.rows]
+        # max_ends[i] = latest end among rows[:i+1]  →  non-decreasing
+        self.max_ends = list(accumulate(self.ends, max))
+        self._segments = {}
+
+    def overlapping(self, start: datetime, end: datetime) -> List[int]:
+        """Indices of the rows overlapping [start, end], in chronological order."""
+        first = bisect.bisect_left(self.max_ends, start)   # rows[:first] all end before `start`
+        last  = bisect.bisect_right(self.starts, end)      # rows[last:] all start after `end`
+        return [i for i in range(first, last) if self.ends[i] >= start]
+
+    def segments(self, min_planets: int, filter_houses: set | None, min_duration_days: int):
+        """
+        Simultaneity segments of the whole horizon, swept once per parameter
+        set: (first days, last days, segments) with the segments as in
+        sweep_simultaneous_segments and the first / last (inclusive) day of
+        each, for binary search.
+        """
+        key = (min_planets, None if filter_houses is None else frozenset(filter_houses), min_duration_days)
+        if key not in self._segments:
+            segments = sweep_simultaneous_segments(
+                list(zip(self.starts, self.ends)), self.masks,
+                min_planets = min_planets,
+                filter_mask = None if filter_houses is None else houses_to_mask(filter_houses),
+                min_duration_days = min_duration_days)
+            first_days = [_day(seg[0]) for seg in segments]
+            last_days  = [_day(seg[1] - timedelta(days=1)) for seg in segments]
+            self._segments[key] = (first_days, last_days, segments)
+        return self._segments[key]
+
+    def blocks_between(self, start: datetime, end: datetime, *, min_planets: int,
+                       filter_houses: set | None, min_duration_days: int) -> List[Dict[str, Any]]:
+        """
+        Simultaneous blocks within [start, end]: the segments overlapping the
+        window (binary search), trimmed to it, of ≥ min_duration_days days.
+        """
+        first_days, last_days, segments = self.segments(min_planets, filter_houses, min_duration_days)
+        first = bisect.bisect_left(last_days, start)
+        last  = bisect.bisect_right(first_days, end)
+
+        blocks = []
+        for i in range(first, last):
+            block_start = _day(max(first_days[i], start))
+            block_end   = _day(min(last_days[i], end))
+            duration = (block_end - block_start).days + 1
+            if duration < min_duration_days:
+                continue
+            block = format_simultaneous_block(self.rows, *segments[i])
+            block["start"] = block_start.strftime("%Y-%m-%d")
+            block["end"] = block_end.strftime("%Y-%m-%d")
+            block["duration_days"] = duration
+            blocks.append(block)
+        return blocks
+
+
 def merge_transits_for_dasha(
         *,
         transit_list:          List[Dict[str, Any]],
@@ -47,7 +170,8 @@ def merge_transits_for_dasha(
         rashi_lords_map:       Dict[int, str],
         min_simult_planets:    int   = MIN_SIMULT_PLANETS,
         filter_houses:         set   = MARRIAGE_HOUSES,
-        min_duration_days:     int   = 10  # Minimum duration in days
+        min_duration_days:     int   = 10,  # Minimum duration in days
+        transit_index:         TransitIndex | None = None
 ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
     """
     Return (unique_rows, simult_blocks) for the given dasha slice.
@@ -61,162 +185,109 @@ def merge_transits_for_dasha(
     min_simult_planets: Minimum number of planets required to form a block
     filter_houses: Set of houses that must be touched by at least one planet
     min_duration_days: Minimum duration in days for a block to be included
+    transit_index: TransitIndex of `transit_list` shared across dasha slices
+                   (built here when not given)
     """
+    if transit_index is None:
+        transit_index = TransitIndex(transit_list, slow_moving_planets, rashi_lords_map)
+
     dasha_start = _to_dt(dasha["start_date"])
     dasha_end   = _to_dt(dasha["end_date"])
 
-    merged = {}
-
-    for tr in transit_list:
-        if tr["planet"] not in slow_moving_planets:
-            continue
-
-        tr_start = _to_dt(tr["start_date"])
-        tr_end   = _to_dt(tr["end_date"])
-        if not date_ranges_overlap(tr_start, tr_end, dasha_start, dasha_end):
-            continue
-        t = deepcopy(tr)                     # never mutate the master list
-        sign = t["sign"]
-
-        #  house number via rashi → house map  -----------------------------
-        house_number = next((h for h, s in rashi_lords_map.items()
-                             if s == sign), None)
-        t["transiting_house"] = house_number
-        t["aspecting_houses"] = (
-            get_planets_aspecting_houses(t["planet"], house_number)
-            if house_number is not None else []
-        )
-
-        #  merge duplicates on (planet, sign) ------------------------------
-        key = (t["planet"], sign)
+    merged = {}      # (planet, sign) → [row, start, end, index of first row]
+
+    for i in transit_index.overlapping(dasha_start, dasha_end):
+        t = transit_index.rows[i]
+        start, end = transit_index.starts[i], transit_index.ends[i]
+
+        #  merge repeated stays on (planet, sign) ---------------------------
+        key = (t["planet"], t["sign"])
         if key in merged:
-            m = merged[key]
-            m["start_date"]   = min(m["start_date"], t["start_date"])
-            m["end_date"]     = max(m["end_date"],   t["end_date"])
-            m["aspecting_houses"] = sorted(
-                set(m.get("aspecting_houses", [])) |
-                set(t.get("aspecting_houses", []))
-            )
+            entry = merged[key]
+            m = entry[0]
+            if m is transit_index.rows[entry[3]]:
+                m = entry[0] = dict(m)          # copy only shared rows that change
+            if start < entry[1]:
+                m["start_date"], entry[1] = t["start_date"], start
+            if end > entry[2]:
+                m["end_date"], entry[2] = t["end_date"], end
         else:
-            merged[key] = t
+            merged[key] = [t, start, end, i]
 
-    unique_rows = list(merged.values())
+    unique_rows = [entry[0] for entry in merged.values()]
 
-    # ---------- 2-B.  carve out simultaneity windows ----------------------
-    simult_blocks = build_simultaneous_blocks(
-        unique_rows,
+    # ---------- 2-B.  cut the simultaneity windows of this slice ----------
+    simult_blocks = transit_index.blocks_between(
+        dasha_start, dasha_end,
         min_planets = min_simult_planets,
         filter_houses = filter_houses,
         min_duration_days = min_duration_days
     )
 
-    # Filter blocks to ensure they're within dasha period
-    filtered_blocks = []
-    for block in simult_blocks:
-        block_start = _to_dt(block["start"])
-        block_end = _to_dt(block["end"])
-
-        # Skip blocks that are completely outside the dasha period
-        if block_end < dasha_start or block_start > dasha_end:
-            continue
+    return unique_rows, simult_blocks
 
-        # Trim start date if needed
-        if block_start < dasha_start:
-            block["start"] = dasha_start.strftime("%Y-%m-%d")
 
-        # Trim end date if needed
-        if block_end > dasha_end:
-            block["end"] = dasha_end.strftime("%Y-%m-%d")
-
-        # Recalculate duration after trimming
-        new_duration = (_to_dt(block["end"]) - _to_dt(block["start"])).days + 1
-
-        # Skip if duration is now below minimum
-        if new_duration < min_duration_days:
-            continue
-
-        block["duration_days"] = new_duration
-        filtered_blocks.append(block)
-
-    return unique_rows, filtered_blocks
+def join_transits_for_dashas(
+        *,
+        transit_list:          List[Dict[str, Any]],
+        dashas:                Iterable[Dict[str, Any]],
+        slow_moving_planets:   set,
+        rashi_lords_map:       Dict[int, str],
+        **merge_kwargs
+) -> List[Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]]:
+    """
+    Joins every dasha slice against the transit list with a single shared
+    TransitIndex, so the simultaneity sweep runs once for all slices.
+    Returns one (unique_rows, simult_blocks) pair per slice, in the order of
+    `dashas`. `merge_kwargs` are passed to merge_transits_for_dasha
+    (min_simult_planets, filter_houses, ...).
+    """
+    transit_index = TransitIndex(transit_list, slow_moving_planets, rashi_lords_map)
+    return [merge_transits_for_dasha(transit_list=transit_list,
+                                     dasha=dasha,
+                                     slow_moving_planets=slow_moving_planets,
+                                     rashi_lords_map=rashi_lords_map,
+                                     transit_index=transit_index,
+                                     **merge_kwargs)
+            for dasha in dashas]
 
 
 # ------------------------------------------------------------------
 # 3.  Sweep-line interval compositor
 # ------------------------------------------------------------------
-def build_simultaneous_blocks(
-        rows:           List[Dict[str, Any]],
+def sweep_simultaneous_segments(
+        intervals:      List[Tuple[datetime, datetime]],
+        masks:          List[int],
         *,
         min_planets:    int,
-        filter_houses:  set | None = None,
-        min_duration_days: int = 10  # Minimum duration in days
-) -> List[Dict[str, Any]]:
+        filter_mask:    int | None = None,
+        min_duration_days: int = 10
+) -> List[Tuple[datetime, datetime, Tuple[int, ...], int]]:
     """
-    Return every maximal stretch in which the set of active transits
-    has ≥ min_planets and (optionally) touches `filter_houses`.
-    Each block contains per-planet detail.
-
-    Parameters:
-    -----------
-    rows: List of transit records
-    min_planets: Minimum number of planets required to form a block
-    filter_houses: Set of houses that must be touched by at least one planet
-    min_duration_days: Minimum duration in days for a block to be included
+    Sweep the (inclusive) row intervals once and return every stretch of
+    constant active set with ≥ min_planets rows, ≥ min_duration_days days
+    and (optionally) a house bitmask touching `filter_mask`, as
+    (start, end exclusive, active row indices, houses bitmask) tuples.
     """
     events: List[Tuple] = []            # (datetime, flag, row_index)
-    for idx, r in enumerate(rows):
-        start_date = _to_dt(r["start_date"])
-        end_date = _to_dt(r["end_date"])
+    for idx, (start_date, end_date) in enumerate(intervals):
         events.append((start_date, 1, idx))                    # +1  add
         events.append((end_date + timedelta(days=1), -1, idx)) # -1 remove
     events.sort(key=lambda x: x[0])     # sweep by time
 
     active: set[int] = set()
-    blocks  = []
+    segments = []
     prev_t  = None
 
     for t, flag, idx in events:
         # ----- close previous segment if any ------------------------------
-        if prev_t is not None and t > prev_t and len(active) >= min_planets:
-            duration_days = (t - prev_t).days
-
-            # Skip short periods
-            if duration_days < min_duration_days:
-                # Update active set and continue to next event
-                if flag == 1:
-                    active.add(idx)
-                else:
-                    active.discard(idx)  # Using discard to avoid KeyError if not present
-                prev_t = t
-                continue
-
-            houses_hit = set()
+        if (prev_t is not None and t > prev_t and len(active) >= min_planets
+                and (t - prev_t).days >= min_duration_days):
+            houses_mask = 0
             for i in active:
-                house = rows[i]["transiting_house"]
-                if house:  # Ensure house is not None
-                    houses_hit.add(house)
-                houses_hit.update(rows[i].get("aspecting_houses", []))
-
-            if filter_houses is None or houses_hit & filter_houses:
-                # per-planet info
-                planet_details = {
-                    rows[i]["planet"]: {
-                        "sign":              rows[i]["sign"],
-                        "transiting_house":  rows[i]["transiting_house"],
-                        "aspecting_houses":  rows[i].get("aspecting_houses", [])
-                    }
-                    for i in active
-                }
-
-                # Format dates as ISO strings in the final output
-                blocks.append({
-                    "start":            prev_t.strftime("%Y-%m-%d"),
-                    "end":              (t - timedelta(days=1)).strftime("%Y-%m-%d"),  # inclusive
-                    "duration_days":    duration_days,
-                    "planets":          sorted(planet_details.keys()),
-                    "houses_affected":  sorted(houses_hit),
-                    "planet_details":   planet_details
-                })
+                houses_mask |= masks[i]
+            if filter_mask is None or houses_mask & filter_mask:
+                segments.append((prev_t, t, tuple(sorted(active)), houses_mask))
 
         # ----- update active set ------------------------------------------
         if flag == 1:
@@ -225,7 +296,63 @@ def build_simultaneous_blocks(
             active.discard(idx)  # Using discard to avoid KeyError if not present
         prev_t = t
 
-    return blocks
+    return segments
+
+
+def format_simultaneous_block(rows, start: datetime, end: datetime, active: Tuple[int, ...],
+                              houses_mask: int) -> Dict[str, Any]:
+    """Output dict of a sweep segment, with per-planet detail."""
+    planet_details = {
+        rows[i]["planet"]: {
+            "sign":              rows[i]["sign"],
+            "transiting_house":  rows[i]["transiting_house"],
+            "aspecting_houses":  rows[i].get("aspecting_houses", [])
+        }
+        for i in active
+    }
+
+    # Format dates as ISO strings in the final output
+    return {
+        "start":            start.strftime("%Y-%m-%d"),
+        "end":              (end - timedelta(days=1)).strftime("%Y-%m-%d"),  # inclusive
+        "duration_days":    (end - start).days,
+        "planets":          sorted(planet_details.keys()),
+        "houses_affected":  mask_to_houses(houses_mask),
+        "planet_details":   planet_details
+    }
+
+
+def build_simultaneous_blocks(
+        rows:           List[Dict[str, Any]],
+        *,
+        min_planets:    int,
+        filter_houses:  set | None = None,
+        min_duration_days: int = 10,  # Minimum duration in days
+        intervals:      List[Tuple[datetime, datetime]] | None = None
+) -> List[Dict[str, Any]]:
+    """
+    Return every maximal stretch in which the set of active transits
+    has ≥ min_planets and (optionally) touches `filter_houses`.
+    Each block contains per-planet detail.
+
+    Parameters:
+    -----------
+    rows: List of transit records
+    min_planets: Minimum number of planets required to form a block
+    filter_houses: Set of houses that must be touched by at least one planet
+    min_duration_days: Minimum duration in days for a block to be included
+    intervals: Already parsed (start, end) datetimes of the rows, if available
+    """
+    if intervals is None:
+        intervals = [(_to_dt(r["start_date"]), _to_dt(r["end_date"])) for r in rows]
+    masks = [houses_to_mask([r["transiting_house"], *r.get("aspecting_houses", [])]) for r in rows]
+
+    segments = sweep_simultaneous_segments(
+        intervals, masks,
+        min_planets = min_planets,
+        filter_mask = None if filter_houses is None else houses_to_mask(filter_houses),
+        min_duration_days = min_duration_days)
+    return [format_simultaneous_block(rows, *segment) for segment in segments]
 
 
 # ------------------------------------------------------------------
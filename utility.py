@@ -1,4 +1,5 @@
 from typing import List
+from vedicastro.bitboard import positions_from
 # === Utility Functions ===
 from datetime import datetime
 def parse_date(date_str):
@@ -32,6 +33,19 @@ def get_planet_positions(rashi_chart):
 def is_marriage_house(house_name):
     return house_name in ["II", "VII", "XI"]
 
+# Aspect patterns of the transiting planets, counted from their house (the 7th is the opposite house)
+TRANSIT_ASPECT_COUNTS = {
+    "Jupiter": [5, 7, 9],
+    "Saturn": [3, 7, 10],
+    "Mars": [4, 6, 8],
+    "Sun": [7],
+    "Moon": [7],
+    "Mercury": [7],
+    "Venus": [7],
+    "Rahu": [],            # No aspects
+    "Ketu": []             # No aspects
+}
+
 def get_planets_aspecting_houses(planet: str, current_house: int) -> List[int]:
     """
     Calculate the houses that a planet aspects based on its current house position.
@@ -43,35 +57,9 @@ def get_planets_aspecting_houses(planet: str, current_house: int) -> List[int]:
     Returns:
         List[int]: List of houses that the planet aspects
     """
-    def get_house_number(base: int, offset: int) -> int:
-        house = base + offset
-        while house > 12:
-            house -= 12
-        while house < 1:
-            house += 12
-        return house
-
-    # Define aspect patterns for different planets
-    aspect_patterns = {
-        "Jupiter": [4, 6, 8],  # 5th, 7th, and 9th houses from its position
-        "Saturn": [2, 6, 9],   # 3rd, 7th, and 10th houses from its position
-        "Mars": [3, 5, 7],     # 4th, 6th, and 8th houses from its position
-        "Sun": [6],            # 7th house from its position
-        "Moon": [6],           # 7th house from its position
-        "Mercury": [6],        # 7th house from its position
-        "Venus": [6],          # 7th house from its position
-        "Rahu": [],            # No aspects
-        "Ketu": []             # No aspects
-    }
-
-    if planet not in aspect_patterns:
+    if planet not in TRANSIT_ASPECT_COUNTS:
         return []
 
-    # Calculate aspecting houses based on the planet's pattern
-    aspecting_houses = [
-        get_house_number(current_house, offset)
-        for offset in aspect_patterns[planet]
-    ]
-
-    return aspecting_houses
+    # Houses counted from the planet's house, in the order of the pattern
+    return [house + 1 for house in positions_from(current_house - 1, TRANSIT_ASPECT_COUNTS[planet])]
 
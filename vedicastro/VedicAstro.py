@@ -1,26 +1,27 @@
 from vedicastro.utils import *
-from datetime import datetime, timedelta
+from vedicastro.kp_lords import KP_LORDS, get_kp_lords
+from vedicastro.dasa_engine import VimshottariDasa
+from vedicastro.chart_cache import CHART_CACHE, ChartCacheEntry
+from vedicastro import constants, bitboard, aspect_engine
+from datetime import datetime
 from flatlib import const
 from flatlib.chart import Chart
 from flatlib.geopos import GeoPos
 from flatlib.datetime import Datetime, Date
 from flatlib.object import GenericObject
-from flatlib import aspects
 import collections
+import numpy as np
 import polars as pl
 
 
 ## GLOBAL VARS
-RASHIS = ['Aries', 'Taurus', 'Gemini', 'Cancer', 'Leo', 'Virgo', 'Libra',
-          'Scorpio', 'Sagittarius', 'Capricorn', 'Aquarius', 'Pisces']
+## Zodiac constants of vedicastro.constants, also importable from this module
+RASHIS, SIGN_LORDS = constants.RASHIS, constants.SIGN_LORDS
 
 ROMAN_HOUSE_NUMBERS = {'House1': 'I', 'House2': 'II', 'House3': 'III', 'House4': 'IV', 'House5': 'V', 'House6': 'VI',
                     'House7': 'VII', 'House8': 'VIII', 'House9': 'IX', 'House10': 'X', 'House11': 'XI', 'House12': 'XII'
                     }
 
-## Lords of the 12 Zodiac Signs
-SIGN_LORDS = ["Mars", "Venus", "Mercury", "Moon", "Sun", "Mercury", "Venus", "Mars", "Jupiter", "Saturn", "Saturn", "Jupiter"]
-
 NAKSHATRAS = ['Ashwini','Bharani','Krittika','Rohini','Mrigashīrsha', 'Ardra', 'Punarvasu', 'Pushya', 'Āshleshā',
 'Maghā', 'PūrvaPhalgunī', 'UttaraPhalgunī', 'Hasta', 'Chitra', 'Svati', 'Vishakha', 'Anuradha', 'Jyeshtha', 'Mula',
 'PurvaAshadha','UttaraAshadha', 'Shravana', 'Dhanishta','Shatabhisha', 'PurvaBhādrapadā', 'UttaraBhādrapadā', 'Revati']
@@ -81,7 +82,7 @@ class VedicHoroscopeData:
         self.longitude  = longitude
         self.ayanamsa   = ayanamsa
         self.house_system = house_system
-        self.time_zone = tz if tz else TimezoneFinder().timezone_at(lat=self.latitude, lng=self.longitude)
+        self.time_zone = resolve_time_zone(self.latitude, self.longitude, tz)
         self.chart_time = datetime(self.year, self.month, self.day, self.hour, self.minute)
         self.utc,_ = get_utc_offset(self.time_zone, self.chart_time)
 
@@ -94,42 +95,51 @@ class VedicHoroscopeData:
         return HOUSE_SYSTEM_MAPPING.get(self.house_system, None)
 
     def generate_chart(self):
-        """Generates a `flatlib.Chart` object for the given time and location data"""
+        """
+        Generates a `flatlib.Chart` object for the given time and location data.
+        The chart is shared through the process-wide chart cache, so it must not be modified.
+        """
+        return self.get_chart_entry().chart
+
+    def get_chart_entry(self):
+        """
+        Returns the ChartCacheEntry (chart, planets data and houses data) of the given time and location data,
+        from the chart cache, keyed by (Julian Day UT, latitude, longitude, ayanamsa, house system)
+        """
         date = Datetime([self.year, self.month, self.day], ["+",self.hour, self.minute, self.second], self.utc)
+        key = (date.jd, self.latitude, self.longitude, self.ayanamsa, self.house_system)
+        return CHART_CACHE.get_or_create(key, lambda: self._build_chart_entry(date))
+
+    def _build_chart_entry(self, date: Datetime):
         geopos = GeoPos(self.latitude, self.longitude)
         chart = Chart(date, geopos, IDs=const.LIST_OBJECTS, hsys=self.get_house_system(), mode = self.get_ayanamsa())
-        return chart
+        return ChartCacheEntry(chart, tuple(self._get_planets_data(chart)), tuple(self._get_houses_data(chart)))
 
     def get_planetary_aspects(self, chart: Chart):
-        """Computes planetary aspects using flatlib modules getAspect"""
+        """
+        Computes planetary aspects with the vectorized aspect_engine (the aspect types and orbs of flatlib's getAspect),
+        reporting each pair of planets once
+        """
         planets = [const.SUN, const.MOON, const.MARS, const.MERCURY, const.JUPITER, const.VENUS, const.SATURN,
                     const.URANUS, const.NEPTUNE, const.PLUTO, const.NORTH_NODE, const.SOUTH_NODE]
-        # aspects_output = []
+        ## Replace North and South nodes with conventional names
+        positions = {planet.replace("North Node", "Rahu").replace("South Node", "Ketu"): chart.get(planet).lon
+                     for planet in planets}
         aspects_dict = []
 
-        for p1 in planets:
-            for p2 in planets:
-                if p1 != p2:
-                    obj1 = chart.get(p1)
-                    obj2 = chart.get(p2)
-                    aspect = aspects.getAspect(obj1, obj2, const.ALL_ASPECTS)
-                    ## Replace North and South nodes with conventional names
-                    p1_new = p1.replace("North Node", "Rahu").replace("South Node", "Ketu")
-                    p2_new = p2.replace("North Node", "Rahu").replace("South Node", "Ketu")
-                    if aspect.exists():
-                        aspect_type = ASPECT_MAPPING[int(aspect.type)]  # Use global variable here
-                        aspect_orb = round(aspect.orb, 3)  # get the orb value
-                        # Calculate longitude difference
-                        p1_lon = round(obj1.lon, 3)
-                        p2_lon = round(obj2.lon, 3)
-                        lon_diff = round(abs(p1_lon - p2_lon), 3)
-                        if lon_diff > 180:
-                            lon_diff = 360 - lon_diff
-
-                        aspects_dict.append({"P1":p1_new, "P2": p2_new, "AspectType" : aspect_type,
-                                            "AspectDeg" : aspect.type, "AspectOrb" : aspect_orb,
-                                            "P1_Lon": p1_lon,"P2_Lon": p2_lon,"LonDiff": lon_diff})
+        for aspect in aspect_engine.get_aspects(positions):
+            aspect_type = ASPECT_MAPPING[aspect.AspectDeg]  # Use global variable here
+            aspect_orb = round(aspect.AspectOrb, 3)  # get the orb value
+            # Calculate longitude difference
+            p1_lon = round(aspect.P1_Lon, 3)
+            p2_lon = round(aspect.P2_Lon, 3)
+            lon_diff = round(abs(p1_lon - p2_lon), 3)
+            if lon_diff > 180:
+                lon_diff = 360 - lon_diff
 
+            aspects_dict.append({"P1":aspect.P1, "P2": aspect.P2, "AspectType" : aspect_type,
+                                "AspectDeg" : aspect.AspectDeg, "AspectOrb" : aspect_orb,
+                                "P1_Lon": p1_lon,"P2_Lon": p2_lon,"LonDiff": lon_diff})
 
         return aspects_dict
 
@@ -149,46 +159,19 @@ class VedicHoroscopeData:
         planets = [const.SUN, const.MOON, const.MARS, const.MERCURY, const.JUPITER, const.VENUS,
                    const.SATURN, const.URANUS, const.NEPTUNE, const.PLUTO, const.NORTH_NODE, const.SOUTH_NODE]
 
-        # Define the aspect rules for each planet according to Vedic astrology (Drishti)
-        aspect_rules = {
-            const.SUN: [7],             # Sun aspects 7th sign
-            const.MOON: [7],            # Moon aspects 7th sign
-            const.MERCURY: [7],         # Mercury aspects 7th sign
-            const.VENUS: [7],           # Venus aspects 7th sign
-            const.PLUTO: [7],           # Pluto aspects 7th sign (not traditional)
-            const.URANUS: [7],          # Uranus aspects 7th sign (not traditional)
-            const.NEPTUNE: [7],         # Neptune aspects 7th sign (not traditional)
-            const.MARS: [4, 7, 8],      # Mars aspects 4th, 7th, and 8th signs
-            const.JUPITER: [5, 7, 9],   # Jupiter aspects 5th, 7th, and 9th signs
-            const.SATURN: [3, 7, 10],   # Saturn aspects 3rd, 7th, and 10th signs
-            const.NORTH_NODE: [5, 7, 9], # Rahu aspects 5th, 7th, and 9th signs like Jupiter
-            const.SOUTH_NODE: [5, 7, 9]  # Ketu aspects 5th, 7th, and 9th signs like Jupiter
-        }
-
         # Initialize the result dictionary
         planet_aspects = {}
 
         for planet in planets:
-            # Get the planet object
-            obj = chart.get(planet)
-
-            # Get the sign number (1-12) where the planet is located
-            planet_sign = ((int(obj.lon) // 30) + 1)
+            # Get the sign index (0-11) where the planet is located
+            planet_sign = int(chart.get(planet).lon // 30) % 12
 
             # Replace North and South nodes with conventional names
             planet_name = planet.replace("North Node", "Rahu").replace("South Node", "Ketu")
 
-            # Initialize the list of signs this planet aspects
-            aspected_signs = []
-
-            # Add signs based on the planet's aspect rules
-            for aspect in aspect_rules.get(planet, [7]):  # Default to just 7th aspect
-                # Calculate the aspected sign (1-12)
-                aspected_sign = ((planet_sign + aspect - 1) % 12) + 1
-                aspected_signs.append(aspected_sign)
-
-            # Store the planet's aspected signs in the result dictionary
-            planet_aspects[planet_name] = sorted(aspected_signs)
+            # Signs aspected from the planet's sign, with the drishti rules of the bitboard (7th by default)
+            aspected_signs = bitboard.drishti_mask(planet_name, planet_sign)
+            planet_aspects[planet_name] = [sign + 1 for sign in bitboard.mask_positions(aspected_signs)]
 
         return planet_aspects
 
@@ -198,49 +181,29 @@ class VedicHoroscopeData:
         """
         planets = [const.SUN, const.MOON, const.MARS, const.MERCURY, const.JUPITER, const.VENUS, const.SATURN,
                 const.URANUS, const.NEPTUNE, const.PLUTO, const.NORTH_NODE, const.SOUTH_NODE]
+        # Replace North and South nodes with conventional names
+        planet_names = [planet.replace("North Node", "Rahu").replace("South Node", "Ketu") for planet in planets]
+        planet_lons = [round(chart.get(planet).lon, 3) for planet in planets]
+
+        # Longitude differences of all the pairs at once, and the ones which are multiples of 15 degrees
+        lon_diffs = np.round(aspect_engine.separation_matrix(planet_lons), 3)
+        exact_aspects = np.triu(np.remainder(lon_diffs, 15) == 0.0, 1)
+        # Skip Rahu-Ketu pair as they're always 180 degrees apart
+        exact_aspects[planet_names.index("Rahu"), planet_names.index("Ketu")] = False
+
         aspects_dict = []
+        for i, j in zip(*np.nonzero(exact_aspects)):
+            lon_diff = float(lon_diffs[i, j])
+            aspects_dict.append({
+                "P1": planet_names[i],
+                "P2": planet_names[j],
+                "P1_Lon": planet_lons[i],
+                "P2_Lon": planet_lons[j],
+                "AspectType": f"{int(lon_diff)}° Aspect",
+                "AspectDeg": lon_diff
+            })
 
-        for p1 in planets:
-            for p2 in planets:
-                if p1 != p2:
-                    # Skip Rahu-Ketu pair as they're always 180 degrees apart
-                    if {p1, p2} == {const.NORTH_NODE, const.SOUTH_NODE}:
-                        continue
-
-                    obj1 = chart.get(p1)
-                    obj2 = chart.get(p2)
-
-                    # Replace North and South nodes with conventional names
-                    p1_name = p1.replace("North Node", "Rahu").replace("South Node", "Ketu")
-                    p2_name = p2.replace("North Node", "Rahu").replace("South Node", "Ketu")
-
-                    p1_lon = round(obj1.lon, 3)
-                    p2_lon = round(obj2.lon, 3)
-                    lon_diff = abs(p1_lon - p2_lon)
-                    if lon_diff > 180:
-                        lon_diff = 360 - lon_diff
-                    lon_diff = round(lon_diff, 3)
-
-                    # Check if lon_diff is a multiple of 15 degrees with a small tolerance
-                    if abs(lon_diff % 15) == 0.0 :
-
-                        aspects_dict.append({
-                            "P1": p1_name,
-                            "P2": p2_name,
-                            "P1_Lon": p1_lon,
-                            "P2_Lon": p2_lon,
-                            "AspectType": f"{int(lon_diff)}° Aspect",
-                            "AspectDeg": lon_diff
-                        })
-
-        # Remove duplicate entries using tuple sort
-        unique_aspects = {}
-        for aspect in aspects_dict:
-            planet_pair = tuple(sorted([aspect['P1'], aspect['P2']]))
-            if planet_pair not in unique_aspects:
-                unique_aspects[planet_pair] = aspect
-
-        return list(unique_aspects.values())
+        return aspects_dict
 
     def get_planetary_aspects_vedic(self, planets_data: collections.namedtuple):
         """
@@ -301,51 +264,12 @@ class VedicHoroscopeData:
     def get_rl_nl_sl_data(self, deg : float):
         """
         Returns the  Rashi (Sign) Lord, Nakshatra, Nakshatra Pada, Nakshatra Lord, Sub Lord and Sub Sub Lord
-        corresponding to the given degree.
+        corresponding to the given degree, looked up from the precomputed KP table in `kp_lords`.
         """
-        duration = [7, 20, 6, 10, 7, 18, 16, 19, 17]
-
-        lords = ["Ketu", "Venus", "Sun", "Moon", "Mars", "Rahu", "Jupiter", "Saturn", "Mercury"]
-
-        star_lords = lords * 3 ## lords for the 27 Nakshatras
-
-        ## Compute Sign lords
-        sign_deg = deg % 360  # Normalize degree to [0, 360)
-        sign_index = int(sign_deg // 30)  # Each zodiac sign is 30 degrees
-
-        # Compute Nakshatra details
-        nakshatra_deg = sign_deg % 13.332  # Each nakshatra is 13.332 degrees
-        nakshatra_index = int(sign_deg // 13.332)  # Find the nakshatra index
-        pada = int((nakshatra_deg % 13.332) // 3.325) + 1  # Each pada is 3.325 degrees
-
-        # Ensure nakshatra_index is within bounds
-        nakshatra_index = nakshatra_index % len(NAKSHATRAS)
-
-        # Compute SubLords
-        deg = deg - 120 * int(deg / 120)
-        degcum = 0
-        i = 0
-
-        while i < 9:
-            deg_nl = 360 / 27
-            j = i
-            while True:
-                deg_sl = deg_nl * duration[j] / 120
-                k = j
-                while True:
-                    deg_ss = deg_sl * duration[k] / 120
-                    degcum += deg_ss
-                    if degcum >= deg:
-                        return {"Nakshatra": NAKSHATRAS[nakshatra_index], "Pada": pada,
-                                "NakshatraLord": star_lords[nakshatra_index], "RasiLord": SIGN_LORDS[sign_index],
-                                "SubLord": lords[j], "SubSubLord": lords[k] }
-                    k = (k + 1) % 9
-                    if k == j:
-                        break
-                j = (j + 1) % 9
-                if j == i:
-                    break
-            i += 1
+        lords = get_kp_lords(deg)
+        return {"Nakshatra": NAKSHATRAS[lords.Nakshatra], "Pada": lords.Pada,
+                "NakshatraLord": KP_LORDS[lords.NakshatraLord], "RasiLord": KP_LORDS[lords.RasiLord],
+                "SubLord": KP_LORDS[lords.SubLord], "SubSubLord": KP_LORDS[lords.SubSubLord] }
 
 
     def get_transit_details(self):
@@ -388,6 +312,12 @@ class VedicHoroscopeData:
         new_houses_chart: flatlib Chart Object using which new house numbers have to be
                         computed, typically used along with KP Horary Method
         """
+        entry = CHART_CACHE.find_chart(chart) if new_houses_chart is None else None
+        if entry is not None:
+            return list(entry.planets_data)
+        return self._get_planets_data(chart, new_houses_chart)
+
+    def _get_planets_data(self, chart: Chart, new_houses_chart: Chart = None):
         PlanetsData = collections.namedtuple("PlanetsData",PLANETS_TABLE_COLS)
 
         # Get the house each planet is in
@@ -422,6 +352,12 @@ class VedicHoroscopeData:
 
     def get_houses_data_from_chart(self, chart: Chart):
         """Generate the houses data table given a `flatlib.Chart` object"""
+        entry = CHART_CACHE.find_chart(chart)
+        if entry is not None:
+            return list(entry.houses_data)
+        return self._get_houses_data(chart)
+
+    def _get_houses_data(self, chart: Chart):
         HousesData = collections.namedtuple("HousesData", HOUSES_TABLE_COLS) # Create NamedTuple Collection to store data
         houses_data = []
         for house in chart.houses:
@@ -554,6 +490,8 @@ class VedicHoroscopeData:
         # Get the house each planet is in
         planets_house_deposition = {data.Object: data.HouseNr for data in planets_data}
 
+        # Houses mask (bit 0 = 1st house) ruled by each planet
+        house_lordships = bitboard.lordship_masks((data.HouseNr - 1, data.RasiLord) for data in houses_data)
 
         significators_data = []
         for planet in planets_data:
@@ -564,10 +502,10 @@ class VedicHoroscopeData:
             B = planet.HouseNr
 
             # C. House nrs where the star lord planet is also the rashi lord
-            C = [data.HouseNr for data in houses_data if data.RasiLord == planet.NakshatraLord]
+            C = [house + 1 for house in bitboard.mask_positions(house_lordships.get(planet.NakshatraLord, 0))]
 
             # D. House nrs where the planet itself is also the rashi lord
-            D = [data.HouseNr for data in houses_data if data.RasiLord == planet.Object]
+            D = [house + 1 for house in bitboard.mask_positions(house_lordships.get(planet.Object, 0))]
 
             # Append data to NamedTuple Collection
             significators_data.append(SignificatorsData(planet.Object, A, B, C, D))
@@ -585,16 +523,18 @@ class VedicHoroscopeData:
         # Create a mapping of planets to their star lords (Nakshatra Lords)
         planet_to_star_lord = {data.Object: data.NakshatraLord for data in planets_data}
 
+        # Bitboard of the houses (bit 0 = 1st house) occupied by the planets, and the bit of each planet's star lord
+        board = bitboard.ChartBitboard({planet.Object: planet.HouseNr - 1 for planet in planets_data})
+        star_lord_bits = [board.planets_mask([planet.NakshatraLord]) for planet in planets_data]
+
         significators_data = []
         for house in houses_data:
             # A. Planets in the star of occupants of that house
-            # A1.1) Get all the rows which match with the house.HouseNr
-            occupant_house_planets = [planet.Object for planet in planets_data if planet.HouseNr == house.HouseNr]
-            # A1.2.) For each planet in occupant_house_planets find out if that planet is the Nakshatra Lord for any row in the planets_data
-            A = [planet.Object for planet in planets_data if planet.NakshatraLord in occupant_house_planets]
+            occupants = board.occupants_of[house.HouseNr - 1]
+            A = [planet.Object for planet, star_lord_bit in zip(planets_data, star_lord_bits) if star_lord_bit & occupants]
 
             # B. Planets in that house
-            B = [planet.Object for planet in planets_data if planet.HouseNr == house.HouseNr]
+            B = board.planets_in(occupants)
 
             # C. Planets in the star of owners of that house
             C = [planet for planet, star_lord in planet_to_star_lord.items() if star_lord == house.RasiLord]
@@ -613,131 +553,7 @@ class VedicHoroscopeData:
         Computes the Vimshottari Dasa for the chart including Maha Dasha, Bhukti, and Pratyantar.
         Returns sorted output with earlier dates on top.
         """
-        # Get the moon object from the chart
-        moon = chart.get(const.MOON)
-        moon_details = clean_select_objects_split_str(str(moon))
-
-        # Moon's Details
-        moon_rl_nl_sl = self.get_rl_nl_sl_data(deg = moon.lon)
-        moon_nakshatra = moon_rl_nl_sl["Nakshatra"]
-        moon_nakshatra_lord = moon_rl_nl_sl["NakshatraLord"]
-        moon_sign_lord = moon_rl_nl_sl["RasiLord"]
-
-        # Helper function to format datetime objects to string
-        dt_tuple_str = lambda start_date: start_date.strftime("%d-%m-%Y")
-
-        # Define the sequence of the Dasa periods and their lengths
-        dasa_sequence = ['Ketu', 'Venus', 'Sun', 'Moon', 'Mars', 'Rahu', 'Jupiter', 'Saturn', 'Mercury']
-        dasa_lengths = [7, 20, 6, 10, 7, 18, 16, 19, 17]
-        dasa_years = dict(zip(dasa_sequence, dasa_lengths))
-
-        # Find the starting point of the Dasa sequence
-        start_index = dasa_sequence.index(moon_nakshatra_lord)
-
-        # Reorder the Dasa sequence to start with the moon's Nakshatra Lord
-        dasa_sequence = dasa_sequence[start_index:] + dasa_sequence[:start_index]
-        dasa_lengths = dasa_lengths[start_index:] + dasa_lengths[:start_index]
-        dasa_order = dict(zip(dasa_sequence, dasa_lengths))
-
-        # Calculate initial dates and periods
-        typical_nakshatra_arc = 800
-        nakshatra_start = NAKSHATRAS.index(moon_nakshatra) * typical_nakshatra_arc
-        moon_lon_mins = round(moon.lon * 60, 2)
-        elapsed_moon_mins = moon_lon_mins - nakshatra_start
-        remaining_arc_mins = typical_nakshatra_arc - elapsed_moon_mins
-        starting_dasa_duration = dasa_order[moon_nakshatra_lord]
-        start_dasa_remaining_duration = (starting_dasa_duration/typical_nakshatra_arc) * remaining_arc_mins
-        start_dasa_elapsed_duration = starting_dasa_duration - start_dasa_remaining_duration
-
-        chart_date = (self.year, self.month, self.day, self.hour, self.minute)
-        dasa_start_date = compute_new_date(start_date=chart_date, diff_value=start_dasa_elapsed_duration, direction="backward")
-
-        def calculate_pratyantar_periods(maha_planet, bhukti_planet, bhukti_start_date):
-            """Calculate Pratyantar periods for a given Bhukti"""
-            if isinstance(bhukti_start_date, str):
-                bhukti_start_date = datetime.strptime(bhukti_start_date, '%d-%m-%Y')
-
-            maha_years = dasa_years[maha_planet]
-            bhukti_duration = (dasa_years[bhukti_planet] * maha_years) / 120
-
-            pratyantar_periods = {}
-            current_date = bhukti_start_date
-
-            # Start Pratyantar sequence from the Bhukti planet
-            bhukti_index = dasa_sequence.index(bhukti_planet)
-            pratyantar_sequence = dasa_sequence[bhukti_index:] + dasa_sequence[:bhukti_index]
-
-            for pratyantar_planet in pratyantar_sequence:
-                # Calculate Pratyantar duration
-                pratyantar_duration = (dasa_years[pratyantar_planet] * bhukti_duration) / 120
-                end_date = current_date + timedelta(days=int(pratyantar_duration * 365.25))
-
-                pratyantar_periods[pratyantar_planet] = {
-                    'start': current_date.strftime('%d-%m-%Y'),
-                    'end': end_date.strftime('%d-%m-%Y')
-                }
-
-                current_date = end_date
-
-            return pratyantar_periods
-
-        # Store all dasha periods
-        dasha_periods = []
-
-        # Calculate all periods
-        for i in range(len(dasa_sequence)):
-            dasa = dasa_sequence[i]
-            dasa_length = dasa_lengths[i]
-            dasa_end_date = compute_new_date(start_date=tuple(dasa_start_date.timetuple())[:5],
-                                           diff_value=dasa_length, direction="forward")
-
-            bhukti_periods = {}
-            bhukti_start_date = dasa_start_date
-
-            # Calculate Bhukti periods
-            bhukti_start_index = dasa_sequence.index(dasa)
-            bhukti_sequence = dasa_sequence[bhukti_start_index:] + dasa_sequence[:bhukti_index]
-
-            for bhukti in bhukti_sequence:
-                bhukti_length = dasa_length * dasa_years[bhukti] / 120
-                bhukti_end_date = compute_new_date(start_date=tuple(bhukti_start_date.timetuple())[:5],
-                                                 diff_value=bhukti_length, direction="forward")
-
-                # Calculate Pratyantar periods for this Bhukti
-                pratyantar_periods = calculate_pratyantar_periods(dasa, bhukti, bhukti_start_date)
-                print(pratyantar_periods)
-                bhukti_periods[bhukti] = {
-                    'start': dt_tuple_str(bhukti_start_date),
-                    'end': dt_tuple_str(bhukti_end_date),
-                    'pratyantars': pratyantar_periods
-                }
-
-                bhukti_start_date = bhukti_end_date
-
-            dasha_periods.append({
-                'planet': dasa,
-                'start': dasa_start_date,
-                'end': dasa_end_date,
-                'bhuktis': bhukti_periods
-            })
-
-            dasa_start_date = dasa_end_date
-
-        # Create final dictionary
-        vimshottari_dasa = {
-            d['planet']: {
-                'start': dt_tuple_str(d['start']),
-                'end': dt_tuple_str(d['end']),
-                'bhuktis': {
-                    bhukti: {
-                        'start': bhukti_data['start'],
-                        'end': bhukti_data['end'],
-                        'pratyantars': bhukti_data['pratyantars']
-                    }
-                    for bhukti, bhukti_data in d['bhuktis'].items()
-                }
-            }
-            for d in dasha_periods
-        }
-
-        return vimshottari_dasa
+        # The periods are computed from the exact birth instant (UT) and formatted as local dates
+        birth_date = datetime(self.year, self.month, self.day, self.hour, self.minute, int(self.second))
+        dasa = VimshottariDasa(local_datetime_to_jd(birth_date, self.time_zone), chart.get(const.MOON).lon, self.time_zone)
+        return dasa.to_nested_dict(depth = 3, sub_keys = ("bhuktis", "pratyantars"))
@@ -1,7 +1,23 @@
+from . import constants
 from . import VedicAstro
 from . import horary_chart
 from . import utils
 from . import compute_dasha
+from . import bitboard
+from . import aspect_engine
+from . import yoga_engine
+from . import yoga_timeline
 from . import yogas
 from . import extended_yogas
 from . import astrocartography
+from . import transit_engine
+from . import transit_cache
+from . import kp_lords
+from . import dasa_engine
+from . import chart_context
+from . import process_pool
+from . import pipeline
+from . import result_store
+from . import single_flight
+from . import chart_cache
+from . import ashtakavarga
@@ -0,0 +1,163 @@
+"""
+Vectorized Ashtakavarga.
+
+The benefic places (bindus) of the 7 Ashtakavarga tables are encoded once as a constant boolean tensor
+`BINDU_TENSOR[table, contributor, place]`: True when the `place + 1`th sign counted from a contributor (the 7
+planets and the ascendant) gives a bindu in the table of a planet. The Bhinnashtakavarga (BAV) of a chart is a
+roll of each contributor's row to the contributor's sign, summed over the contributors, and the Sarvashtakavarga
+(SAV) is the sum of the 7 BAV tables. Both are computed with array indexing for any number of charts at once.
+
+Transit mode scores the signs of the transiting planets (Eg: one row per day of a date range) against the natal
+BAV / SAV with a single fancy-indexing operation.
+"""
+import numpy as np
+
+## Planets with an Ashtakavarga table, and the contributors of bindus to the tables
+ASHTAKAVARGA_PLANETS = ["Sun", "Moon", "Mars", "Mercury", "Jupiter", "Venus", "Saturn"]
+CONTRIBUTORS = ASHTAKAVARGA_PLANETS + ["Ascendant"]
+
+## Benefic places (counted from the contributor, 1 - 12) of the table of each planet
+BENEFIC_PLACES = {
+    "Sun": {
+        "Sun": [1, 2, 4, 7, 8, 9, 10, 11],
+        "Moon": [3, 6, 10, 11],
+        "Mars": [1, 2, 4, 7, 8, 9, 10, 11],
+        "Mercury": [3, 5, 6, 9, 10, 11, 12],
+        "Jupiter": [5, 6, 9, 11],
+        "Venus": [6, 7, 12],
+        "Saturn": [1, 2, 4, 7, 8, 9, 10, 11],
+        "Ascendant": [3, 4, 6, 10, 11, 12],
+    },
+    "Moon": {
+        "Sun": [3, 6, 7, 8, 10, 11],
+        "Moon": [1, 3, 6, 7, 10, 11],
+        "Mars": [2, 3, 5, 6, 9, 10, 11],
+        "Mercury": [1, 3, 4, 5, 7, 8, 10, 11],
+        "Jupiter": [1, 4, 7, 8, 10, 11, 12],
+        "Venus": [3, 4, 5, 7, 9, 10, 11],
+        "Saturn": [3, 5, 6, 11],
+        "Ascendant": [3, 6, 10, 11],
+    },
+    "Mars": {
+        "Sun": [3, 5, 6, 10, 11],
+        "Moon": [3, 6, 11],
+        "Mars": [1, 2, 4, 7, 8, 10, 11],
+        "Mercury": [3, 5, 6, 11],
+        "Jupiter": [6, 10, 11, 12],
+        "Venus": [6, 8, 11, 12],
+        "Saturn": [1, 4, 7, 8, 9, 10, 11],
+        "Ascendant": [1, 3, 6, 10, 11],
+    },
+    "Mercury": {
+        "Sun": [5, 6, 9, 11, 12],
+        "Moon": [2, 4, 6, 8, 10, 11],
+        "Mars": [1, 2, 4, 7, 8, 9, 10, 11],
+        "Mercury": [1, 3, 5, 6, 9, 10, 11, 12],
+        "Jupiter": [6, 8, 11, 12],
+        "Venus": [1, 2, 3, 4, 5, 8, 9, 11],
+        "Saturn": [1, 2, 4, 7, 8, 9, 10, 11],
+        "Ascendant": [1, 2, 4, 6, 8, 10, 11],
+    },
+    "Jupiter": {
+        "Sun": [1, 2, 3, 4, 7, 8, 9, 10, 11],
+        "Moon": [2, 5, 7, 9, 11],
+        "Mars": [1, 2, 4, 7, 8, 10, 11],
+        "Mercury": [1, 2, 4, 5, 6, 9, 10, 11],
+        "Jupiter": [1, 2, 3, 4, 7, 8, 10, 11],
+        "Venus": [2, 5, 6, 9, 10, 11],
+        "Saturn": [3, 5, 6, 12],
+        "Ascendant": [1, 2, 4, 5, 6, 7, 9, 10, 11],
+    },
+    "Venus": {
+        "Sun": [8, 11, 12],
+        "Moon": [1, 2, 3, 4, 5, 8, 9, 11, 12],
+        "Mars": [3, 5, 6, 9, 11, 12],
+        "Mercury": [3, 5, 6, 9, 11],
+        "Jupiter": [5, 8, 9, 10, 11],
+        "Venus": [1, 2, 3, 4, 5, 8, 9, 10, 11],
+        "Saturn": [3, 4, 5, 8, 9, 10, 11],
+        "Ascendant": [1, 2, 3, 4, 5, 8, 9, 11],
+    },
+    "Saturn": {
+        "Sun": [1, 2, 4, 7, 8, 10, 11],
+        "Moon": [3, 6, 11],
+        "Mars": [3, 5, 6, 10, 11, 12],
+        "Mercury": [6, 8, 9, 10, 11, 12],
+        "Jupiter": [5, 6, 11, 12],
+        "Venus": [6, 11, 12],
+        "Saturn": [3, 5, 6, 11],
+        "Ascendant": [1, 3, 4, 6, 10, 11],
+    },
+}
+
+def _build_bindu_tensor():
+    tensor = np.zeros((len(ASHTAKAVARGA_PLANETS), len(CONTRIBUTORS), 12), dtype=bool)
+    for table, planet in enumerate(ASHTAKAVARGA_PLANETS):
+        for contributor, name in enumerate(CONTRIBUTORS):
+            tensor[table, contributor, np.array(BENEFIC_PLACES[planet][name]) - 1] = True
+    tensor.setflags(write=False)
+    return tensor
+
+## (7 tables, 8 contributors, 12 places) bindu rules
+BINDU_TENSOR = _build_bindu_tensor()
+
+def calculate_bhinnashtakavarga(contributor_signs):
+    """
+    Computes the Bhinnashtakavarga of one or many charts.
+
+    Parameters
+    ==========
+    contributor_signs: int array of shape (..., 8): the sign index (0 = Aries) of each contributor, in the
+                       CONTRIBUTORS order. Negative values mark a missing contributor, which gives no bindus.
+
+    Returns
+    =======
+    int8 array of shape (..., 7, 12): the bindus of each sign in the table of each ASHTAKAVARGA_PLANETS planet
+    """
+    contributor_signs = np.asarray(contributor_signs)
+    ## Place of each sign counted from each contributor (0 = the contributor's sign): the roll of the rules
+    places = (np.arange(12) - contributor_signs[..., :, None]) % 12                        # (..., 8, 12)
+    bindus = BINDU_TENSOR[:, np.arange(len(CONTRIBUTORS))[:, None], places]                 # (7, ..., 8, 12)
+    bindus = np.moveaxis(bindus, 0, -3) & (contributor_signs >= 0)[..., None, :, None]      # (..., 7, 8, 12)
+    return bindus.sum(axis=-2, dtype=np.int8)
+
+def calculate_sarvashtakavarga(bhinnashtakavarga):
+    """Sums the 7 Bhinnashtakavarga tables (shape (..., 7, 12)) into the Sarvashtakavarga (shape (..., 12))"""
+    return np.asarray(bhinnashtakavarga).sum(axis=-2, dtype=np.int16)
+
+def score_transits(bhinnashtakavarga, transit_signs):
+    """
+    Scores the signs of the transiting planets against a natal Ashtakavarga, for many instants at once.
+
+    Parameters
+    ==========
+    bhinnashtakavarga: natal BAV, shape (7, 12)
+    transit_signs: int array of shape (n, 7): the sign index of each ASHTAKAVARGA_PLANETS planet at n instants
+                   (Eg: days)
+
+    Returns
+    =======
+    bav_scores: (n, 7) bindus of each transiting planet in its own natal BAV table, at the sign it transits
+    sav_scores: (n, 7) natal SAV bindus of the sign transited by each planet
+    """
+    bhinnashtakavarga = np.asarray(bhinnashtakavarga)
+    transit_signs = np.asarray(transit_signs)
+    sarvashtakavarga = calculate_sarvashtakavarga(bhinnashtakavarga)
+    bav_scores = bhinnashtakavarga[np.arange(len(ASHTAKAVARGA_PLANETS)), transit_signs]
+    sav_scores = sarvashtakavarga[transit_signs]
+    return bav_scores, sav_scores
+
+def sample_transit_signs(transit_periods: dict, jds, planets: list = ASHTAKAVARGA_PLANETS):
+    """
+    Returns the sign index of each planet at each Julian Day (UT) of an array, shape (n, len(planets)), from
+    the TransitPeriod lists of the planets (Eg: of `transit_cache.get_transit_periods`) covering the instants.
+    """
+    jds = np.asarray(jds, dtype=float)
+    signs = np.empty((len(jds), len(planets)), dtype=np.int8)
+    for column, planet in enumerate(planets):
+        periods = transit_periods[planet]
+        start_jds = np.array([period.start_jd for period in periods])
+        period_signs = np.array([period.SignIndex for period in periods], dtype=np.int8)
+        indices = np.clip(np.searchsorted(start_jds, jds, side="right") - 1, 0, len(periods) - 1)
+        signs[:, column] = period_signs[indices]
+    return signs
@@ -0,0 +1,116 @@
+"""
+Vectorized aspect engine.
+
+The angular separation of every pair of planets is one (n, n) NumPy matrix per chart (or (n, m) between two
+position vectors, Eg: transiting against natal planets), and the aspect types are matched against it one type at
+a time, in priority order, over all the pairs (and all the charts of a batch) at once.
+
+The rules are the ones of flatlib's `aspects.getAspect` with `const.ALL_ASPECTS`: an aspect type is formed when
+the orb (distance of the separation to the aspect angle) is within the orb of the aspect type, which for the major
+aspects is the largest of the orbs of the two planets, and the first type in orb wins. The moon nodes only form
+conjunctions with each other. Each pair of planets of a chart is reported once.
+"""
+import collections
+import numpy as np
+
+NO_ASPECT = -1
+MAJOR_ASPECTS = [0, 60, 90, 120, 180]
+MINOR_ASPECTS = [30, 36, 45, 72, 108, 135, 144, 150]
+
+## Orb of each aspect type, in the order the types are tried. None: the largest PLANET_ORBS of the two planets
+ASPECT_ORBS = {**dict.fromkeys(MAJOR_ASPECTS), **dict.fromkeys(MINOR_ASPECTS, 3)}
+
+## Orb of each planet for the major aspects
+PLANET_ORBS = { "Sun": 15, "Moon": 12, "Mercury": 7, "Venus": 7, "Mars": 8, "Jupiter": 9, "Saturn": 9,
+                "Uranus": 5, "Neptune": 5, "Pluto": 5, "Rahu": 12, "Ketu": 12,
+                }
+
+## Points which only form conjunctions between themselves
+MOON_NODES = ("Rahu", "Ketu")
+
+Aspect = collections.namedtuple("Aspect", ["P1", "P2", "AspectDeg", "AspectOrb", "P1_Lon", "P2_Lon"])
+
+def separation_matrix(lons1, lons2=None):
+    """
+    Shortest angular distances (0 - 180) between the longitudes of shape (..., n) and the ones of shape (..., m),
+    shape (..., n, m). The longitudes are compared with themselves by default.
+    """
+    lons1 = np.asarray(lons1, dtype=float)
+    lons2 = lons1 if lons2 is None else np.asarray(lons2, dtype=float)
+    separations = np.remainder(lons2[..., None, :] - lons1[..., :, None], 360)
+    return np.abs(np.where(separations > 180, separations - 360, separations))
+
+def orb_limits(planets1: list, planets2: list = None, aspect_orbs: dict = ASPECT_ORBS,
+               planet_orbs: dict = PLANET_ORBS, conjunction_only: tuple = MOON_NODES):
+    """
+    Largest orb of each aspect type for each pair of planets, shape (len(aspect_orbs), n, m), with -1 for the
+    aspect types a pair cannot form. Planets missing from `planet_orbs` have no orb of their own.
+    """
+    planets2 = planets1 if planets2 is None else planets2
+    orbs1 = np.array([planet_orbs.get(planet, 0) for planet in planets1], dtype=float)
+    orbs2 = np.array([planet_orbs.get(planet, 0) for planet in planets2], dtype=float)
+    pair_orbs = np.maximum(orbs1[:, None], orbs2[None, :])
+    conjunctions_only = (np.isin(planets1, conjunction_only)[:, None] & np.isin(planets2, conjunction_only)[None, :])
+
+    limits = np.empty((len(aspect_orbs), len(planets1), len(planets2)))
+    for index, (angle, orb) in enumerate(aspect_orbs.items()):
+        limits[index] = pair_orbs if orb is None else orb
+        if angle != 0:
+            limits[index][conjunctions_only] = -1
+    return limits
+
+def aspect_matrix(lons1, planets1: list, lons2=None, planets2: list = None, aspect_orbs: dict = ASPECT_ORBS,
+                  planet_orbs: dict = PLANET_ORBS, conjunction_only: tuple = MOON_NODES):
+    """
+    Computes the aspects between the planets of one or many charts.
+
+    Parameters
+    ==========
+    lons1: longitudes of the planets1, shape (..., n). Leading dimensions are a batch (Eg: charts or days).
+    planets1: names of the n planets
+    lons2, planets2: longitudes (..., m) and names of the m planets aspected by the planets1 (Eg: natal planets
+                     aspected by transiting planets). The planets1 are compared with themselves by default, and
+                     a planet never aspects itself.
+    aspect_orbs, planet_orbs, conjunction_only: orb tables (see ASPECT_ORBS, PLANET_ORBS and MOON_NODES)
+
+    Returns
+    =======
+    aspects: int array of shape (..., n, m): angle of the aspect of each pair (Eg: 120), NO_ASPECT if none
+    orbs: float array of shape (..., n, m): orb of each aspect, 0 if none
+    """
+    separations = separation_matrix(lons1, lons2)
+    limits = orb_limits(planets1, planets2, aspect_orbs, planet_orbs, conjunction_only)
+    aspects = np.full(separations.shape, NO_ASPECT)
+    orbs = np.zeros(separations.shape)
+    for angle, limit in zip(aspect_orbs, limits):
+        orb = np.abs(separations - angle)
+        found = (aspects == NO_ASPECT) & (orb <= limit)
+        aspects[found] = angle
+        orbs[found] = orb[found]
+    if lons2 is None:
+        diagonal = np.arange(len(planets1))
+        aspects[..., diagonal, diagonal] = NO_ASPECT
+        orbs[..., diagonal, diagonal] = 0
+    return aspects, orbs
+
+def get_aspects(positions: dict, **orb_tables):
+    """
+    Aspects between the planets of a chart, from a dict of planet name to longitude. Each pair is reported once,
+    as an Aspect whose P1 comes first in the dict, in the order of the dict.
+    """
+    planets, lons = list(positions), list(positions.values())
+    aspects, orbs = aspect_matrix(lons, planets, **orb_tables)
+    return [Aspect(planets[i], planets[j], int(aspects[i, j]), float(orbs[i, j]), lons[i], lons[j])
+            for i, j in zip(*np.nonzero(np.triu(aspects != NO_ASPECT, 1)))]
+
+def get_transit_aspects(transit_positions: dict, natal_positions: dict, **orb_tables):
+    """
+    Aspects of the transiting planets (P1) to the natal planets (P2), from dicts of planet name to longitude.
+    A transiting planet can aspect its own natal position (Eg: the return of a planet is a conjunction).
+    """
+    transit_planets, natal_planets = list(transit_positions), list(natal_positions)
+    transit_lons, natal_lons = list(transit_positions.values()), list(natal_positions.values())
+    aspects, orbs = aspect_matrix(transit_lons, transit_planets, natal_lons, natal_planets, **orb_tables)
+    return [Aspect(transit_planets[i], natal_planets[j], int(aspects[i, j]), float(orbs[i, j]),
+                   transit_lons[i], natal_lons[j])
+            for i, j in zip(*np.nonzero(aspects != NO_ASPECT))]
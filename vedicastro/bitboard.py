@@ -0,0 +1,166 @@
+"""
+Bitboard representation of a chart.
+
+The 12 signs (or houses) of a chart are the 12 bits of an int: bit i is the sign index i (0 = Aries), or the
+house i + 1 when the board is built on houses. A set of signs is a mask, so questions like "which planets are
+in kendras from the Moon" or "who aspects the 7th" are a rotation and a few and / or of masks instead of loops
+over lists and dicts. "Counted from" uses the traditional inclusive counting: the 1st from a sign is the sign
+itself, the 7th is the opposite sign.
+
+`ChartBitboard` holds, for each planet of a chart, the mask of the sign it occupies, of the signs it aspects
+(Vedic drishti) and of the signs it owns. Sets of planets are bitmasks too (bit = planet index in the board).
+"""
+from .constants import SIGN_LORDS
+
+FULL_MASK = (1 << 12) - 1
+
+def positions_mask(*positions: int):
+    """Mask of sign indices / house indices (0 - 11)"""
+    mask = 0
+    for position in positions:
+        mask |= 1 << position
+    return mask
+
+def mask_positions(mask: int):
+    """Sorted sign indices / house indices (0 - 11) of a mask"""
+    return [position for position in range(12) if (mask >> position) & 1]
+
+def counts_mask(*counts: int):
+    """Mask of counts from the 1st sign (Eg: counts_mask(1, 4, 7, 10) are the kendras from the 1st sign)"""
+    return positions_mask(*((count - 1) % 12 for count in counts))
+
+def rotate(mask: int, count: int):
+    """Rotates a mask forward by `count` signs (Eg: rotate(counts_mask(7), 3) is the 7th from the 4th sign)"""
+    count %= 12
+    return ((mask << count) | (mask >> (12 - count))) & FULL_MASK
+
+def counted_from(position: int, counts_mask: int):
+    """Mask of the counts of a counts mask, counted from a position (Eg: counted_from(moon, KENDRAS))"""
+    return rotate(counts_mask, position)
+
+def positions_from(position: int, counts: list):
+    """Positions (0 - 11) of a list of counts from a position, in the order of the counts"""
+    return [(position + count - 1) % 12 for count in counts]
+
+KENDRAS = counts_mask(1, 4, 7, 10)
+TRIKONAS = counts_mask(1, 5, 9)
+DUSTHANAS = counts_mask(6, 8, 12)
+SEVENTH = counts_mask(7)
+
+## Signs aspected (Vedic drishti) by each planet, counted from its sign. The other planets aspect the 7th only.
+DRISHTI_COUNTS = {
+    "Mars": [4, 7, 8],
+    "Jupiter": [5, 7, 9],
+    "Saturn": [3, 7, 10],
+    "Rahu": [5, 7, 9],
+    "Ketu": [5, 7, 9],
+}
+DRISHTI = {planet: counts_mask(*counts) for planet, counts in DRISHTI_COUNTS.items()}
+
+def lordship_masks(lords: list):
+    """Positions mask owned by each lord, from a list of (position, lord) (Eg: the lords of the house cusps)"""
+    owned = {}
+    for position, lord in lords:
+        owned[lord] = owned.get(lord, 0) | (1 << position)
+    return owned
+
+## Signs owned by each planet
+OWNED_SIGNS = lordship_masks(enumerate(SIGN_LORDS))
+
+def drishti_mask(planet: str, position: int, rules: dict = DRISHTI, default: int = SEVENTH):
+    """Mask of the signs aspected by a planet in a sign, with the aspect counts masks of `rules`"""
+    return counted_from(position, rules.get(planet, default))
+
+
+class ChartBitboard:
+    """
+    12 bit masks of the positions occupied, aspected and owned by the planets of a chart.
+
+    Parameters
+    ==========
+    positions: dict of planet name to its sign index (or house index), 0 - 11
+    owned: dict of planet name to the mask of the positions it owns. Defaults to OWNED_SIGNS, which is right
+           for a board of signs. Boards of houses should pass the houses ruled by each planet.
+    aspect_rules: dict of planet name to the counts mask of its aspects (default: DRISHTI, the 7th otherwise)
+    """
+
+    def __init__(self, positions: dict, owned: dict = None, aspect_rules: dict = DRISHTI):
+        owned = OWNED_SIGNS if owned is None else owned
+        self.planets = tuple(positions)
+        self.planet_index = {planet: index for index, planet in enumerate(self.planets)}
+        self.positions = tuple(positions.values())
+        ## Per planet masks
+        self.occupancy = tuple(1 << position for position in self.positions)
+        self.aspects = tuple(drishti_mask(planet, position, aspect_rules) for planet, position in positions.items())
+        self.owned = tuple(owned.get(planet, 0) for planet in self.planets)
+        ## Per position sets of planets
+        occupants = [0] * 12
+        for index, position in enumerate(self.positions):
+            occupants[position] |= 1 << index
+        self.occupants_of = tuple(occupants)
+        self.all_planets = (1 << len(self.planets)) - 1
+
+    def __contains__(self, planet: str):
+        return planet in self.planet_index
+
+    def position_of(self, planet: str):
+        index = self.planet_index.get(planet)
+        return None if index is None else self.positions[index]
+
+    def planets_mask(self, planets: list):
+        """Set of the planets of a list which are on the board"""
+        mask = 0
+        for planet in planets:
+            index = self.planet_index.get(planet)
+            if index is not None:
+                mask |= 1 << index
+        return mask
+
+    def planets_in(self, planets_mask: int):
+        """Names of a set of planets, in the board order"""
+        return [planet for index, planet in enumerate(self.planets) if (planets_mask >> index) & 1]
+
+    def _union(self, masks: tuple, planets_mask: int):
+        mask = 0
+        while planets_mask:
+            index = (planets_mask & -planets_mask).bit_length() - 1
+            mask |= masks[index]
+            planets_mask &= planets_mask - 1
+        return mask
+
+    def occupied(self, planets_mask: int = None):
+        """Positions mask occupied by a set of planets (all of them by default)"""
+        return self._union(self.occupancy, self.all_planets if planets_mask is None else planets_mask)
+
+    def aspected(self, planets_mask: int = None):
+        """Positions mask aspected by a set of planets (all of them by default)"""
+        return self._union(self.aspects, self.all_planets if planets_mask is None else planets_mask)
+
+    def occupants(self, mask: int):
+        """Set of the planets occupying a positions mask"""
+        planets = 0
+        for position in mask_positions(mask):
+            planets |= self.occupants_of[position]
+        return planets
+
+    def aspecting(self, mask: int, planets_mask: int = None, rules: dict = None, default: int = SEVENTH):
+        """
+        Set of the planets (of a set, all of them by default) aspecting any position of a mask. `rules` replaces
+        the aspect counts of the board (Eg: with the 1st count to include conjunctions).
+        """
+        planets_mask = self.all_planets if planets_mask is None else planets_mask
+        planets = 0
+        for index, planet in enumerate(self.planets):
+            if (planets_mask >> index) & 1:
+                aspects = self.aspects[index] if rules is None else drishti_mask(planet, self.positions[index], rules, default)
+                if aspects & mask:
+                    planets |= 1 << index
+        return planets
+
+    def owners(self, mask: int):
+        """Set of the planets owning any position of a mask"""
+        return sum(1 << index for index, owned in enumerate(self.owned) if owned & mask)
+
+    def from_planet(self, planet: str, counts_mask: int):
+        """Positions mask of a counts mask counted from the position of a planet (Eg: from_planet("Moon", KENDRAS))"""
+        return counted_from(self.position_of(planet), counts_mask)
@@ -0,0 +1,151 @@
+"""
+Process-wide, in-memory LRU cache of flatlib charts and their planets / houses tables.
+
+The front end calls many endpoints back-to-back for the same person (D-charts, KP data, ashtakavarga, yogas,
+astrocartography), and each of them builds the same `VedicHoroscopeData` chart. `VedicHoroscopeData.generate_chart`
+looks the chart up in `CHART_CACHE` first, keyed by (Julian Day UT, latitude, longitude, ayanamsa, house system).
+An entry holds the chart and its planets and houses tables, computed once when the entry is created.
+Threads missing the same key at the same time build the entry once: the others wait for it (single-flight).
+
+Entries are shared by all the readers of a process, so they are immutable: the tables are tuples of namedtuples
+and the cached flatlib Chart must not be modified by its users (charts that need changes are copied first).
+
+Configuration (environment variables)
+=====================================
+VEDICASTRO_CHART_CACHE_ENTRIES: max number of cached charts (default: 256). 0 disables the cache.
+VEDICASTRO_CHART_CACHE_MB: max approximate size of the cached charts, in MB (default: 64)
+"""
+import os
+import sys
+import types
+import threading
+import collections
+from .single_flight import SingleFlight
+
+CHART_CACHE_ENTRIES = int(os.environ.get("VEDICASTRO_CHART_CACHE_ENTRIES", 256))
+CHART_CACHE_MAX_BYTES = int(float(os.environ.get("VEDICASTRO_CHART_CACHE_MB", 64)) * 1024 * 1024)
+
+ChartCacheEntry = collections.namedtuple("ChartCacheEntry", ["chart", "planets_data", "houses_data"])
+
+## Objects not counted in the approximate size of an entry: shared by all entries or not data
+_SHARED_TYPES = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType, types.MethodType)
+
+def approximate_size(obj, seen: set = None):
+    """Approximate memory size of an object graph, in bytes: sums `sys.getsizeof` of all reachable containers and attributes"""
+    seen = set() if seen is None else seen
+    if id(obj) in seen or isinstance(obj, _SHARED_TYPES):
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(approximate_size(key, seen) + approximate_size(value, seen) for key, value in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(approximate_size(item, seen) for item in obj)
+    elif hasattr(obj, "__dict__"):
+        size += approximate_size(vars(obj), seen)
+    return size
+
+
+class ChartCache:
+    """
+    Thread-safe LRU cache of ChartCacheEntry, bounded by the number of entries and their approximate size in bytes.
+
+    Parameters
+    ==========
+    max_entries: max number of cached entries. 0 disables the cache.
+    max_bytes: max approximate size of the cached entries
+    """
+
+    def __init__(self, max_entries: int = CHART_CACHE_ENTRIES, max_bytes: int = CHART_CACHE_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = collections.OrderedDict()   # key -> (entry, size)
+        self._chart_keys = {}                       # id(entry.chart) -> key, to find the tables of a cached chart
+        self._lock = threading.Lock()
+        ## Coalesces the concurrent creations of the same entry
+        self._single_flight = SingleFlight()
+        self.bytes = 0
+        ## Counters
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: tuple):
+        """Returns the cached entry of a key (marking it as recently used), or None"""
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return cached[0]
+
+    def put(self, key: tuple, entry: ChartCacheEntry):
+        """Caches an entry and returns the cached entry of the key (an already cached one wins)"""
+        if self.max_entries <= 0:
+            return entry
+        size = approximate_size(entry)
+        with self._lock:
+            if key in self._entries:
+                return self._entries[key][0]
+            self._entries[key] = (entry, size)
+            self._chart_keys[id(entry.chart)] = key
+            self.bytes += size
+            while len(self._entries) > self.max_entries or (self.bytes > self.max_bytes and len(self._entries) > 1):
+                _, (evicted, evicted_size) = self._entries.popitem(last=False)
+                del self._chart_keys[id(evicted.chart)]
+                self.bytes -= evicted_size
+                self.evictions += 1
+        return entry
+
+    def get_or_create(self, key: tuple, factory):
+        """
+        Returns the cached entry of a key, or creates it with `factory()` and caches it. Concurrent calls
+        missing the same key wait for the entry created by the first one.
+        """
+        entry = self.get(key)
+        if entry is None:
+            entry = self._single_flight.run(key, self._create, key, factory)
+        return entry
+
+    def _create(self, key: tuple, factory):
+        ## The entry may have been cached by a flight that completed since the miss
+        with self._lock:
+            cached = self._entries.get(key)
+        return cached[0] if cached is not None else self.put(key, factory())
+
+    def find_chart(self, chart):
+        """Returns the cached entry holding a chart object, or None (Eg: the chart was evicted or not cached)"""
+        with self._lock:
+            key = self._chart_keys.get(id(chart))
+            return self._entries[key][0] if key is not None else None
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._chart_keys.clear()
+            self.bytes = 0
+
+    def get_stats(self):
+        """Returns the size and the hit / miss counters of the cache"""
+        with self._lock:
+            return {
+                "pid": os.getpid(),
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "coalesced": self._single_flight.coalesced,
+            }
+
+
+## Cache of the charts of the current process
+CHART_CACHE = ChartCache()
+
+def get_stats():
+    """Returns the stats of the CHART_CACHE of the current process. Module level, so it can run on a worker process."""
+    return CHART_CACHE.get_stats()
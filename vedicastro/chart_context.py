@@ -0,0 +1,100 @@
+"""
+Per-request chart context.
+
+A single API request often needs several views of the same horoscope (planets and houses tables, significators,
+aspects, the rasi chart and the dasha periods). Building a `VedicHoroscopeData` and a flatlib Chart for each of
+these repeats the same ephemeris evaluation. A `ChartContext` computes the chart once per chart configuration
+(date & time, location, ayanamsa and house system) and lazily derives and memoizes everything built from it.
+"""
+import collections
+from datetime import datetime
+from functools import cached_property
+from .VedicAstro import VedicHoroscopeData
+from .compute_dasha import get_vimshottari_dasa
+
+ChartKey = collections.namedtuple("ChartKey", ["year", "month", "day", "hour", "minute", "second", "tz",
+                                               "latitude", "longitude", "ayanamsa", "house_system"])
+
+
+class ChartContext:
+    """
+    Lazily computed and memoized chart data of one chart configuration.
+
+    Contexts of the same birth data with a different ayanamsa / house system are obtained with `with_settings`,
+    which returns the same sibling context for the same settings, so a composite request builds each distinct
+    chart only once.
+    """
+
+    def __init__(self, year: int, month: int, day: int, hour: int, minute: int, second: int,
+                 latitude: float, longitude: float, tz: str = None, ayanamsa: str = "Krishnamurti",
+                 house_system: str = "Placidus", _siblings: dict = None):
+        self.key = ChartKey(year, month, day, hour, minute, second, tz, latitude, longitude, ayanamsa, house_system)
+        ## Contexts sharing this birth data, keyed by (ayanamsa, house_system). Shared by all siblings.
+        self._siblings = _siblings if _siblings is not None else {}
+        self._siblings.setdefault((ayanamsa, house_system), self)
+        self._derived = {}
+
+    def with_settings(self, ayanamsa: str, house_system: str):
+        """Returns the context of the same birth data with another ayanamsa and house system"""
+        settings = (ayanamsa, house_system)
+        if settings not in self._siblings:
+            key = self.key
+            ChartContext(key.year, key.month, key.day, key.hour, key.minute, key.second, key.latitude, key.longitude,
+                         key.tz, ayanamsa, house_system, _siblings=self._siblings)
+        return self._siblings[settings]
+
+    def memoize(self, name: str, func):
+        """Returns the memoized result of `func(self)`, computing it on first use. Used for derived API views."""
+        if name not in self._derived:
+            self._derived[name] = func(self)
+        return self._derived[name]
+
+    @cached_property
+    def horoscope(self):
+        key = self.key
+        return VedicHoroscopeData(year=key.year, month=key.month, day=key.day, hour=key.hour, minute=key.minute,
+                                  second=key.second, tz=key.tz, latitude=key.latitude, longitude=key.longitude,
+                                  ayanamsa=key.ayanamsa, house_system=key.house_system)
+
+    @cached_property
+    def chart(self):
+        return self.horoscope.generate_chart()
+
+    @cached_property
+    def planets_data(self):
+        return self.horoscope.get_planets_data_from_chart(self.chart)
+
+    @cached_property
+    def houses_data(self):
+        return self.horoscope.get_houses_data_from_chart(self.chart)
+
+    @cached_property
+    def planet_significators(self):
+        return self.horoscope.get_planet_wise_significators(self.planets_data, self.houses_data)
+
+    @cached_property
+    def house_significators(self):
+        return self.horoscope.get_house_wise_significators(self.planets_data, self.houses_data)
+
+    @cached_property
+    def aspects(self):
+        return self.horoscope.get_planetary_aspects(self.chart)
+
+    def get_consolidated_chart_data(self, return_style: str = None):
+        """Memoized `VedicHoroscopeData.get_consolidated_chart_data` of this chart, per return style"""
+        return self.memoize(f"consolidated_chart_data:{return_style}",
+                            lambda ctx: ctx.horoscope.get_consolidated_chart_data(planets_data=ctx.planets_data,
+                                                                                  houses_data=ctx.houses_data,
+                                                                                  return_style=return_style))
+
+    @cached_property
+    def dasa(self):
+        """VimshottariDasa periods of the birth, as Julian Day arrays"""
+        key = self.key
+        birth_date = datetime(key.year, key.month, key.day, key.hour, key.minute, int(key.second))
+        return get_vimshottari_dasa(self.chart, birth_date, self.horoscope.time_zone)
+
+    @cached_property
+    def vimshottari_dasa(self):
+        """Maha Dasa, Antar Dasa and Pratyantar Dasa periods as nested dicts of formatted dates"""
+        return self.dasa.to_nested_dict()
@@ -0,0 +1,10 @@
+"""
+Zodiac constants shared by the chart modules. This module has no dependencies, so that modules imported by
+VedicAstro (Eg: bitboard) can use them without a circular import.
+"""
+
+RASHIS = ['Aries', 'Taurus', 'Gemini', 'Cancer', 'Leo', 'Virgo', 'Libra',
+          'Scorpio', 'Sagittarius', 'Capricorn', 'Aquarius', 'Pisces']
+
+## Lords of the 12 Zodiac Signs
+SIGN_LORDS = ["Mars", "Venus", "Mercury", "Moon", "Sun", "Mercury", "Venus", "Mars", "Jupiter", "Saturn", "Saturn", "Jupiter"]
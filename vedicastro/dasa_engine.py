@@ -0,0 +1,163 @@
+"""
+Vectorized Vimshottari dasa engine.
+
+The periods of each dasa level are stored as NumPy arrays: the lord (index into KP_LORDS) and the start / end
+instants as float64 Julian Days. Each level is derived from the previous one with array arithmetic, the
+Maha Dasa, Antar Dasa and Pratyantar Dasa levels on construction and the deeper Sookshma and Prana levels on
+first use. Dates are only converted to strings when a result is formatted for output.
+"""
+import collections
+import numpy as np
+from .kp_lords import KP_LORDS, KP_LORD_YEARS, TOTAL_DASA_YEARS, get_kp_lords, NAKSHATRA_SPAN
+from .utils import jds_to_local_datetime64
+
+DAYS_PER_YEAR = 365.25
+
+## Names of the dasa levels, level 1 to 5
+DASA_LEVELS = ["mahadasha", "antardasha", "pratyantardasha", "sookshma", "prana"]
+MAX_DASA_LEVEL = len(DASA_LEVELS)
+
+DASA_DATE_FORMAT = "%d-%m-%Y"
+
+## Number of periods formatted at a time by `iter_records`
+RECORDS_CHUNK_SIZE = 729
+
+## Lords of the 9 sub periods of a period, for each lord of the period (9 x 9)
+SUB_PERIOD_LORDS = (np.arange(9)[:, None] + np.arange(9)[None, :]) % 9
+LORD_YEARS = np.array(KP_LORD_YEARS, dtype=float)
+
+DasaLevel = collections.namedtuple("DasaLevel", ["lords", "start_jds", "end_jds"])
+
+
+class VimshottariDasa:
+    """
+    Vimshottari dasa periods of a birth, from the start of the Maha Dasa running at birth, over 120 years.
+
+    Parameters
+    ==========
+    birth_jd: Julian Day (UT) of the birth
+    moon_lon: sidereal longitude of the Moon at birth, in degrees
+    time_zone: timezone in which dates are formatted (Eg: Asia/Kolkata). None formats the dates in UT, which is
+               also used when `birth_jd` was computed from a local date and time.
+    """
+
+    def __init__(self, birth_jd: float, moon_lon: float, time_zone: str = None):
+        self.birth_jd = birth_jd
+        self.moon_lon = moon_lon % 360
+        self.time_zone = time_zone
+
+        ## The Maha Dasa at birth is that of the Moon's star lord, with the elapsed fraction of the nakshatra already run
+        moon_lords = get_kp_lords(self.moon_lon)
+        self.start_lord = moon_lords.NakshatraLord
+        elapsed_fraction = (self.moon_lon - moon_lords.Nakshatra * NAKSHATRA_SPAN) / NAKSHATRA_SPAN
+        self.start_jd = birth_jd - elapsed_fraction * LORD_YEARS[self.start_lord] * DAYS_PER_YEAR
+
+        lords = SUB_PERIOD_LORDS[self.start_lord]
+        end_jds = self.start_jd + np.cumsum(LORD_YEARS[lords] * DAYS_PER_YEAR)
+        self._levels = [DasaLevel(lords, np.concatenate(([self.start_jd], end_jds[:-1])), end_jds)]
+        self.get_level(3)
+
+    def get_level(self, level: int):
+        """Returns the DasaLevel arrays of a level (1: Maha Dasa ... 5: Prana), computing the missing levels on demand"""
+        if not 1 <= level <= MAX_DASA_LEVEL:
+            raise ValueError(f"Dasa level must be between 1 and {MAX_DASA_LEVEL}")
+        while len(self._levels) < level:
+            self._levels.append(self._get_sub_periods(self._levels[-1]))
+        return self._levels[level - 1]
+
+    @staticmethod
+    def _get_sub_periods(parent: DasaLevel):
+        """Splits every period of a level into its 9 sub periods, in proportion to the dasa years of their lords"""
+        lords = SUB_PERIOD_LORDS[parent.lords]                                             # (n, 9)
+        fractions = np.cumsum(LORD_YEARS[lords], axis=1) / TOTAL_DASA_YEARS
+        durations = (parent.end_jds - parent.start_jds)[:, None]
+        end_jds = parent.start_jds[:, None] + durations * fractions
+        end_jds[:, -1] = parent.end_jds                                                    # exact continuity
+        start_jds = np.concatenate((parent.start_jds[:, None], end_jds[:, :-1]), axis=1)
+        return DasaLevel(lords.ravel(), start_jds.ravel(), end_jds.ravel())
+
+    def get_period_indices(self, jds, level: int = 4):
+        """
+        Returns the indices (into the `level` arrays) of the periods running at an array of Julian Days (UT), found by
+        binary search on the contiguous period boundaries. Instants outside the 120 years get an index of -1.
+        The index of the enclosing period at a higher level `depth` is `index // 9 ** (level - depth)`.
+        """
+        dasa_level = self.get_level(level)
+        jds = np.asarray(jds, dtype=float)
+        indices = np.searchsorted(dasa_level.start_jds, jds, side="right") - 1
+        indices[(jds < dasa_level.start_jds[0]) | (jds >= dasa_level.end_jds[-1])] = -1
+        return indices
+
+    def get_overlapping_indices(self, start_jd: float, end_jd: float, level: int = 2):
+        """Returns the indices (into the `level` arrays) of the periods overlapping [start_jd, end_jd), by binary search"""
+        dasa_level = self.get_level(level)
+        first = np.searchsorted(dasa_level.end_jds, start_jd, side="right")
+        last = np.searchsorted(dasa_level.start_jds, end_jd, side="left")
+        return np.arange(first, max(first, last))
+
+    def get_running_periods(self, jds, level: int = 4, date_format: str = DASA_DATE_FORMAT):
+        """
+        Returns, for each Julian Day (UT) of an array, a dict of the lords running at every dasa level down to `level`
+        (Eg: "mahadasha" .. "sookshma") with the "start_date" / "end_date" of the innermost period,
+        or None when the instant is outside the 120 years of the dasa.
+        """
+        indices = self.get_period_indices(jds, level)
+        valid = indices >= 0
+        records = iter(self.to_records(level, date_format, indices=indices[valid]))
+        return [next(records) if is_valid else None for is_valid in valid.tolist()]
+
+    def format_dates(self, jds, date_format: str = DASA_DATE_FORMAT):
+        """Formats an array of Julian Days (UT) as local date strings"""
+        return [date.strftime(date_format) for date in jds_to_local_datetime64(jds, self.time_zone).astype(object)]
+
+    def to_nested_dict(self, depth: int = 3, sub_keys: tuple = ("antardashas", "pratyantars", "sookshmas", "pranas"),
+                       date_format: str = DASA_DATE_FORMAT):
+        """
+        Formats the periods down to `depth` levels as nested dicts keyed by lord name:
+        {MD lord: {"start": .., "end": .., sub_keys[0]: {AD lord: {"start": .., "end": .., sub_keys[1]: {..}}}}}
+        """
+        levels = []
+        for level in range(1, depth + 1):
+            dasa_level = self.get_level(level)
+            levels.append((dasa_level.lords.tolist(), self.format_dates(dasa_level.start_jds, date_format),
+                           self.format_dates(dasa_level.end_jds, date_format)))
+
+        def build(level, first, count):
+            lords, starts, ends = levels[level]
+            periods = {}
+            for index in range(first, first + count):
+                period = {"start": starts[index], "end": ends[index]}
+                if level + 1 < depth:
+                    period[sub_keys[level]] = build(level + 1, index * 9, 9)
+                periods[KP_LORDS[lords[index]]] = period
+            return periods
+
+        return build(0, 0, 9)
+
+    def to_records(self, level: int = 3, date_format: str = DASA_DATE_FORMAT, mask: np.ndarray = None,
+                   indices: np.ndarray = None):
+        """
+        Formats the periods of a level as a flat, chronological list of dicts, with one key per dasa level
+        (Eg: "mahadasha", "antardasha", "pratyantardasha") and "start_date" / "end_date" strings.
+        An optional boolean `mask`, or array of period `indices` (returned in their given order), selects the periods.
+        """
+        if indices is None:
+            indices = np.arange(9 ** level) if mask is None else np.flatnonzero(mask)
+        dasa_level = self.get_level(level)
+        starts = self.format_dates(dasa_level.start_jds[indices], date_format)
+        ends = self.format_dates(dasa_level.end_jds[indices], date_format)
+        lord_names = [[KP_LORDS[lord] for lord in self.get_level(depth).lords[indices // 9 ** (level - depth)].tolist()]
+                      for depth in range(1, level + 1)]
+
+        records = []
+        for i in range(len(indices)):
+            record = {DASA_LEVELS[depth]: lord_names[depth][i] for depth in range(level)}
+            record["start_date"], record["end_date"] = starts[i], ends[i]
+            records.append(record)
+        return records
+
+    def iter_records(self, level: int = 3, date_format: str = DASA_DATE_FORMAT, chunk_size: int = RECORDS_CHUNK_SIZE):
+        """Generator version of `to_records`, formatting `chunk_size` periods at a time (Eg: for streaming level 5)"""
+        count = len(self.get_level(level).lords)
+        for first in range(0, count, chunk_size):
+            yield from self.to_records(level, date_format, indices=np.arange(first, min(first + chunk_size, count)))
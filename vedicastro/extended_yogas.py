@@ -1,7 +1,201 @@
 """
 This module extends the existing yoga implementations in the vedicastro package.
 It adds additional important yogas from Vedic astrology that were not previously implemented.
+The yogas are rules of the `yoga_engine` registry, like the ones of the `yogas` module.
 """
+from .yoga_engine import yoga_rule, evaluate_yogas, ChartIndex, KENDRAS, houses_mask, in_houses
+from .bitboard import counts_mask, DUSTHANAS
+from .yogas import has_saraswati_placement, has_shakata_placement
+from .constants import SIGN_LORDS
+
+# --- BENEFIC YOGAS ---
+
+@yoga_rule("additional_benefic_yogas")
+def adhi_yoga(chart):
+    # Benefics in 6th, 7th, and 8th from Moon
+    if "Moon" not in chart:
+        return
+    from_moon = chart.houses_from("Moon", counts_mask(6, 7, 8))
+    if bin(chart.occupants_mask(from_moon) & chart.planets_mask(["Jupiter", "Venus", "Mercury"])).count("1") >= 2:
+        yield {
+            "name": "Adhi Yoga",
+            "description": "Benefics in 6th, 7th, and/or 8th houses from Moon, conferring leadership, governmental power, and authority."
+        }
+
+@yoga_rule("additional_benefic_yogas")
+def shankha_yoga(chart):
+    # Lords of 5th and 6th conjunct in a kendra
+    fifth_lord, sixth_lord = chart.lord_of(5), chart.lord_of(6)
+    if (fifth_lord in chart and sixth_lord in chart and fifth_lord != sixth_lord and
+            chart.house_of(fifth_lord) == chart.house_of(sixth_lord) and in_houses(chart.house_of(fifth_lord), KENDRAS)):
+        yield {
+            "name": "Shankha Yoga",
+            "description": "Lords of 5th and 6th houses conjunct in a kendra (angular house), conferring wisdom, diplomacy, and spiritual inclination."
+        }
+
+@yoga_rule("additional_benefic_yogas")
+def shankha_yoga_by_opposition(chart):
+    # Alternative Shankha Yoga - 5th and 6th lords opposite (7th from each other)
+    fifth_lord, sixth_lord = chart.lord_of(5), chart.lord_of(6)
+    if fifth_lord in chart and sixth_lord in chart and abs(chart.house_of(fifth_lord) - chart.house_of(sixth_lord)) == 6:
+        yield {
+            "name": "Shankha Yoga",
+            "description": "Lords of 5th and 6th houses in opposition, conferring longevity, morality, and ethical conduct."
+        }
+
+@yoga_rule("additional_benefic_yogas")
+def maha_bhagya_yoga(chart):
+    # Jupiter in Lagna with Moon in 7th or 9th
+    if chart.house_of("Jupiter") == 1 and in_houses(chart.house_of("Moon"), houses_mask(7, 9)):
+        yield {
+            "name": "Maha Bhagya Yoga",
+            "description": "Jupiter in Lagna with Moon in 7th or 9th house, conferring extraordinary fortune and success."
+        }
+
+@yoga_rule("additional_benefic_yogas")
+def kahala_yoga(chart):
+    # Saturn and Venus conjunct in a kendra, or else in exchange
+    if "Saturn" not in chart or "Venus" not in chart:
+        return
+    if chart.house_of("Saturn") == chart.house_of("Venus") and in_houses(chart.house_of("Saturn"), KENDRAS):
+        yield {
+            "name": "Kahala Yoga",
+            "description": "Saturn and Venus conjunct in a kendra (angular house), conferring boldness, authority, and success."
+        }
+    elif SIGN_LORDS[chart.sign_of("Saturn")] == "Venus" and SIGN_LORDS[chart.sign_of("Venus")] == "Saturn":
+        yield {
+            "name": "Kahala Yoga",
+            "description": "Saturn and Venus in mutual exchange, conferring boldness, authority, and success."
+        }
+
+@yoga_rule("additional_benefic_yogas")
+def jnana_yoga(chart):
+    # Jupiter or Mercury in 1st, 4th, 5th or 9th house
+    for planet in ["Jupiter", "Mercury"]:
+        planet_house = chart.house_of(planet)
+        if in_houses(planet_house, houses_mask(1, 4, 5, 9)):
+            yield {
+                "name": "Jnana Yoga",
+                "description": f"{planet} in house {planet_house}, conferring wisdom, spiritual knowledge, and intellectual abilities."
+            }
+
+# --- INTELLECTUAL YOGAS ---
+
+@yoga_rule("intellectual_yogas")
+def saraswati_yoga(chart):
+    # Jupiter, Venus and Mercury in angles/trines
+    if has_saraswati_placement(chart):
+        yield {
+            "name": "Saraswati Yoga",
+            "description": "Jupiter, Venus and Mercury in angles/trines, conferring wisdom, intelligence, artistic abilities, and education."
+        }
+
+@yoga_rule("intellectual_yogas")
+def budha_aditya_yoga(chart):
+    # Sun and Mercury in same sign (combustion would require exact degrees, so we're simplifying)
+    if "Sun" in chart and "Mercury" in chart and chart.sign_of("Sun") == chart.sign_of("Mercury"):
+        yield {
+            "name": "Budha-Aditya Yoga",
+            "description": "Sun and Mercury in same sign, conferring intelligence, communication skills, and administrative abilities."
+        }
+
+@yoga_rule("intellectual_yogas")
+def vidya_yoga(chart):
+    # Lords of 2nd, 4th, 5th not in dusthanas
+    strong_education_lords = [lord for lord in chart.lords_of([2, 4, 5])
+                              if lord in chart and not in_houses(chart.house_of(lord), DUSTHANAS)]
+    if len(strong_education_lords) >= 2:
+        yield {
+            "name": "Vidya Yoga",
+            "description": "Strong lords of education houses, conferring good education and learning abilities."
+        }
+
+@yoga_rule("intellectual_yogas")
+def brahma_yoga(chart):
+    # Jupiter and Mercury connected with the 5th and 9th houses
+    if "Jupiter" not in chart or "Mercury" not in chart:
+        return
+    guru_budha_houses = houses_mask(chart.house_of("Jupiter"), chart.house_of("Mercury"))
+    if guru_budha_houses & houses_mask(5, 9):
+        yield {
+            "name": "Brahma Yoga",
+            "description": "Jupiter and Mercury connected with 5th or 9th house, conferring spiritual wisdom and intellectual depth."
+        }
+    ## 5th or 9th lord with Mercury or Jupiter
+    fifth_lord, ninth_lord = chart.lord_of(5), chart.lord_of(9)
+    if (fifth_lord in chart and ninth_lord in chart and
+            (in_houses(chart.house_of(fifth_lord), guru_budha_houses) or in_houses(chart.house_of(ninth_lord), guru_budha_houses))):
+        yield {
+            "name": "Brahma Yoga",
+            "description": "Lords of wisdom houses connected with Mercury or Jupiter, conferring deep spiritual knowledge."
+        }
+
+# --- MALEFIC YOGAS ---
+
+@yoga_rule("malefic_yogas")
+def grahan_yoga(chart):
+    # Sun/Moon with Rahu/Ketu
+    for luminary in ["Sun", "Moon"]:
+        for node in ["Rahu", "Ketu"]:
+            if luminary in chart and node in chart and chart.house_of(node) == chart.house_of(luminary):
+                yield {
+                    "name": "Grahan Yoga",
+                    "description": f"{luminary} conjunct with {node}, indicating karmic challenges or past-life influences."
+                }
+
+## Conjunction, the 7th aspect of all planets, and the 4th and 8th aspects of Mars, Jupiter and Saturn
+KEMADRUMA_ASPECTS = {planet: counts_mask(1, 4, 7, 8) for planet in ["Mars", "Jupiter", "Saturn"]}
+
+@yoga_rule("malefic_yogas")
+def kemadruma_yoga(chart):
+    # Moon neither conjunct with nor aspected by any planet (a variant of the one of the other yogas)
+    if "Moon" not in chart:
+        return
+    others = chart.houses.all_planets & ~chart.planets_mask(["Moon"])
+    if chart.houses.aspecting(chart.houses_from("Moon", counts_mask(1)), others, KEMADRUMA_ASPECTS, counts_mask(1, 7)):
+        return
+    yield {
+        "name": "Kemadruma Yoga",
+        "description": "Moon is not aspected by or conjunct with any planet, causing potential isolation or instability."
+    }
+
+@yoga_rule("malefic_yogas")
+def shakata_yoga(chart):
+    # Moon and Jupiter in 6/8 position
+    if has_shakata_placement(chart):
+        yield {
+            "name": "Shakata Yoga",
+            "description": "Moon and Jupiter in 6/8 position to each other, causing ups and downs in life and emotional challenges."
+        }
+
+@yoga_rule("malefic_yogas")
+def daridra_yoga(chart):
+    # 5th and 9th lords in 6th, 8th, or 12th houses
+    fifth_lord, ninth_lord = chart.lord_of(5), chart.lord_of(9)
+    if (fifth_lord in chart and ninth_lord in chart and
+            in_houses(chart.house_of(fifth_lord), DUSTHANAS) and in_houses(chart.house_of(ninth_lord), DUSTHANAS)):
+        yield {
+            "name": "Daridra Yoga",
+            "description": "Lords of 5th and 9th houses in 6th, 8th or 12th houses, causing financial difficulties."
+        }
+
+## Conjunction with the malefics, and the 4th, 7th and 10th aspects of Saturn and Mars
+PITRA_DOSHA_ASPECTS = {planet: counts_mask(1, 4, 7, 10) for planet in ["Saturn", "Mars"]}
+
+@yoga_rule("malefic_yogas")
+def pitra_dosha(chart):
+    # Sun conjunct with a malefic, or aspected by Saturn or Mars (4th, 7th, 10th aspects)
+    if "Sun" not in chart:
+        return
+    malefics = chart.planets_mask(["Saturn", "Mars", "Rahu", "Ketu"])
+    if chart.houses.aspecting(chart.houses_from("Sun", counts_mask(1)), malefics, PITRA_DOSHA_ASPECTS, counts_mask(1)):
+        yield {
+            "name": "Pitra Dosha",
+            "description": "Sun afflicted by malefics, indicating ancestral karmic issues or difficulties with father/authority figures."
+        }
+
+# Kaal Sarp Dosha, a modified version of Kala Sarpa Yoga, is one of the other yogas
+
 
 def check_additional_benefic_yogas(planet_positions, houses_data):
     """
@@ -14,136 +208,7 @@ def check_additional_benefic_yogas(planet_positions, houses_data):
     Returns:
         List of dictionaries containing yoga names and descriptions
     """
-    additional_yogas = []
-
-    # Get lords of key houses
-    house_lords = {}
-    for house_num in range(1, 13):
-        if house_num in houses_data:
-            house_lords[house_num] = houses_data[house_num]["RasiLord"]
-
-    # Sign lords mapping
-    sign_lords = {
-        "Aries": "Mars",
-        "Taurus": "Venus",
-        "Gemini": "Mercury",
-        "Cancer": "Moon",
-        "Leo": "Sun",
-        "Virgo": "Mercury",
-        "Libra": "Venus",
-        "Scorpio": "Mars",
-        "Sagittarius": "Jupiter",
-        "Capricorn": "Saturn",
-        "Aquarius": "Saturn",
-        "Pisces": "Jupiter"
-    }
-
-    # Benefic planets
-    benefics = ["Jupiter", "Venus", "Mercury", "Moon"]
-
-    # --- BENEFIC YOGAS ---
-
-    # Check for Adhi Yoga - benefics in 6th, 7th, and 8th from Moon
-    if "Moon" in planet_positions:
-        moon_house = planet_positions["Moon"]["HouseNr"]
-        sixth_from_moon = (moon_house + 5) % 12 or 12
-        seventh_from_moon = (moon_house + 6) % 12 or 12
-        eighth_from_moon = (moon_house + 7) % 12 or 12
-
-        benefic_count = 0
-        for benefic in benefics:
-            if benefic in planet_positions and benefic != "Moon":
-                planet_house = planet_positions[benefic]["HouseNr"]
-                if planet_house in [sixth_from_moon, seventh_from_moon, eighth_from_moon]:
-                    benefic_count += 1
-
-        if benefic_count >= 2:
-            additional_yogas.append({
-                "name": "Adhi Yoga",
-                "description": f"Benefics in 6th, 7th, and/or 8th houses from Moon, conferring leadership, governmental power, and authority."
-            })
-
-    # Check for Shankha Yoga - specific planet positions
-    # One implementation: Lords of 5th and 6th conjunct in a kendra
-    if 5 in house_lords and 6 in house_lords:
-        fifth_lord = house_lords[5]
-        sixth_lord = house_lords[6]
-
-        if (fifth_lord in planet_positions and
-            sixth_lord in planet_positions and
-            fifth_lord != sixth_lord):
-
-            fifth_lord_house = planet_positions[fifth_lord]["HouseNr"]
-            sixth_lord_house = planet_positions[sixth_lord]["HouseNr"]
-
-            if fifth_lord_house == sixth_lord_house and fifth_lord_house in [1, 4, 7, 10]:
-                additional_yogas.append({
-                    "name": "Shankha Yoga",
-                    "description": "Lords of 5th and 6th houses conjunct in a kendra (angular house), conferring wisdom, diplomacy, and spiritual inclination."
-                })
-
-    # Alternative Shankha Yoga - 5th and 6th lords in mutual kendras
-    if 5 in house_lords and 6 in house_lords:
-        fifth_lord = house_lords[5]
-        sixth_lord = house_lords[6]
-
-        if fifth_lord in planet_positions and sixth_lord in planet_positions:
-            # Check if they are opposite (7th from each other)
-            fifth_lord_house = planet_positions[fifth_lord]["HouseNr"]
-            sixth_lord_house = planet_positions[sixth_lord]["HouseNr"]
-
-            if abs(fifth_lord_house - sixth_lord_house) == 6:  # 7 houses apart (opposite)
-                additional_yogas.append({
-                    "name": "Shankha Yoga",
-                    "description": "Lords of 5th and 6th houses in opposition, conferring longevity, morality, and ethical conduct."
-                })
-
-    # Check for Maha Bhagya Yoga - Jupiter in Lagna with Moon in 7th or 9th
-    if ("Jupiter" in planet_positions and
-        "Moon" in planet_positions and
-        planet_positions["Jupiter"]["HouseNr"] == 1 and
-        planet_positions["Moon"]["HouseNr"] in [7, 9]):
-
-        additional_yogas.append({
-            "name": "Maha Bhagya Yoga",
-            "description": "Jupiter in Lagna with Moon in 7th or 9th house, conferring extraordinary fortune and success."
-        })
-
-    # Check for Kahala Yoga - Saturn and Venus exchange or conjunct in a kendra
-    if "Saturn" in planet_positions and "Venus" in planet_positions:
-        saturn_house = planet_positions["Saturn"]["HouseNr"]
-        venus_house = planet_positions["Venus"]["HouseNr"]
-        saturn_sign = planet_positions["Saturn"]["Rasi"]
-        venus_sign = planet_positions["Venus"]["Rasi"]
-
-        # Check for conjunction in kendra
-        if saturn_house == venus_house and saturn_house in [1, 4, 7, 10]:
-            additional_yogas.append({
-                "name": "Kahala Yoga",
-                "description": "Saturn and Venus conjunct in a kendra (angular house), conferring boldness, authority, and success."
-            })
-
-        # Check for exchange
-        elif (sign_lords.get(saturn_sign) == "Venus" and
-              sign_lords.get(venus_sign) == "Saturn"):
-
-            additional_yogas.append({
-                "name": "Kahala Yoga",
-                "description": "Saturn and Venus in mutual exchange, conferring boldness, authority, and success."
-            })
-
-    # Check for Jnana Yoga - Jupiter or Mercury in 1st, 4th, 5th or 9th house
-    for planet in ["Jupiter", "Mercury"]:
-        if planet in planet_positions:
-            planet_house = planet_positions[planet]["HouseNr"]
-
-            if planet_house in [1, 4, 5, 9]:
-                additional_yogas.append({
-                    "name": "Jnana Yoga",
-                    "description": f"{planet} in house {planet_house}, conferring wisdom, spiritual knowledge, and intellectual abilities."
-                })
-
-    return additional_yogas
+    return evaluate_yogas(ChartIndex(planet_positions, houses_data), ["additional_benefic_yogas"])["additional_benefic_yogas"]
 
 def check_intellectual_yogas(planet_positions, houses_data):
     """
@@ -156,96 +221,7 @@ def check_intellectual_yogas(planet_positions, houses_data):
     Returns:
         List of dictionaries containing yoga names and descriptions
     """
-    intellectual_yogas = []
-
-    # Get lords of key houses
-    house_lords = {}
-    for house_num in range(1, 13):
-        if house_num in houses_data:
-            house_lords[house_num] = houses_data[house_num]["RasiLord"]
-
-    # Check for Saraswati Yoga - Jupiter, Venus and Mercury in angles/trines
-    quadrants_and_trines = [1, 4, 5, 7, 9, 10]  # Kendras and Trikonas
-
-    if ("Jupiter" in planet_positions and
-        "Venus" in planet_positions and
-        "Mercury" in planet_positions):
-
-        jupiter_house = planet_positions["Jupiter"]["HouseNr"]
-        venus_house = planet_positions["Venus"]["HouseNr"]
-        mercury_house = planet_positions["Mercury"]["HouseNr"]
-
-        if (jupiter_house in quadrants_and_trines and
-            venus_house in quadrants_and_trines and
-            mercury_house in quadrants_and_trines):
-
-            intellectual_yogas.append({
-                "name": "Saraswati Yoga",
-                "description": "Jupiter, Venus and Mercury in angles/trines, conferring wisdom, intelligence, artistic abilities, and education."
-            })
-
-    # Check for Budha-Aditya Yoga - Sun and Mercury in same sign
-    if "Sun" in planet_positions and "Mercury" in planet_positions:
-        sun_sign = planet_positions["Sun"]["Rasi"]
-        mercury_sign = planet_positions["Mercury"]["Rasi"]
-
-        if sun_sign == mercury_sign:
-            # Check if Mercury is not too close to Sun (not combust)
-            # This would require exact degrees, so we're simplifying
-            intellectual_yogas.append({
-                "name": "Budha-Aditya Yoga",
-                "description": "Sun and Mercury in same sign, conferring intelligence, communication skills, and administrative abilities."
-            })
-
-    # Check for Vidya Yoga - Strong 2nd, 4th, 5th lords
-    education_houses = [2, 4, 5]
-    strong_education_lords = 0
-
-    for house in education_houses:
-        if house in house_lords:
-            lord = house_lords[house]
-            if lord in planet_positions:
-                # Check if lord is in a good house
-                lord_house = planet_positions[lord]["HouseNr"]
-                if lord_house not in [6, 8, 12]:  # Not in dusthanas
-                    strong_education_lords += 1
-
-    if strong_education_lords >= 2:
-        intellectual_yogas.append({
-            "name": "Vidya Yoga",
-            "description": f"Strong lords of education houses, conferring good education and learning abilities."
-        })
-
-    # Check for Brahma Yoga - Combination of Jupiter and Mercury with 5th and 9th houses
-    if "Jupiter" in planet_positions and "Mercury" in planet_positions:
-        jupiter_house = planet_positions["Jupiter"]["HouseNr"]
-        mercury_house = planet_positions["Mercury"]["HouseNr"]
-
-        # Check if either planet is in 5th or 9th
-        if jupiter_house in [5, 9] or mercury_house in [5, 9]:
-            intellectual_yogas.append({
-                "name": "Brahma Yoga",
-                "description": "Jupiter and Mercury connected with 5th or 9th house, conferring spiritual wisdom and intellectual depth."
-            })
-
-        # Check if 5th and 9th lords are with Mercury or Jupiter
-        if 5 in house_lords and 9 in house_lords:
-            fifth_lord = house_lords[5]
-            ninth_lord = house_lords[9]
-
-            if (fifth_lord in planet_positions and ninth_lord in planet_positions):
-                fifth_lord_house = planet_positions[fifth_lord]["HouseNr"]
-                ninth_lord_house = planet_positions[ninth_lord]["HouseNr"]
-
-                if (fifth_lord_house == jupiter_house or fifth_lord_house == mercury_house or
-                    ninth_lord_house == jupiter_house or ninth_lord_house == mercury_house):
-
-                    intellectual_yogas.append({
-                        "name": "Brahma Yoga",
-                        "description": "Lords of wisdom houses connected with Mercury or Jupiter, conferring deep spiritual knowledge."
-                    })
-
-    return intellectual_yogas
+    return evaluate_yogas(ChartIndex(planet_positions, houses_data), ["intellectual_yogas"])["intellectual_yogas"]
 
 def check_malefic_yogas(planet_positions, houses_data):
     """
@@ -258,121 +234,4 @@ def check_malefic_yogas(planet_positions, houses_data):
     Returns:
         List of dictionaries containing yoga names and descriptions
     """
-    malefic_yogas = []
-
-    # Check for Grahan Yoga - Sun/Moon with Rahu/Ketu
-    nodes = ["Rahu", "Ketu"]
-    luminaries = ["Sun", "Moon"]
-
-    for luminary in luminaries:
-        if luminary in planet_positions:
-            luminary_house = planet_positions[luminary]["HouseNr"]
-
-            for node in nodes:
-                if node in planet_positions and planet_positions[node]["HouseNr"] == luminary_house:
-                    malefic_yogas.append({
-                        "name": "Grahan Yoga",
-                        "description": f"{luminary} conjunct with {node}, indicating karmic challenges or past-life influences."
-                    })
-
-    # Check for Kemadruma Yoga - already implemented in other_yogas
-    # But let's check it slightly differently here
-    if "Moon" in planet_positions:
-        moon_house = planet_positions["Moon"]["HouseNr"]
-
-        # Check if Moon is not aspected by any planet and not conjunct any planet
-        has_aspect = False
-        for planet, data in planet_positions.items():
-            if planet == "Moon":
-                continue
-
-            # Check for conjunction
-            if data["HouseNr"] == moon_house:
-                has_aspect = True
-                break
-
-            # Check for aspects (simplified)
-            planet_house = data["HouseNr"]
-            if planet in ["Mars", "Jupiter", "Saturn"]:
-                # These planets have special aspects
-                if ((planet_house + 3) % 12 == moon_house or  # 4th aspect
-                    (planet_house + 6) % 12 == moon_house or  # 7th aspect
-                    (planet_house + 7) % 12 == moon_house):  # 8th aspect (for Mars)
-                    has_aspect = True
-                    break
-
-            # All planets aspect the 7th house
-            if (planet_house + 6) % 12 == moon_house:
-                has_aspect = True
-                break
-
-        if not has_aspect:
-            malefic_yogas.append({
-                "name": "Kemadruma Yoga",
-                "description": "Moon is not aspected by or conjunct with any planet, causing potential isolation or instability."
-            })
-
-    # Check for Shakata Yoga - Moon and Jupiter in 6/8 position
-    if "Moon" in planet_positions and "Jupiter" in planet_positions:
-        moon_house = planet_positions["Moon"]["HouseNr"]
-        jupiter_house = planet_positions["Jupiter"]["HouseNr"]
-
-        # Check if they're in 6/8 position to each other
-        if abs(moon_house - jupiter_house) == 5 or abs(moon_house - jupiter_house) == 7:
-            malefic_yogas.append({
-                "name": "Shakata Yoga",
-                "description": "Moon and Jupiter in 6/8 position to each other, causing ups and downs in life and emotional challenges."
-            })
-
-    # Check for Daridra Yoga - 5th and 9th lords in 6th, 8th, or 12th houses
-    house_lords = {}
-    for house_num in range(1, 13):
-        if house_num in houses_data:
-            house_lords[house_num] = houses_data[house_num]["RasiLord"]
-
-    if 5 in house_lords and 9 in house_lords:
-        fifth_lord = house_lords[5]
-        ninth_lord = house_lords[9]
-
-        if fifth_lord in planet_positions and ninth_lord in planet_positions:
-            fifth_lord_house = planet_positions[fifth_lord]["HouseNr"]
-            ninth_lord_house = planet_positions[ninth_lord]["HouseNr"]
-
-            if (fifth_lord_house in [6, 8, 12] and ninth_lord_house in [6, 8, 12]):
-                malefic_yogas.append({
-                    "name": "Daridra Yoga",
-                    "description": "Lords of 5th and 9th houses in 6th, 8th or 12th houses, causing financial difficulties."
-                })
-
-    # Check for Pitra Dosha - Sun afflicted by malefics
-    if "Sun" in planet_positions:
-        sun_house = planet_positions["Sun"]["HouseNr"]
-        malefics = ["Saturn", "Mars", "Rahu", "Ketu"]
-
-        sun_afflicted = False
-        for malefic in malefics:
-            if malefic in planet_positions:
-                # Check for conjunction
-                if planet_positions[malefic]["HouseNr"] == sun_house:
-                    sun_afflicted = True
-                    break
-
-                # Check for aspect
-                malefic_house = planet_positions[malefic]["HouseNr"]
-                if malefic == "Saturn" or malefic == "Mars":
-                    if ((malefic_house + 3) % 12 == sun_house or  # 4th aspect
-                        (malefic_house + 6) % 12 == sun_house or  # 7th aspect
-                        (malefic_house + 9) % 12 == sun_house):  # 10th aspect (for Saturn)
-                        sun_afflicted = True
-                        break
-
-        if sun_afflicted:
-            malefic_yogas.append({
-                "name": "Pitra Dosha",
-                "description": "Sun afflicted by malefics, indicating ancestral karmic issues or difficulties with father/authority figures."
-            })
-
-    # Check for Kaal Sarp Dosha - modified version of Kala Sarpa Yoga
-    # Already implemented in other_yogas
-
-    return malefic_yogas
+    return evaluate_yogas(ChartIndex(planet_positions, houses_data), ["malefic_yogas"])["malefic_yogas"]
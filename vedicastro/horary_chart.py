@@ -1,13 +1,27 @@
 import os
+import types
+import functools
+import numpy as np
 import polars as pl
 import swisseph as swe
 from datetime import datetime
 from .utils import dms_to_decdeg, utc_offset_str_to_float
-from .VedicAstro import VedicHoroscopeData
+from .VedicAstro import VedicHoroscopeData, RASHIS
+from .kp_lords import KP_LORDS, get_kp_lords
+from .transit_engine import find_root, signed_arc
 
 ## Global Constants
 SWE_AYANAMAS = { "Krishnamurti" : swe.SIDM_KRISHNAMURTI, "Krishnamurti_Senthilathiban": swe.SIDM_KRISHNAMURTI_VP291}
 
+## Sampling step (in days) of the ascendant when bracketing a target degree. The ascendant moves forward by
+## much less than 180° within a step, so a target degree is crossed at most once per step.
+ASC_SCAN_STEP_DAYS = 1 / 24
+ASC_ROOT_TOLERANCE_DAYS = 1e-8  # ~1 millisecond
+## The ascendant is matched slightly past the start of the sub division, so that it lies inside the required sub
+ASC_TARGET_OFFSET_DEG = 0.0005
+## Number of (day, location, ayanamsa) horary tables kept in memory
+HORARY_DAY_CACHE_SIZE = 256
+
 # Determine the absolute path to the directory where this script is located
 current_dir = os.path.abspath(os.path.dirname(__file__))
 csv_file_path = os.path.join(current_dir, "data", "KP_SL_Divisions.csv")
@@ -71,61 +85,94 @@ def find_exact_ascendant_time(year: int, month: int, day: int, utc_offset: str,
     - matched_time: a datetime object, when the Ascendant matches the desired degree.
     If no match is found within the day, returns None.
     """
-    ## Retrieve Horary Asc Details from given horary_number
-    horary_asc = get_horary_ascendant_degree(horary_number) 
-    horary_asc_deg = horary_asc["ZodiacDegreeLocation"]
-    req_sublord = horary_asc["SubLord"]   
-    utc_float =  utc_offset_str_to_float(utc_offset)
+    ## Look up the matched instant from the (cached) ascendant sweep of the whole day
+    if not 1 <= horary_number <= 249:
+        print("SL Div Nr. out of range. Please provide a number between 1 and 249.")
+        return None
+    jd = get_horary_day_table(year, month, day, utc_offset, lat, lon, ayanamsa)[horary_number]
+    if jd is None:
+        print("No matching Ascendant time found for the given input")
+        return None
+
+    matched_time = jd_to_datetime(jd, utc_offset_str_to_float(utc_offset))
+    houses_chart, houses_data = get_horary_houses_data(matched_time, utc_offset, lat, lon, ayanamsa)
+    return matched_time, houses_chart, houses_data
+
+@functools.lru_cache(maxsize = HORARY_DAY_CACHE_SIZE)
+def get_horary_day_table(year: int, month: int, day: int, utc_offset: str, lat: float, lon: float, ayanamsa: str):
+    """
+    Sweeps the ascendant once over the given (local) day and records, for each of the 249 KP sub divisions
+    in KP_SL_DMS_DATA, the first instant at which the ascendant enters it with the required sub lord.
+    Results are cached per day, location and ayanamsa, so that subsequent horary numbers are plain lookups.
 
-    utc = swe.utc_time_zone(year, month, day, hour = 0, minutes = 0, seconds = 0, offset = utc_float)
+    Returns:
+    - A read-only mapping of horary number (1 - 249) to the matched Julian Day (UT), or None if not matched within the day.
+    """
+    horary_numbers = KP_SL_DMS_DATA["SL_Div_Nr"].to_list()
+    req_sublords = KP_SL_DMS_DATA["SubLord"].to_list()
+    sign_start_degs = np.array([RASHIS.index(sign) * 30 for sign in KP_SL_DMS_DATA["Sign"].to_list()])
+    target_degs = (sign_start_degs + KP_SL_DMS_DATA["From_DecDeg"].to_numpy() + ASC_TARGET_OFFSET_DEG) % 360
+
+    utc = swe.utc_time_zone(year, month, day, hour = 0, minutes = 0, seconds = 0, offset = utc_offset_str_to_float(utc_offset))
     _ , jd_start = swe.utc_to_jd(*utc) ## Unpacks utc tuple
     jd_end = jd_start + 1  # end of the day
 
     swe.set_sid_mode(SWE_AYANAMAS.get(ayanamsa))  # set the ayanamsa
-    current_time = jd_start
-    counter = 0
-    while current_time <= jd_end:
-        cusps, _ = swe.houses_ex(current_time, lat, lon, b'P', flags = swe.FLG_SIDEREAL)
-        asc_lon_deg = cusps[0]
-        asc_deg_diff = asc_lon_deg - horary_asc_deg
-        asc_deg_diff_abs = abs(asc_deg_diff)
-
-        # Adjust increment factor based on the magnitude of degree difference
-        if asc_deg_diff_abs > 10:
-            inc_factor = 0.005  # largest steps when far away
-        elif asc_deg_diff_abs >= 1.0:
-            inc_factor = 1  # larger steps when moderately away
-        elif asc_deg_diff_abs >= 0.1:
-            inc_factor = 10  # smaller steps when getting closer
-        else:
-            inc_factor = 100  # very small steps when very close
-
-        # Special handling for cyclical transition near 360 degrees for horary_number == 1
-        if (asc_lon_deg > 355 and horary_asc_deg == 0.0):
-            inc_factor = 100  # Use very small steps to avoid overshooting the target for horary_number == 1
-
-        # For Debugging purpose
-        # current_time_dt = jd_to_datetime(current_time, utc_float)
-        # print(f"CurrentTimeDT: {current_time_dt}  Itr.Counter: {counter}  Inc.Factor: {inc_factor}  TargetDeg: {horary_asc_deg}   AscLonDeg:{asc_lon_deg}  AscDegDiff: {asc_deg_diff_abs}")
-
-        if 0.0001 < asc_deg_diff <= 0.001:
-            matched_time = jd_to_datetime(current_time, utc_float)
-            secs_final = matched_time.second + (matched_time.microsecond) / 1_000_000
-            vhd_hora = VedicHoroscopeData(year, month, day, matched_time.hour, matched_time.minute, secs_final, utc_offset, lat, lon, ayanamsa, "Placidus")
-            houses_chart = vhd_hora.generate_chart()
-            houses_data = vhd_hora.get_houses_data_from_chart(houses_chart)
-            asc = houses_data[0]
-            # print(f"**UNMATCHED**===ReqSubLord: {req_sublord} || CurrentAscSL: {asc.SubLord}")
-            if asc.SubLord == req_sublord:
-                # print(f"Nr.Iterations: {counter} || Matched Time: {matched_time} || Final Ascendant: {asc_lon_deg} || ReqSL: {req_sublord} || CurrentAscSL: {asc.SubLord}")
-                return matched_time, houses_chart, houses_data
-            
-        
-        current_time += 1.0 / (24 * 60 * 60 * inc_factor)  # Adjust time increment based on the factor
-        counter += 1
+    matched_jds = dict.fromkeys(horary_numbers)
+    for target_index, jd in find_ascendant_crossings(target_degs, jd_start, jd_end, lat, lon):
+        horary_number = horary_numbers[target_index]
+        if matched_jds[horary_number] is not None:
+            continue
+        ## Verify the sub lord from the KP division table
+        if KP_LORDS[get_kp_lords(get_ascendant_lon(jd, lat, lon)).SubLord] == req_sublords[target_index]:
+            matched_jds[horary_number] = jd
+    return types.MappingProxyType(matched_jds)
+
+def get_ascendant_lon(jd: float, lat: float, lon: float):
+    """Returns the sidereal (Placidus) ascendant longitude at a Julian Day (UT), for the currently set ayanamsa"""
+    cusps, _ = swe.houses_ex(jd, lat, lon, b'P', flags = swe.FLG_SIDEREAL)
+    return cusps[0]
+
+def find_ascendant_crossings(target_degs, jd_start: float, jd_end: float, lat: float, lon: float):
+    """
+    Finds the instants between `jd_start` and `jd_end` at which the ascendant crosses any of the `target_degs`.
+    The ascendant is sampled every ASC_SCAN_STEP_DAYS, the targets passed within each step are found by binary
+    search (handling the wrap-around at 0°/360°), and each crossing is then solved on the signed arc from its target.
 
-    print("No matching Ascendant time found for the given input")
-    return None
+    Yields:
+    - (target index, Julian Day (UT)) tuples, in chronological order
+    """
+    target_degs = np.asarray(target_degs, dtype = float)
+    order = np.argsort(target_degs)
+    sorted_degs = target_degs[order]
+
+    t0, asc0 = jd_start, get_ascendant_lon(jd_start, lat, lon)
+    while t0 < jd_end:
+        t1 = min(t0 + ASC_SCAN_STEP_DAYS, jd_end)
+        asc1 = get_ascendant_lon(t1, lat, lon)
+        ## Targets within the arc (asc0, asc0 + movement], in the order they are crossed
+        asc_end = asc0 + (asc1 - asc0) % 360
+        crossed = list(range(np.searchsorted(sorted_degs, asc0, side = "right"), np.searchsorted(sorted_degs, asc_end, side = "right")))
+        if asc_end >= 360:
+            crossed += list(range(0, np.searchsorted(sorted_degs, asc_end - 360, side = "right")))
+
+        for i in crossed:
+            target_deg = sorted_degs[i]
+            func = lambda jd: signed_arc(get_ascendant_lon(jd, lat, lon), target_deg)
+            yield int(order[i]), find_root(func, t0, t1, signed_arc(asc0, target_deg), signed_arc(asc1, target_deg),
+                                           tol = ASC_ROOT_TOLERANCE_DAYS)
+        t0, asc0 = t1, asc1
+
+def get_horary_houses_data(matched_time: datetime, utc_offset: str, lat: float, lon: float, ayanamsa: str):
+    """Returns the flatlib houses chart and the houses data for the matched horary time"""
+    secs_final = matched_time.second + (matched_time.microsecond) / 1_000_000
+    vhd_hora = VedicHoroscopeData(year = matched_time.year, month = matched_time.month, day = matched_time.day,
+                                  hour = matched_time.hour, minute = matched_time.minute, second = secs_final,
+                                  latitude = lat, longitude = lon, ayanamsa = ayanamsa, house_system = "Placidus")
+    vhd_hora.utc = utc_offset  ## Use the given UTC offset of the predictor
+    houses_chart = vhd_hora.generate_chart()
+    houses_data = vhd_hora.get_houses_data_from_chart(houses_chart)
+    return houses_chart, houses_data
 
 
 if __name__== "__main__":
@@ -0,0 +1,86 @@
+"""
+Precomputed KP (Krishnamurti Paddhati) lord lookup table.
+
+The zodiac is divided into 27 nakshatras of exactly 13°20', each nakshatra into 9 subs, and each sub into
+9 sub-subs, in proportion to the Vimshottari dasa years of their lords. The 2187 sub-sub divisions are
+precomputed once as a sorted array of start longitudes, so that the nakshatra, pada, rasi lord, star lord,
+sub lord and sub-sub lord of any number of longitudes are found with a single `numpy.searchsorted`.
+
+All division boundaries are multiples of 1/3 arc-second, so they are built with exact integer arithmetic
+in those units and only converted to degrees at the end.
+"""
+import bisect
+import collections
+import numpy as np
+
+## Vimshottari lords and their dasa years, in dasa order. All lord indices returned by this module index KP_LORDS
+KP_LORDS = ["Ketu", "Venus", "Sun", "Moon", "Mars", "Rahu", "Jupiter", "Saturn", "Mercury"]
+KP_LORD_YEARS = [7, 20, 6, 10, 7, 18, 16, 19, 17]
+TOTAL_DASA_YEARS = 120
+
+## Lords of the 12 Zodiac Signs, as indices into KP_LORDS
+RASI_LORD_INDICES = np.array([KP_LORDS.index(lord) for lord in ["Mars", "Venus", "Mercury", "Moon", "Sun", "Mercury",
+                                                                 "Venus", "Mars", "Jupiter", "Saturn", "Saturn", "Jupiter"]])
+
+UNITS_PER_DEGREE = 3 * 3600                          # 1 unit = 1/3 arc-second
+NAKSHATRA_UNITS = 360 * UNITS_PER_DEGREE // 27       # 13°20'
+NAKSHATRA_SPAN = NAKSHATRA_UNITS / UNITS_PER_DEGREE
+PADA_SPAN = NAKSHATRA_SPAN / 4                       # 3°20'
+
+KPLordIndices = collections.namedtuple("KPLordIndices", ["Nakshatra", "Pada", "RasiLord", "NakshatraLord", "SubLord", "SubSubLord"])
+
+
+def _build_sub_sub_table():
+    """Returns the start longitudes (deg) and the nakshatra, sub lord and sub-sub lord index of every sub-sub division"""
+    starts, nakshatras, sub_lords, sub_sub_lords = [], [], [], []
+    position = 0
+    for nakshatra in range(27):
+        star_lord = nakshatra % 9
+        for i in range(9):
+            sub_lord = (star_lord + i) % 9
+            sub_units = NAKSHATRA_UNITS * KP_LORD_YEARS[sub_lord] // TOTAL_DASA_YEARS
+            for j in range(9):
+                sub_sub_lord = (sub_lord + j) % 9
+                starts.append(position)
+                nakshatras.append(nakshatra)
+                sub_lords.append(sub_lord)
+                sub_sub_lords.append(sub_sub_lord)
+                position += sub_units * KP_LORD_YEARS[sub_sub_lord] // TOTAL_DASA_YEARS
+    assert position == 360 * UNITS_PER_DEGREE
+    return (np.array(starts) / UNITS_PER_DEGREE, np.array(nakshatras), np.array(sub_lords), np.array(sub_sub_lords))
+
+SUB_SUB_STARTS, SUB_SUB_NAKSHATRAS, SUB_SUB_LORDS, SUB_SUB_SUB_LORDS = _build_sub_sub_table()
+_SUB_SUB_STARTS_LIST = SUB_SUB_STARTS.tolist()
+
+
+def get_kp_lord_indices(lons):
+    """
+    Batch lookup of KP lords for an array of longitudes.
+
+    Parameters
+    ==========
+    lons: array-like of sidereal longitudes in degrees (any shape, normalized to [0, 360))
+
+    Returns
+    =======
+    KPLordIndices named tuple of integer arrays with the same shape as `lons`:
+    Nakshatra (0-26), Pada (1-4), and RasiLord, NakshatraLord, SubLord, SubSubLord as indices into KP_LORDS
+    """
+    lons = np.mod(np.asarray(lons, dtype=float), 360.0)
+    division = np.searchsorted(SUB_SUB_STARTS, lons, side="right") - 1
+    nakshatra = SUB_SUB_NAKSHATRAS[division]
+    pada = np.minimum(((lons - nakshatra * NAKSHATRA_SPAN) // PADA_SPAN).astype(int), 3) + 1
+    rasi_lord = RASI_LORD_INDICES[(lons // 30).astype(int)]
+    return KPLordIndices(nakshatra, pada, rasi_lord, nakshatra % 9, SUB_SUB_LORDS[division], SUB_SUB_SUB_LORDS[division])
+
+def get_kp_lords(deg: float):
+    """
+    Scalar lookup of KP lords for a single longitude, using the same table as `get_kp_lord_indices`.
+    Returns a KPLordIndices named tuple of ints.
+    """
+    deg = deg % 360
+    division = bisect.bisect_right(_SUB_SUB_STARTS_LIST, deg) - 1
+    nakshatra = int(SUB_SUB_NAKSHATRAS[division])
+    pada = min(int((deg - nakshatra * NAKSHATRA_SPAN) // PADA_SPAN), 3) + 1
+    return KPLordIndices(nakshatra, pada, int(RASI_LORD_INDICES[int(deg // 30)]), nakshatra % 9,
+                         int(SUB_SUB_LORDS[division]), int(SUB_SUB_SUB_LORDS[division]))
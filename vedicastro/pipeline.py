@@ -0,0 +1,103 @@
+"""
+Small DAG executor for multi-stage request pipelines.
+
+Composite endpoints (Eg: the marriage windows) are built from several sub-computations, some of which only
+depend on the request and some on the results of other stages. A `Pipeline` declares each stage with the stages
+it requires. `run` starts every stage as soon as its requirements are done, so independent stages run
+concurrently (Eg: on a ChartProcessPool) and the latency is that of the longest chain instead of the sum of
+all stages. The wall time of each stage is recorded in `timings`.
+"""
+import time
+import asyncio
+import collections
+
+Stage = collections.namedtuple("Stage", ["name", "func", "args", "requires", "offload"])
+
+
+class Pipeline:
+    """
+    Directed acyclic graph of named stages. A stage is called as `func(*args, *required_results)`, with the
+    results of its required stages in the declared order. Stages can only require already added stages, so
+    the insertion order is a valid execution order and cycles cannot be declared.
+    """
+
+    def __init__(self, name: str = "pipeline"):
+        self.name = name
+        self.stages = {}
+        ## Wall time of each stage (and "total") of the last run, in milliseconds
+        self.timings = {}
+
+    def add_stage(self, name: str, func, *args, requires: tuple = (), offload: bool = True):
+        """
+        Adds a stage to the pipeline.
+
+        Parameters
+        ==========
+        name: unique name of the stage, under which its result is returned
+        func: function computing the stage. Must be picklable (module level) when offloaded to a process pool
+        args: leading arguments of `func`
+        requires: names of the stages whose results are appended to the arguments of `func`
+        offload: run the stage with the runner given to `run` (Eg: a process pool). Otherwise it runs inline.
+        """
+        if name in self.stages:
+            raise ValueError(f"Stage {name} is already defined in pipeline {self.name}")
+        unknown = [required for required in requires if required not in self.stages]
+        if unknown:
+            raise ValueError(f"Stage {name} requires undefined stages: {', '.join(unknown)}")
+        self.stages[name] = Stage(name, func, args, tuple(requires), offload)
+        return self
+
+    def _get_args(self, stage: Stage, results: dict):
+        return (*stage.args, *(results[required] for required in stage.requires))
+
+    def run_sync(self):
+        """Runs the stages one after the other in the current thread. Returns the dict of stage results."""
+        self.timings = {}
+        results = {}
+        start = time.perf_counter()
+        for stage in self.stages.values():
+            stage_start = time.perf_counter()
+            results[stage.name] = stage.func(*self._get_args(stage, results))
+            self.timings[stage.name] = (time.perf_counter() - stage_start) * 1000
+        self.timings["total"] = (time.perf_counter() - start) * 1000
+        return results
+
+    async def run(self, runner=None):
+        """
+        Runs every stage as soon as its required stages are done. Returns the dict of stage results.
+
+        Parameters
+        ==========
+        runner: async callable `runner(func, *args)` running the offloaded stages (Eg: `ChartProcessPool.run`).
+                None runs all stages inline in the event loop.
+        """
+        self.timings = {}
+        results = {}
+        tasks = {}
+
+        async def run_stage(stage: Stage):
+            if stage.requires:
+                await asyncio.gather(*(tasks[required] for required in stage.requires))
+            stage_start = time.perf_counter()
+            args = self._get_args(stage, results)
+            if stage.offload and runner is not None:
+                results[stage.name] = await runner(stage.func, *args)
+            else:
+                results[stage.name] = stage.func(*args)
+            self.timings[stage.name] = (time.perf_counter() - stage_start) * 1000
+
+        start = time.perf_counter()
+        for stage in self.stages.values():
+            tasks[stage.name] = asyncio.ensure_future(run_stage(stage))
+        try:
+            await asyncio.gather(*tasks.values())
+        except BaseException:
+            for task in tasks.values():
+                task.cancel()
+            raise
+        self.timings["total"] = (time.perf_counter() - start) * 1000
+        return results
+
+    def server_timing(self):
+        """The stage timings of the last run as a `Server-Timing` HTTP header value"""
+        return ", ".join(f"{name};dur={duration:.1f}" for name, duration in self.timings.items())
@@ -0,0 +1,157 @@
+"""
+Process pool for CPU-bound chart computations.
+
+Chart building (flatlib / swiss ephemeris), dasa and transit computations and the horary ascendant search are
+synchronous and CPU-bound. Running them directly inside an `async def` handler blocks the event loop, so one
+heavy request stalls every other client of the same server worker. `ChartProcessPool` runs such functions in
+a pool of warm worker processes instead, with a limit on the number of concurrently dispatched jobs.
+
+Worker processes also keep the global swiss ephemeris state (sidereal mode, file handles) of each computation
+separate, which threads cannot do.
+
+Configuration (environment variables)
+=====================================
+VEDICASTRO_POOL_WORKERS: number of worker processes (default: CPU count). 0 runs jobs in a thread instead,
+                        one at a time.
+VEDICASTRO_POOL_MAX_CONCURRENCY: max number of jobs dispatched at once (default: 2 x workers). Others wait.
+VEDICASTRO_POOL_WARM_AYANAMSAS: comma separated ayanamsas whose transit tables are built (if missing) and
+                                loaded at worker start.
+"""
+import os
+import time
+import asyncio
+import functools
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+POOL_WORKERS = int(os.environ.get("VEDICASTRO_POOL_WORKERS", os.cpu_count() or 1))
+POOL_MAX_CONCURRENCY = int(os.environ.get("VEDICASTRO_POOL_MAX_CONCURRENCY", 2 * max(POOL_WORKERS, 1)))
+POOL_WARM_AYANAMSAS = [ayanamsa for ayanamsa in os.environ.get("VEDICASTRO_POOL_WARM_AYANAMSAS", "Krishnamurti,Lahiri").split(",") if ayanamsa]
+
+## Jobs run in threads (0 workers) share the global swiss ephemeris state (Eg: the sidereal mode set for a chart),
+## so they run one at a time
+THREAD_JOBS_LOCK = threading.Lock()
+
+def run_exclusive(call):
+    """Runs `call()` while holding THREAD_JOBS_LOCK"""
+    with THREAD_JOBS_LOCK:
+        return call()
+
+def warm_worker(ayanamsas: list = None):
+    """
+    Worker process initializer. Imports the chart modules and builds one throw-away chart, so that the swiss
+    ephemeris files and the KP lord table are loaded before the first request, and maps the transit tables
+    of the given ayanamsas. A missing table is built by one worker while the others wait for it.
+    """
+    from .VedicAstro import VedicHoroscopeData
+    from . import kp_lords, transit_cache, transit_engine
+
+    VedicHoroscopeData(year=2000, month=1, day=1, hour=12, minute=0, second=0,
+                       latitude=0.0, longitude=0.0, tz="UTC").generate_chart()
+    kp_lords.get_kp_lords(0.0)
+    for ayanamsa in ayanamsas or []:
+        if ayanamsa in transit_engine.SWE_AYANAMSA_MAPPING:
+            transit_cache.load_transit_table(ayanamsa)
+
+def get_worker_pid():
+    """Trivial job returning the id of the worker process running it, used to wait for the workers to start"""
+    time.sleep(0.01)
+    return os.getpid()
+
+
+class ChartProcessPool:
+    """Asyncio front-end of a ProcessPoolExecutor with a concurrency limit and queue metrics"""
+
+    def __init__(self, max_workers: int = POOL_WORKERS, max_concurrency: int = POOL_MAX_CONCURRENCY,
+                 warm_ayanamsas: list = None):
+        self.max_workers = max_workers
+        self.max_concurrency = max_concurrency
+        self.warm_ayanamsas = POOL_WARM_AYANAMSAS if warm_ayanamsas is None else warm_ayanamsas
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        self._semaphore = None
+        ## Metrics
+        self.queued = 0      # jobs waiting for a concurrency slot
+        self.running = 0     # jobs dispatched to the executor
+        self.completed = 0
+        self.failed = 0
+
+    def start(self):
+        """
+        Creates the executor. Its worker processes are spawned by the first jobs (see `wait_ready`, called at
+        application startup); `run` also starts the pool lazily.
+        """
+        with self._executor_lock:
+            if self._executor is None and self.max_workers > 0:
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers, initializer=warm_worker,
+                                                     initargs=(self.warm_ayanamsas,))
+        return self
+
+    def wait_ready(self, timeout: float = 120):
+        """
+        Starts the pool and blocks until every worker process has run `warm_worker`. The executor only spawns
+        its processes on the first submitted jobs, so trivial jobs are submitted until each worker has run one
+        (a worker runs its initializer before its first job). Called at application startup, before traffic.
+        """
+        executor = self.start()._executor
+        if executor is None:
+            return self
+        start = time.perf_counter()
+        worker_pids = set()
+        while len(worker_pids) < self.max_workers:
+            remaining = timeout - (time.perf_counter() - start)
+            if remaining <= 0:
+                raise TimeoutError(f"{len(worker_pids)} of {self.max_workers} pool workers started in {timeout} s")
+            jobs = [executor.submit(get_worker_pid) for _ in range(self.max_workers)]
+            worker_pids.update(job.result(timeout=remaining) for job in jobs)
+        print(f"Started {self.max_workers} warm pool workers in {time.perf_counter() - start:.1f} s")
+        return self
+
+    def shutdown(self, wait: bool = True):
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=wait)
+                self._executor = None
+
+    async def run(self, func, *args, **kwargs):
+        """
+        Runs `func(*args, **kwargs)` in a worker process and returns its result. `func`, its arguments and its
+        result must be picklable, so `func` has to be a module level function.
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        call = functools.partial(func, *args, **kwargs)
+        loop = asyncio.get_running_loop()
+
+        self.queued += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.queued -= 1
+
+        self.running += 1
+        try:
+            if self.max_workers <= 0:
+                result = await loop.run_in_executor(None, run_exclusive, call)
+            else:
+                try:
+                    result = await loop.run_in_executor(self.start()._executor, call)
+                except BrokenProcessPool:
+                    ## A worker died (Eg: killed by the OS). Replace the pool and retry once.
+                    self.shutdown(wait=False)
+                    result = await loop.run_in_executor(self.start()._executor, call)
+            self.completed += 1
+            return result
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            self.running -= 1
+            self._semaphore.release()
+
+    def get_stats(self):
+        """Returns the pool configuration and its current queue depth / job counters"""
+        return {"workers": self.max_workers, "max_concurrency": self.max_concurrency,
+                "queue_depth": self.queued, "running": self.running,
+                "completed": self.completed, "failed": self.failed}
@@ -0,0 +1,211 @@
+"""
+Optional persistent store of endpoint results, keyed by the canonical birth input.
+
+The same birth data is requested again and again (Eg: a user coming back to their profile), and every visit
+recomputes the chart, significators, dasa and marriage analysis. When enabled, `ResultStore` keeps the
+serialized result of each endpoint in a local SQLite database, keyed by a hash of:
+    - the canonical chart input: the birth instant normalized to UTC, its timezone, the latitude / longitude
+      rounded to TZ_CACHE_PRECISION decimals, the ayanamsa and the house system
+    - the endpoint name and its other arguments (Eg: return_style, dasa level)
+    - the store version: the library version and RESULT_STORE_VERSION
+The database is bounded in size: when it grows over the limit the least recently read results are evicted.
+Results of another version are never read and are deleted when the store is opened.
+
+Configuration (environment variables)
+=====================================
+VEDICASTRO_RESULT_STORE: path of the SQLite file, or "1" for results.sqlite3 in VEDICASTRO_CACHE_DIR.
+                         Unset (default), empty or "0" disables the store.
+VEDICASTRO_RESULT_STORE_MAX_MB: size limit of the stored results, in MB (default: 512)
+"""
+import os
+import json
+import time
+import pickle
+import sqlite3
+import hashlib
+import threading
+from datetime import datetime
+from importlib import metadata
+from .utils import resolve_time_zone, get_utc_offset_table, TZ_CACHE_PRECISION
+from .transit_cache import TRANSIT_CACHE_DIR
+
+## Bump when the format of any stored result changes, to invalidate the existing stores
+RESULT_STORE_VERSION = 4
+
+RESULT_STORE_PATH = os.environ.get("VEDICASTRO_RESULT_STORE", "")
+RESULT_STORE_MAX_BYTES = int(float(os.environ.get("VEDICASTRO_RESULT_STORE_MAX_MB", 512)) * 1024 * 1024)
+
+## After an eviction the store is shrunk to this fraction of its limit, so that eviction doesn't run on every write
+EVICTION_LOW_WATER = 0.9
+
+## Returned by `ResultStore.get` when no result is stored
+MISSING = object()
+
+def get_library_version():
+    """Returns the installed vedicastro version, or "dev" when running from a source tree"""
+    try:
+        return metadata.version("vedicastro")
+    except metadata.PackageNotFoundError:
+        return "dev"
+
+def canonical_chart_key(year: int, month: int, day: int, hour: int, minute: int, second: int,
+                        latitude: float, longitude: float, tz: str = None, ayanamsa: str = "Krishnamurti",
+                        house_system: str = "Placidus"):
+    """
+    Returns the canonical form of a chart input, as a tuple. Inputs describing the same chart (Eg: the same
+    instant with or without an explicit timezone) get the same key. The timezone is kept, as the dates of the
+    results are formatted in it.
+    """
+    time_zone = resolve_time_zone(latitude, longitude, tz)
+    local_date = datetime(year, month, day, hour, minute, int(second))
+    utc_date = local_date - get_utc_offset_table(time_zone).local_utcoffset(local_date)
+    return (utc_date.isoformat(), time_zone, round(latitude, TZ_CACHE_PRECISION), round(longitude, TZ_CACHE_PRECISION),
+            ayanamsa, house_system)
+
+
+class ResultStore:
+    """
+    Size-bounded SQLite store of pickled endpoint results. Safe to use from several threads and from the
+    processes of a ChartProcessPool: each process opens its own connection, and the database is in WAL mode.
+    Store errors (Eg: a locked or corrupt file) are counted and treated as misses, they never fail a request.
+
+    Parameters
+    ==========
+    path: path of the SQLite file
+    max_bytes: size limit of the stored (pickled) results
+    version: results stored with another version are invalidated
+    """
+
+    def __init__(self, path: str, max_bytes: int = RESULT_STORE_MAX_BYTES, version: str = None):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.version = version or f"{get_library_version()}:{RESULT_STORE_VERSION}"
+        self._connection = None
+        self._pid = None
+        self._lock = threading.Lock()
+        ## Counters of this process
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        self.errors = 0
+
+    def _connect(self):
+        ## SQLite connections must not be shared with forked worker processes
+        if self._connection is None or self._pid != os.getpid():
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute("CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, endpoint TEXT NOT NULL, "
+                               "version TEXT NOT NULL, value BLOB NOT NULL, size INTEGER NOT NULL, "
+                               "last_access REAL NOT NULL)")
+            connection.execute("CREATE INDEX IF NOT EXISTS results_last_access ON results (last_access)")
+            ## Versioned invalidation
+            connection.execute("DELETE FROM results WHERE version != ?", (self.version,))
+            self._connection, self._pid = connection, os.getpid()
+        return self._connection
+
+    def get_key(self, endpoint: str, chart_key: tuple, args: tuple = ()):
+        """Returns the store key (hex digest) of the result of an endpoint for a canonical chart key and arguments"""
+        payload = json.dumps([self.version, endpoint, chart_key, args], default=str, sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def get(self, endpoint: str, chart_key: tuple, args: tuple = ()):
+        """Returns the stored result, or MISSING"""
+        key = self.get_key(endpoint, chart_key, args)
+        try:
+            with self._lock:
+                connection = self._connect()
+                row = connection.execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    connection.execute("UPDATE results SET last_access = ? WHERE key = ?", (time.time(), key))
+            if row is not None:
+                value = pickle.loads(row[0])
+                self.hits += 1
+                return value
+        except (sqlite3.Error, pickle.UnpicklingError, EOFError, AttributeError):
+            self.errors += 1
+        self.misses += 1
+        return MISSING
+
+    def put(self, endpoint: str, chart_key: tuple, args: tuple, value):
+        """Stores a result, evicting the least recently read results when over the size limit"""
+        key = self.get_key(endpoint, chart_key, args)
+        try:
+            data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+            if len(data) > self.max_bytes:
+                return
+            with self._lock:
+                connection = self._connect()
+                connection.execute("INSERT OR REPLACE INTO results (key, endpoint, version, value, size, last_access) "
+                                   "VALUES (?, ?, ?, ?, ?, ?)", (key, endpoint, self.version, data, len(data), time.time()))
+                self.writes += 1
+                self._evict(connection)
+        except (sqlite3.Error, pickle.PicklingError, TypeError, AttributeError):
+            self.errors += 1
+
+    def _evict(self, connection: sqlite3.Connection):
+        total = connection.execute("SELECT total(size) FROM results").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        excess = total - self.max_bytes * EVICTION_LOW_WATER
+        evicted = []
+        for key, size in connection.execute("SELECT key, size FROM results ORDER BY last_access"):
+            if excess <= 0:
+                break
+            evicted.append((key,))
+            excess -= size
+        connection.executemany("DELETE FROM results WHERE key = ?", evicted)
+        self.evictions += len(evicted)
+
+    def get_or_compute(self, endpoint: str, chart_key: tuple, args: tuple, compute):
+        """Returns the stored result, or computes it with `compute()` and stores it"""
+        value = self.get(endpoint, chart_key, args)
+        if value is MISSING:
+            value = compute()
+            self.put(endpoint, chart_key, args, value)
+        return value
+
+    def invalidate(self, endpoint: str = None):
+        """Deletes the stored results of an endpoint, or all the results"""
+        with self._lock:
+            connection = self._connect()
+            if endpoint is None:
+                connection.execute("DELETE FROM results")
+            else:
+                connection.execute("DELETE FROM results WHERE endpoint = ?", (endpoint,))
+
+    def get_stats(self):
+        """Returns the size of the store per endpoint, and the hit / miss counters of this process"""
+        with self._lock:
+            rows = self._connect().execute("SELECT endpoint, count(*), total(size) FROM results GROUP BY endpoint").fetchall()
+        return {
+            "path": self.path,
+            "version": self.version,
+            "max_bytes": self.max_bytes,
+            "entries": sum(count for _, count, _ in rows),
+            "bytes": int(sum(size for _, _, size in rows)),
+            "endpoints": {endpoint: {"entries": count, "bytes": int(size)} for endpoint, count, size in rows},
+            "hits": self.hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "evictions": self.evictions,
+            "errors": self.errors,
+        }
+
+
+_RESULT_STORE = None
+_RESULT_STORE_LOCK = threading.Lock()
+
+def get_result_store():
+    """Returns the process-wide ResultStore configured by VEDICASTRO_RESULT_STORE, or None when it is disabled"""
+    global _RESULT_STORE
+    if RESULT_STORE_PATH in ("", "0"):
+        return None
+    if _RESULT_STORE is None:
+        with _RESULT_STORE_LOCK:
+            if _RESULT_STORE is None:
+                path = os.path.join(TRANSIT_CACHE_DIR, "results.sqlite3") if RESULT_STORE_PATH == "1" else RESULT_STORE_PATH
+                _RESULT_STORE = ResultStore(path)
+    return _RESULT_STORE
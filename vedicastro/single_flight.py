@@ -0,0 +1,88 @@
+"""
+Single-flight coalescing of identical concurrent computations.
+
+A client opening a profile fires several requests for the same birth input at once. Without coordination each
+of them computes the same chart. With single-flight, the first caller of a key runs the computation and the
+callers arriving while it is in flight wait for its result instead of starting their own. Nothing is cached:
+once the computation is done, the next call of the key runs it again (caching is done by `chart_cache` and
+`result_store`).
+
+`SingleFlight` coalesces calls from threads, `AsyncSingleFlight` coalesces coroutines of an event loop.
+"""
+import asyncio
+import threading
+from concurrent.futures import Future
+
+
+class SingleFlight:
+    """Thread-safe single-flight: concurrent `run` calls with the same key share one call of `func`"""
+
+    def __init__(self):
+        self._in_flight = {}
+        self._lock = threading.Lock()
+        ## Counters
+        self.calls = 0
+        self.coalesced = 0
+
+    def run(self, key, func, *args):
+        """Returns `func(*args)`, or the result (or exception) of the in-flight call of the same key"""
+        with self._lock:
+            self.calls += 1
+            future = self._in_flight.get(key)
+            owner = future is None
+            if owner:
+                future = self._in_flight[key] = Future()
+            else:
+                self.coalesced += 1
+        if not owner:
+            return future.result()
+
+        try:
+            result = func(*args)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+
+    def get_stats(self):
+        return {"calls": self.calls, "coalesced": self.coalesced, "in_flight": len(self._in_flight)}
+
+
+class AsyncSingleFlight:
+    """
+    Single-flight for coroutines of one event loop: concurrent `run` calls with the same key await one task.
+    The task is shielded, so a caller that is cancelled (Eg: its client disconnected) doesn't cancel it for the
+    other callers.
+    """
+
+    def __init__(self):
+        self._in_flight = {}
+        ## Counters
+        self.calls = 0
+        self.coalesced = 0
+
+    async def run(self, key, func, *args):
+        """Returns `await func(*args)`, or the result (or exception) of the in-flight call of the same key"""
+        self.calls += 1
+        task = self._in_flight.get(key)
+        if task is None:
+            task = self._in_flight[key] = asyncio.ensure_future(func(*args))
+            task.add_done_callback(lambda done: self._done(key, done))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def _done(self, key, task: asyncio.Future):
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        ## Retrieves the exception, so it is not reported as unhandled when all the callers were cancelled
+        if not task.cancelled():
+            task.exception()
+
+    def get_stats(self):
+        return {"calls": self.calls, "coalesced": self.coalesced, "in_flight": len(self._in_flight)}
@@ -0,0 +1,166 @@
+"""
+Process-wide, on-disk cache of the transit timelines computed by `transit_engine`.
+
+The sign / retrograde timeline of a planet depends only on the date range and the ayanamsa, never on
+the natal chart. This module precomputes the timeline of every planet from 1900 to 2100 once per ayanamsa,
+stores it in a compact binary `.npy` file and opens it with `mmap`. Range queries are then answered by
+binary search and slicing instead of ephemeris calls.
+
+The tables are built on first use, by one process at a time (the others wait for the file and map it). The pool
+workers build the missing tables of VEDICASTRO_POOL_WARM_AYANAMSAS at startup. To build them ahead of time
+(Eg: during deployment), run:
+    python -m vedicastro.transit_cache Lahiri Krishnamurti
+"""
+import os
+import sys
+import time
+import threading
+import numpy as np
+import swisseph as swe
+try:
+    import fcntl
+except ImportError:
+    ## No cross-process lock on Windows: concurrent processes may build the same table
+    fcntl = None
+from . import transit_engine
+from .transit_engine import TransitPeriod
+from .VedicAstro import RASHIS
+
+TRANSIT_CACHE_VERSION = 1
+TRANSIT_CACHE_DIR = os.environ.get("VEDICASTRO_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "vedicastro"))
+
+## Time span covered by the cached tables (UT)
+CACHE_START_YEAR, CACHE_END_YEAR = 1900, 2100
+CACHE_JD_START = swe.julday(CACHE_START_YEAR, 1, 1, 0.0)
+CACHE_JD_END = swe.julday(CACHE_END_YEAR + 1, 1, 1, 0.0)
+
+## Planet codes stored in the table are indices into this list
+CACHE_PLANETS = list(transit_engine.SWE_PLANETS)
+
+## Number of table rows converted to TransitPeriods at a time when streaming
+STREAM_CHUNK_ROWS = 4096
+
+## One row per transit period start, sorted by planet and then by time. 11 bytes per row.
+TRANSIT_TABLE_DTYPE = np.dtype([("jd", "<f8"), ("planet", "u1"), ("sign", "u1"), ("retro", "u1")])
+
+class TransitTable:
+    """Memory-mapped transit table of one ayanamsa, with a per-planet time index"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.table = np.load(path, mmap_mode="r")
+        if self.table.dtype != TRANSIT_TABLE_DTYPE:
+            raise ValueError(f"Unexpected transit table layout in {path}")
+        offsets = np.searchsorted(self.table["planet"], np.arange(len(CACHE_PLANETS) + 1))
+        self.planet_slices = {planet: (int(offsets[code]), int(offsets[code + 1])) for code, planet in enumerate(CACHE_PLANETS)}
+        ## Contiguous copies of the (small) per-planet time columns, used for binary search
+        self.planet_jds = {planet: np.ascontiguousarray(self.table["jd"][lo:hi]) for planet, (lo, hi) in self.planet_slices.items()}
+
+    def get_planet_periods(self, planet: str, jd_start: float, jd_end: float):
+        """Returns the TransitPeriod list of a planet between two Julian Days (UT), by slicing the table"""
+        return list(self.iter_planet_periods(planet, jd_start, jd_end))
+
+    def iter_planet_periods(self, planet: str, jd_start: float, jd_end: float, chunk_rows: int = STREAM_CHUNK_ROWS):
+        """Yields the TransitPeriods of a planet between two Julian Days (UT), reading the table `chunk_rows` at a time"""
+        lo, _ = self.planet_slices[planet]
+        jds = self.planet_jds[planet]
+        first = max(int(np.searchsorted(jds, jd_start, side="right")) - 1, 0)
+        last = int(np.searchsorted(jds, jd_end, side="left"))
+
+        for chunk_start in range(first, last, chunk_rows):
+            chunk_end = min(chunk_start + chunk_rows, last)
+            rows = self.table[lo + chunk_start: lo + chunk_end]
+            start_jds, signs, retros = rows["jd"].tolist(), rows["sign"].tolist(), rows["retro"].tolist()
+            ## A period ends where the next one starts, or at jd_end for the last period of the range
+            end_jds = start_jds[1:] + [float(jds[chunk_end]) if chunk_end < last else jd_end]
+            if chunk_start == first:
+                start_jds[0] = max(start_jds[0], jd_start)
+            for start, end, sign, retro in zip(start_jds, end_jds, signs, retros):
+                yield TransitPeriod(planet, RASHIS[sign], sign, start, end, bool(retro))
+
+
+_TRANSIT_TABLES = {}
+_TRANSIT_TABLES_LOCK = threading.Lock()
+
+def get_transit_table_path(ayanamsa: str, cache_dir: str = None):
+    """Returns the file path of the cached transit table for an ayanamsa"""
+    cache_dir = cache_dir or TRANSIT_CACHE_DIR
+    return os.path.join(cache_dir, f"transit_table_v{TRANSIT_CACHE_VERSION}_{ayanamsa}_{CACHE_START_YEAR}_{CACHE_END_YEAR}.npy")
+
+def build_transit_table(ayanamsa: str, cache_dir: str = None):
+    """
+    Computes the transit periods of all planets over the cached time span and writes them to disk.
+    Returns the path of the written file.
+    """
+    transit_periods = transit_engine.get_transit_periods(CACHE_PLANETS, CACHE_JD_START, CACHE_JD_END, ayanamsa)
+    rows = [(period.start_jd, code, period.SignIndex, period.isRetrograde)
+            for code, planet in enumerate(CACHE_PLANETS) for period in transit_periods[planet]]
+    table = np.array(rows, dtype=TRANSIT_TABLE_DTYPE)
+
+    path = get_transit_table_path(ayanamsa, cache_dir)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    ## Write to a temporary file first, so that concurrent readers never see a partial table
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        np.save(f, table)
+    os.replace(tmp_path, path)
+    return path
+
+def build_missing_transit_table(ayanamsa: str):
+    """
+    Builds the transit table file of an ayanamsa unless it exists, holding a lock file so that only one process
+    builds it: the other processes wait for the build and then find the file. Returns the path of the file.
+    """
+    path = get_transit_table_path(ayanamsa)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(f"{path}.lock", "w") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        if not os.path.exists(path):
+            print(f"Building the transit table for {ayanamsa} ({CACHE_START_YEAR}-{CACHE_END_YEAR}), once per cache directory")
+            start = time.perf_counter()
+            build_transit_table(ayanamsa)
+            print(f"Built the transit table for {ayanamsa} in {time.perf_counter() - start:.1f} s: {path}")
+    return path
+
+def load_transit_table(ayanamsa: str, build_if_missing: bool = True):
+    """Returns the process-wide TransitTable of an ayanamsa, building the file first if required"""
+    table = _TRANSIT_TABLES.get(ayanamsa)
+    if table is not None:
+        return table
+    with _TRANSIT_TABLES_LOCK:
+        if ayanamsa not in _TRANSIT_TABLES:
+            path = get_transit_table_path(ayanamsa)
+            if not os.path.exists(path):
+                if not build_if_missing:
+                    return None
+                build_missing_transit_table(ayanamsa)
+            _TRANSIT_TABLES[ayanamsa] = TransitTable(path)
+        return _TRANSIT_TABLES[ayanamsa]
+
+def get_transit_periods(planets: list, jd_start: float, jd_end: float, ayanamsa: str):
+    """
+    Drop-in replacement for `transit_engine.get_transit_periods` that answers from the cached table.
+    Ranges outside the cached time span are computed directly by the transit engine.
+    """
+    if jd_start < CACHE_JD_START or jd_end > CACHE_JD_END:
+        return transit_engine.get_transit_periods(planets, jd_start, jd_end, ayanamsa)
+    table = load_transit_table(ayanamsa)
+    return {planet: table.get_planet_periods(planet, jd_start, jd_end) for planet in planets}
+
+def iter_transit_periods(planets: list, jd_start: float, jd_end: float, ayanamsa: str):
+    """
+    Drop-in replacement for `transit_engine.iter_transit_periods` that streams from the cached table, planet
+    by planet. Ranges outside the cached time span are computed directly by the transit engine.
+    """
+    if jd_start < CACHE_JD_START or jd_end > CACHE_JD_END:
+        yield from transit_engine.iter_transit_periods(planets, jd_start, jd_end, ayanamsa)
+        return
+    table = load_transit_table(ayanamsa)
+    for planet in planets:
+        yield from table.iter_planet_periods(planet, jd_start, jd_end)
+
+
+if __name__ == "__main__":
+    for ayanamsa in sys.argv[1:] or list(transit_engine.SWE_AYANAMSA_MAPPING):
+        print(f"Built transit table for {ayanamsa}: {build_transit_table(ayanamsa)}")
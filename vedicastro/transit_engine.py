@@ -0,0 +1,179 @@
+"""
+Event-driven transit engine.
+
+Instead of building a full chart for every day of a date range, this module samples each planet's
+sidereal longitude and speed directly from the swiss ephemeris at a planet specific step, and then
+root-finds the exact instants at which the planet changes sign (ingress) or changes direction (station).
+The cost of a transit query therefore grows with the number of events, not with the number of days.
+"""
+import collections
+import swisseph as swe
+from .VedicAstro import RASHIS
+
+## Swiss Ephemeris body ids for the transiting planets. Ketu is derived from Rahu (Mean Node + 180°)
+SWE_PLANETS = { "Sun": swe.SUN, "Moon": swe.MOON, "Mercury": swe.MERCURY, "Venus": swe.VENUS, "Mars": swe.MARS,
+                "Jupiter": swe.JUPITER, "Saturn": swe.SATURN, "Uranus": swe.URANUS, "Neptune": swe.NEPTUNE,
+                "Pluto": swe.PLUTO, "Rahu": swe.MEAN_NODE, "Ketu": swe.MEAN_NODE,
+                }
+
+PLANET_LON_OFFSETS = {"Ketu": 180.0}
+
+SWE_AYANAMSA_MAPPING = { "Lahiri": swe.SIDM_LAHIRI, "Lahiri_1940": swe.SIDM_LAHIRI_1940,
+                        "Lahiri_VP285": swe.SIDM_LAHIRI_VP285, "Lahiri_ICRC": swe.SIDM_LAHIRI_ICRC, "Raman": swe.SIDM_RAMAN,
+                        "Krishnamurti": swe.SIDM_KRISHNAMURTI, "Krishnamurti_Senthilathiban": swe.SIDM_KRISHNAMURTI_VP291,
+                        }
+
+## Sampling step (in days) per planet. Each step must be short enough that the planet can cross at most one
+## sign boundary and cannot both station and re-station between two samples.
+SCAN_STEP_DAYS = { "Sun": 7.0, "Moon": 1.5, "Mercury": 3.0, "Venus": 5.0, "Mars": 7.0, "Jupiter": 10.0,
+                   "Saturn": 10.0, "Uranus": 15.0, "Neptune": 15.0, "Pluto": 15.0, "Rahu": 15.0, "Ketu": 15.0,
+                   }
+
+ROOT_TOLERANCE_DAYS = 1e-6  # ~0.09 seconds
+SWE_FLAGS = swe.FLG_SIDEREAL | swe.FLG_SPEED
+
+INGRESS, RETROGRADE, DIRECT = "Ingress", "Retrograde", "Direct"
+
+TransitEvent = collections.namedtuple("TransitEvent", ["jd", "PlanetName", "EventType", "SignIndex", "isRetrograde"])
+TransitPeriod = collections.namedtuple("TransitPeriod", ["PlanetName", "Rasi", "SignIndex", "start_jd", "end_jd", "isRetrograde"])
+
+
+def set_ayanamsa(ayanamsa: str):
+    """Sets the swiss ephemeris sidereal mode for the given ayanamsa name"""
+    if ayanamsa not in SWE_AYANAMSA_MAPPING:
+        raise ValueError(f"Unsupported ayanamsa: {ayanamsa}")
+    swe.set_sid_mode(SWE_AYANAMSA_MAPPING[ayanamsa])
+
+def get_planet_lon_speed(jd: float, planet: str):
+    """Returns the sidereal longitude and longitude speed (deg/day) of a planet at the given Julian Day (UT)"""
+    pos, _ = swe.calc_ut(jd, SWE_PLANETS[planet], SWE_FLAGS)
+    return (pos[0] + PLANET_LON_OFFSETS.get(planet, 0.0)) % 360, pos[3]
+
+def signed_arc(lon: float, ref: float):
+    """Returns the shortest signed arc from `ref` to `lon`, in the range [-180, 180)"""
+    return (lon - ref + 180) % 360 - 180
+
+def find_root(func, t0: float, t1: float, f0: float, f1: float, tol: float = ROOT_TOLERANCE_DAYS, max_iter: int = 60):
+    """
+    Finds a root of `func` within the bracket [t0, t1] where f0 and f1 have opposite signs,
+    using the Illinois variant of the regula falsi method.
+    """
+    side = 0
+    t = t0
+    for _ in range(max_iter):
+        t = (t0 * f1 - t1 * f0) / (f1 - f0)
+        ft = func(t)
+        if ft == 0 or abs(t1 - t0) < tol:
+            break
+        if ft * f1 > 0:
+            t1, f1 = t, ft
+            if side == -1:
+                f0 /= 2
+            side = -1
+        else:
+            t0, f0 = t, ft
+            if side == 1:
+                f1 /= 2
+            side = 1
+    return t
+
+def _ingresses_in_segment(planet: str, t0: float, t1: float, lon0: float, lon1: float, is_retrograde: bool):
+    """Returns the ingress events of a planet within a segment where its motion is monotonic"""
+    events = []
+    movement = signed_arc(lon1, lon0)
+    start_sign = int(lon0 // 30)
+    end_sign = int((lon0 + movement) // 30)
+    ## Sign boundaries crossed, in the order they are crossed
+    boundaries = range(start_sign + 1, end_sign + 1) if movement > 0 else range(start_sign, end_sign, -1)
+    for boundary_index in boundaries:
+        boundary = (boundary_index * 30) % 360
+        func = lambda t: signed_arc(get_planet_lon_speed(t, planet)[0], boundary)
+        jd = find_root(func, t0, t1, signed_arc(lon0, boundary), signed_arc(lon1, boundary))
+        sign_index = boundary_index % 12 if movement > 0 else (boundary_index - 1) % 12
+        events.append(TransitEvent(jd, planet, INGRESS, sign_index, is_retrograde))
+    return events
+
+def find_planet_events(planet: str, jd_start: float, jd_end: float):
+    """
+    Finds all sign ingresses and retrograde/direct stations of a planet between two Julian Days (UT),
+    for the currently set ayanamsa.
+
+    Returns
+    =======
+    initial_state: TransitEvent with EventType `None`, describing the planet's sign and direction at `jd_start`
+    events: list of TransitEvent named tuples sorted by time, with exact (sub-second) event instants
+    """
+    return get_initial_state(planet, jd_start), list(iter_planet_events(planet, jd_start, jd_end))
+
+def get_initial_state(planet: str, jd: float):
+    """Returns a TransitEvent with EventType `None`, describing the planet's sign and direction at `jd`"""
+    lon, speed = get_planet_lon_speed(jd, planet)
+    return TransitEvent(jd, planet, None, int(lon // 30), speed < 0)
+
+def iter_planet_events(planet: str, jd_start: float, jd_end: float):
+    """
+    Generator version of `find_planet_events`: yields the TransitEvents of a planet in chronological order,
+    as soon as each one is found, for the currently set ayanamsa.
+    """
+    step = SCAN_STEP_DAYS.get(planet, 5.0)
+    t_prev = jd_start
+    lon_prev, speed_prev = get_planet_lon_speed(t_prev, planet)
+
+    while t_prev < jd_end:
+        t_next = min(t_prev + step, jd_end)
+        lon_next, speed_next = get_planet_lon_speed(t_next, planet)
+
+        if (speed_prev < 0) != (speed_next < 0):
+            ## Direction changes within this step: split the step at the station
+            speed_func = lambda t: get_planet_lon_speed(t, planet)[1]
+            t_station = find_root(speed_func, t_prev, t_next, speed_prev, speed_next)
+            lon_station, _ = get_planet_lon_speed(t_station, planet)
+            yield from _ingresses_in_segment(planet, t_prev, t_station, lon_prev, lon_station, speed_prev < 0)
+            is_retrograde = speed_next < 0
+            yield TransitEvent(t_station, planet, RETROGRADE if is_retrograde else DIRECT,
+                               int(lon_station // 30), is_retrograde)
+            yield from _ingresses_in_segment(planet, t_station, t_next, lon_station, lon_next, is_retrograde)
+        else:
+            yield from _ingresses_in_segment(planet, t_prev, t_next, lon_prev, lon_next, speed_prev < 0)
+
+        t_prev, lon_prev, speed_prev = t_next, lon_next, speed_next
+
+def iter_planet_periods(planet: str, jd_start: float, jd_end: float):
+    """
+    Yields the TransitPeriods of a planet between two Julian Days (UT) in chronological order, each one as soon
+    as the event ending it is found, for the currently set ayanamsa.
+    """
+    current = get_initial_state(planet, jd_start)
+    for event in iter_planet_events(planet, jd_start, jd_end):
+        if event.SignIndex == current.SignIndex and event.isRetrograde == current.isRetrograde:
+            continue
+        yield TransitPeriod(planet, RASHIS[current.SignIndex], current.SignIndex,
+                            current.jd, event.jd, current.isRetrograde)
+        current = event
+    yield TransitPeriod(planet, RASHIS[current.SignIndex], current.SignIndex,
+                        current.jd, jd_end, current.isRetrograde)
+
+def get_transit_periods(planets: list, jd_start: float, jd_end: float, ayanamsa: str):
+    """
+    Computes the transit timeline of each planet between two Julian Days (UT). A new period starts whenever
+    the planet changes sign or changes between direct and retrograde motion.
+
+    Returns
+    =======
+    A dict mapping each planet name to a list of TransitPeriod named tuples, in chronological order.
+    The first period starts at `jd_start` and the last period ends at `jd_end`.
+    """
+    set_ayanamsa(ayanamsa)
+    return {planet: list(iter_planet_periods(planet, jd_start, jd_end)) for planet in planets}
+
+def iter_transit_periods(planets: list, jd_start: float, jd_end: float, ayanamsa: str):
+    """
+    Generator version of `get_transit_periods`: yields the TransitPeriods planet by planet (chronologically for
+    each planet) as they are found, so that long ranges can be streamed without holding the whole timeline.
+    """
+    for planet in planets:
+        set_ayanamsa(ayanamsa)
+        for period in iter_planet_periods(planet, jd_start, jd_end):
+            yield period
+            ## Other computations may have changed the sidereal mode while the generator was suspended
+            set_ayanamsa(ayanamsa)
@@ -1,4 +1,9 @@
 import pytz
+import bisect
+import functools
+import threading
+import numpy as np
+import swisseph as swe
 from timezonefinder import TimezoneFinder
 from datetime import datetime, date, timedelta
 from dateutil.relativedelta import relativedelta
@@ -140,15 +145,8 @@ def get_utc_offset(timezone_loc : str, date: datetime):
     Returns:
     - timedelta: UTC offset as a timedelta object.
     """
-    # Get the timezone object
-
-    timezone = pytz.timezone(timezone_loc)
-
-    # Localize the date to the timezone
-    localized_date = timezone.localize(date)
-
-    # Get the UTC offset in seconds
-    utc_offset_sec = localized_date.utcoffset().total_seconds()
+    # Get the UTC offset in seconds, from the cached transition table of the timezone
+    utc_offset_sec = get_utc_offset_table(timezone_loc).local_utcoffset(date).total_seconds()
     hours, remainder = divmod(abs(utc_offset_sec), 3600)
     minutes = remainder // 60
 
@@ -161,3 +159,127 @@ def get_utc_offset(timezone_loc : str, date: datetime):
 
 
     return utc_offset_str, utc_offset
+
+
+## Timezone resolution
+## Decimal places of the lat/lon used as timezone cache key (~11 m)
+TZ_CACHE_PRECISION = 4
+
+_TIMEZONE_FINDER = None
+_TIMEZONE_FINDER_LOCK = threading.Lock()
+
+def get_timezone_finder():
+    """Returns the process-wide TimezoneFinder, which is built (and loads its polygon data) on first use"""
+    global _TIMEZONE_FINDER
+    if _TIMEZONE_FINDER is None:
+        with _TIMEZONE_FINDER_LOCK:
+            if _TIMEZONE_FINDER is None:
+                _TIMEZONE_FINDER = TimezoneFinder()
+    return _TIMEZONE_FINDER
+
+@functools.lru_cache(maxsize=4096)
+def _timezone_at(latitude: float, longitude: float):
+    return get_timezone_finder().timezone_at(lat=latitude, lng=longitude)
+
+def timezone_at(latitude: float, longitude: float):
+    """Returns the timezone name of a location, cached by the lat/lon rounded to TZ_CACHE_PRECISION"""
+    return _timezone_at(round(latitude, TZ_CACHE_PRECISION), round(longitude, TZ_CACHE_PRECISION))
+
+def resolve_time_zone(latitude: float, longitude: float, tz: str = None):
+    """Returns the given timezone name, or looks it up from the latitude and longitude when not provided"""
+    return tz if tz else timezone_at(latitude, longitude)
+
+class UTCOffsetTable:
+    """
+    Sorted table of the UTC offset transitions (DST changes and standard offset changes) of a timezone,
+    so that the UTC offset of a UTC or local time is found with a binary search.
+    """
+
+    def __init__(self, timezone_loc: str):
+        self.timezone = pytz.timezone(timezone_loc)
+        utc_times = getattr(self.timezone, "_utc_transition_times", None)
+        if utc_times:
+            self.utc_times = list(utc_times)
+            self.offsets = [info[0] for info in self.timezone._transition_info]
+        else:
+            ## Fixed offset zone (Eg: UTC)
+            self.utc_times = [datetime.min]
+            self.offsets = [self.timezone.utcoffset(datetime(2000, 1, 1))]
+
+        ## numpy copies of the transition table for vectorized lookups
+        self.utc_times64 = np.array(self.utc_times[1:], dtype="datetime64[s]")
+        self.offsets64 = np.array([offset.total_seconds() for offset in self.offsets], dtype="int64").astype("timedelta64[s]")
+
+        ## Local time windows around each transition in which a local time is ambiguous or does not exist
+        self.local_window_starts, self.local_window_ends = [], []
+        for i in range(1, len(self.utc_times)):
+            offsets = (self.offsets[i - 1], self.offsets[i])
+            self.local_window_starts.append(self.utc_times[i] + min(offsets))
+            self.local_window_ends.append(self.utc_times[i] + max(offsets))
+
+    def utcoffsets(self, utc_dates: np.ndarray):
+        """Vectorized `utcoffset`: returns the UTC offsets (timedelta64[s] array) of a datetime64[s] array of UTC times"""
+        return self.offsets64[np.searchsorted(self.utc_times64, utc_dates, side="right")]
+
+    def utcoffset(self, utc_date: datetime):
+        """Returns the UTC offset (timedelta) in effect at a naive UTC datetime"""
+        return self.offsets[max(bisect.bisect_right(self.utc_times, utc_date) - 1, 0)]
+
+    def local_utcoffset(self, date: datetime):
+        """
+        Returns the UTC offset (timedelta) of a naive local datetime. Ambiguous and non-existent local times
+        around a transition are resolved by `pytz` localize, as before.
+        """
+        i = bisect.bisect_right(self.local_window_ends, date)
+        if i < len(self.local_window_starts) and self.local_window_starts[i] <= date:
+            return self.timezone.localize(date).utcoffset()
+        return self.offsets[i]
+
+@functools.lru_cache(maxsize=None)
+def get_utc_offset_table(timezone_loc: str):
+    """Returns the (process-wide, cached) UTCOffsetTable of a timezone"""
+    return UTCOffsetTable(timezone_loc)
+
+def local_datetime_to_jd(date: datetime, timezone_loc: str):
+    """
+    Converts a naive local datetime in the given timezone to a Julian Day number (UT).
+
+    Parameters:
+    - date (datetime): Local date and time (without tzinfo)
+    - timezone_loc (str) : The timezone location of the date (Eg: Asia/Kolkata)
+
+    Returns:
+    - float: Julian Day number in Universal Time
+    """
+    _, utc_offset = get_utc_offset(timezone_loc, date)
+    utc_date = date - utc_offset
+    hour = utc_date.hour + utc_date.minute / 60 + (utc_date.second + utc_date.microsecond / 1_000_000) / 3600
+    return swe.julday(utc_date.year, utc_date.month, utc_date.day, hour)
+
+def jd_to_local_datetime(jd: float, timezone_loc: str):
+    """
+    Converts a Julian Day number (UT) to a naive local datetime in the given timezone.
+
+    Parameters:
+    - jd (float): Julian Day number in Universal Time
+    - timezone_loc (str) : The timezone location to convert to (Eg: Asia/Kolkata)
+
+    Returns:
+    - datetime: Local date and time (without tzinfo), rounded to the second
+    """
+    year, month, day, hour = swe.revjul(jd)
+    utc_date = datetime(year, month, day) + timedelta(seconds=round(hour * 3600))
+    return utc_date + get_utc_offset_table(timezone_loc).utcoffset(utc_date)
+
+## Julian Day (UT) of the unix epoch, 1970-01-01 00:00 UTC
+UNIX_EPOCH_JD = 2440587.5
+
+def jds_to_local_datetime64(jds, timezone_loc: str = None):
+    """
+    Vectorized `jd_to_local_datetime`: converts an array of Julian Days (UT) to local times, as a
+    numpy datetime64[s] array rounded to the second. A `timezone_loc` of None returns UTC times.
+    """
+    utc_dates = np.round((np.asarray(jds, dtype=float) - UNIX_EPOCH_JD) * 86400).astype("int64").astype("datetime64[s]")
+    if not timezone_loc:
+        return utc_dates
+    return utc_dates + get_utc_offset_table(timezone_loc).utcoffsets(utc_dates)
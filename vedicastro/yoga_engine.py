@@ -0,0 +1,160 @@
+"""
+Declarative yoga rule engine.
+
+The yoga rules of `yogas` and `extended_yogas` are registered in `YOGA_RULES` with the `yoga_rule` decorator.
+A rule is a function of a `ChartIndex`, yielding a {"name", "description"} dict for each occurrence of its yoga.
+The `ChartIndex` is built once per chart: the lord of each house, the house and sign of each planet, and
+`bitboard.ChartBitboard`s of the houses and of the signs. Houses are encoded as 12 bit masks (bit 0 = 1st house),
+so placement tests like "in a kendra" are a single bit test. `evaluate_yogas` runs every rule of the requested
+categories in one pass over the registry, optionally recording the time taken by each rule.
+"""
+import time
+import collections
+from .constants import RASHIS, SIGN_LORDS
+from .bitboard import ChartBitboard, lordship_masks, positions_mask, FULL_MASK, KENDRAS, TRIKONAS
+
+## Categories of the yoga rules, in the order of the results
+YOGA_CATEGORIES = ["raj_yogas", "dhana_yogas", "pancha_mahapurusha_yogas", "nabhasa_yogas", "other_yogas",
+                   "additional_benefic_yogas", "intellectual_yogas", "malefic_yogas"]
+
+CLASSICAL_PLANETS = ["Sun", "Moon", "Mars", "Mercury", "Jupiter", "Venus", "Saturn"]
+
+def houses_mask(*houses: int):
+    """12 bit mask of house numbers (1 - 12), bit 0 is the 1st house"""
+    return positions_mask(*(house - 1 for house in houses))
+
+def in_houses(house: int, mask: int):
+    """True if a house number (1 - 12) is in a houses mask"""
+    return house is not None and (mask >> (house - 1)) & 1 == 1
+
+def house_from(house: int, count: int):
+    """The `count`th house counted from `house` (Eg: house_from(12, 2) is 1, house_from(5, 1) is 5)"""
+    return (house + count - 2) % 12 + 1
+
+## Counted from the 1st house, the counts masks of the bitboard are houses masks
+KENDRAS_AND_TRIKONAS = KENDRAS | TRIKONAS
+ALL_HOUSES = FULL_MASK
+
+## Sign indices (0 = Aries) of the exaltation, debilitation and own signs of the classical planets
+EXALTATION_SIGNS = {"Sun": 0, "Moon": 1, "Mercury": 5, "Venus": 11, "Mars": 9, "Jupiter": 3, "Saturn": 6}
+DEBILITATION_SIGNS = {"Sun": 6, "Moon": 7, "Mars": 3, "Mercury": 11, "Jupiter": 9, "Venus": 5, "Saturn": 0}
+OWN_SIGNS = {planet: [sign for sign, lord in enumerate(SIGN_LORDS) if lord == planet] for planet in CLASSICAL_PLANETS}
+
+
+class ChartIndex:
+    """
+    Precomputed lookups of a chart used by all the yoga rules.
+
+    Parameters
+    ==========
+    planet_positions: dict of planet name to a dict with its "HouseNr" and "Rasi" (and optionally "isRetroGrade")
+    houses_data: dict of house number to a dict with its "RasiLord"
+    """
+
+    def __init__(self, planet_positions: dict, houses_data: dict):
+        ## Planets in the order given, and their index into the per planet tuples and bitmasks
+        self.planets = tuple(planet_positions)
+        self.planet_index = {planet: index for index, planet in enumerate(self.planets)}
+        self.house = tuple(data["HouseNr"] for data in planet_positions.values())
+        self.sign = tuple(RASHIS.index(data["Rasi"]) for data in planet_positions.values())
+        self.retrograde = tuple(bool(data.get("isRetroGrade", False)) for data in planet_positions.values())
+        ## Lord of each house number (index 0 is unused), None for houses missing from houses_data
+        self.house_lords = (None,) + tuple(houses_data[house]["RasiLord"] if house in houses_data else None
+                                           for house in range(1, 13))
+        ## Bitboards of the houses (bit 0 = 1st house) and of the signs, with the same planet indices
+        owned_houses = lordship_masks((house, lord) for house, lord in enumerate(self.house_lords[1:]) if lord)
+        self.houses = ChartBitboard({planet: house - 1 for planet, house in zip(self.planets, self.house)}, owned_houses)
+        self.signs = ChartBitboard(dict(zip(self.planets, self.sign)))
+        ## Bitmasks of the planets (bit = planet index) in each house (index 0 is unused) and in each sign
+        self.house_occupants = (0,) + self.houses.occupants_of
+        self.sign_occupants = self.signs.occupants_of
+
+    def __contains__(self, planet: str):
+        return planet in self.planet_index
+
+    def house_of(self, planet: str):
+        """House number of a planet, or None if the planet is not in the chart"""
+        index = self.planet_index.get(planet)
+        return None if index is None else self.house[index]
+
+    def sign_of(self, planet: str):
+        """Sign index (0 = Aries) of a planet, or None if the planet is not in the chart"""
+        index = self.planet_index.get(planet)
+        return None if index is None else self.sign[index]
+
+    def lord_of(self, house: int):
+        return self.house_lords[house]
+
+    def lords_of(self, houses: list):
+        """Lords of a list of houses, skipping the unknown ones (duplicates are kept)"""
+        return [self.house_lords[house] for house in houses if self.house_lords[house]]
+
+    def distance(self, planet: str, other: str):
+        """Number of houses from a planet to another, 0 when they are in the same house (the 4th from is 3)"""
+        return (self.house_of(other) - self.house_of(planet)) % 12
+
+    def planets_mask(self, planets: list):
+        """Bitmask of the planets of a list which are in the chart"""
+        return self.houses.planets_mask(planets)
+
+    def occupants_mask(self, houses: int):
+        """Bitmask of the planets in a houses mask"""
+        return self.houses.occupants(houses)
+
+    def planets_in(self, mask: int):
+        """Names of the planets of a bitmask, in the chart order"""
+        return self.houses.planets_in(mask)
+
+    def occupied_houses_mask(self, planets_mask: int):
+        """Houses mask of the houses occupied by the planets of a bitmask"""
+        return self.houses.occupied(planets_mask)
+
+    def houses_from(self, planet: str, counts: int):
+        """Houses mask of a counts mask counted from the house of a planet (Eg: houses_from("Moon", KENDRAS))"""
+        return self.houses.from_planet(planet, counts)
+
+
+YogaRule = collections.namedtuple("YogaRule", ["name", "category", "func"])
+
+## Registered rules, in the order of the results within each category
+YOGA_RULES = []
+
+def yoga_rule(category: str, name: str = None):
+    """Decorator registering a rule function `func(chart_index)` yielding the yogas it finds"""
+    if category not in YOGA_CATEGORIES:
+        raise ValueError(f"Unknown yoga category {category}")
+    def register(func):
+        YOGA_RULES.append(YogaRule(name or func.__name__, category, func))
+        return func
+    return register
+
+def evaluate_yogas(chart_index: ChartIndex, categories: list = None, timings: dict = None):
+    """
+    Evaluates the registered yoga rules of a chart.
+
+    Parameters
+    ==========
+    chart_index: ChartIndex of the chart
+    categories: categories of rules to evaluate (Eg: ["raj_yogas", "dhana_yogas"]). None evaluates all of them.
+    timings: optional dict, filled with the time taken by each rule in milliseconds, keyed by "category.rule"
+
+    Returns
+    =======
+    dict of category to the list of yogas found, for each requested category in YOGA_CATEGORIES order
+    """
+    ## The rules are registered when their modules are imported
+    from . import yogas, extended_yogas
+
+    categories = YOGA_CATEGORIES if categories is None else categories
+    unknown = [category for category in categories if category not in YOGA_CATEGORIES]
+    if unknown:
+        raise ValueError(f"Unknown yoga categories {unknown}. Available: {', '.join(YOGA_CATEGORIES)}")
+    results = {category: [] for category in YOGA_CATEGORIES if category in categories}
+    for rule in YOGA_RULES:
+        if rule.category not in results:
+            continue
+        start = time.perf_counter()
+        results[rule.category].extend(rule.func(chart_index))
+        if timings is not None:
+            timings[f"{rule.category}.{rule.name}"] = (time.perf_counter() - start) * 1000
+    return results
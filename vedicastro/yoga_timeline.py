@@ -0,0 +1,99 @@
+"""
+Time-range scanner of the yogas formed by the transiting planets.
+
+The yoga rules only depend on the sign and the house of each planet, so their truth values only change when a
+planet changes sign. Instead of sampling every day, the scanner walks the sign ingress events of the transit
+timelines (`transit_engine` / `transit_cache`) in time order and evaluates the rules of the `yoga_engine` once
+per configuration of signs between two ingresses. Houses are counted from the natal ascendant sign (whole sign
+houses), so a house change is always a sign change. Configurations seen before (Eg: the Moon coming back to a
+sign while the slow planets stay) reuse their evaluation.
+
+The result is a list of YogaInterval: the instants (Julian Days, UT) at which each yoga starts and stops.
+"""
+import collections
+from .constants import RASHIS, SIGN_LORDS
+from .yoga_engine import ChartIndex, evaluate_yogas
+
+## Transiting planets of the yoga rules, in the order of the ChartIndex (as in the natal yogas)
+TRANSIT_YOGA_PLANETS = ["Sun", "Moon", "Mars", "Mercury", "Jupiter", "Venus", "Saturn", "Rahu", "Ketu"]
+
+YogaInterval = collections.namedtuple("YogaInterval", ["category", "name", "description", "start_jd", "end_jd"])
+SignChange = collections.namedtuple("SignChange", ["jd", "PlanetName", "SignIndex"])
+
+def get_sign_changes(transit_periods: dict):
+    """
+    Returns the SignChanges of the planets, in time order, from their TransitPeriod lists (Eg: of
+    `transit_cache.get_transit_periods`). Periods only differing by retrograde motion are merged.
+    The first period of each planet gives its sign at the start of the range.
+    """
+    changes = []
+    for planet, periods in transit_periods.items():
+        sign = None
+        for period in periods:
+            if period.SignIndex != sign:
+                changes.append(SignChange(period.start_jd, planet, period.SignIndex))
+                sign = period.SignIndex
+    changes.sort(key=lambda change: change.jd)
+    return changes
+
+def get_transit_chart_index(signs: dict, ascendant_sign: int):
+    """ChartIndex of planets in signs (sign indices, 0 = Aries), in the whole sign houses of an ascendant sign"""
+    planet_positions = {planet: {"HouseNr": (sign - ascendant_sign) % 12 + 1, "Rasi": RASHIS[sign]}
+                        for planet, sign in signs.items()}
+    houses_data = {house: {"RasiLord": SIGN_LORDS[(ascendant_sign + house - 1) % 12]} for house in range(1, 13)}
+    return ChartIndex(planet_positions, houses_data)
+
+def scan_yoga_timeline(transit_periods: dict, ascendant_sign: int, jd_start: float, jd_end: float,
+                       categories: list = None):
+    """
+    Finds the time intervals in which the transiting planets form each yoga.
+
+    Parameters
+    ==========
+    transit_periods: dict of planet name to its TransitPeriod list over [jd_start, jd_end], Eg: from
+                     `transit_cache.get_transit_periods(TRANSIT_YOGA_PLANETS, jd_start, jd_end, ayanamsa)`
+    ascendant_sign: sign index (0 = Aries) of the natal ascendant, the 1st house of the transits
+    jd_start, jd_end: Julian Days (UT) of the range
+    categories: yoga categories to evaluate (see `yoga_engine.YOGA_CATEGORIES`), all of them by default
+
+    Returns
+    =======
+    list of YogaInterval sorted by start, one per continuous run of a yoga. A yoga (category, name and
+    description) active at the start or at the end of the range is cut at jd_start / jd_end.
+    """
+    planets = [planet for planet in TRANSIT_YOGA_PLANETS if planet in transit_periods]
+    planets += [planet for planet in transit_periods if planet not in planets]
+    changes = get_sign_changes(transit_periods)
+
+    signs = {}
+    evaluated = {}          # signs of the planets -> yogas formed
+    active = {}             # yoga -> start jd
+    intervals = []
+    index = 0
+    while index < len(changes):
+        ## Apply all the ingresses of the same instant before evaluating
+        jd = changes[index].jd
+        while index < len(changes) and changes[index].jd == jd:
+            signs[changes[index].PlanetName] = changes[index].SignIndex
+            index += 1
+        if len(signs) < len(planets):
+            continue
+
+        configuration = tuple(signs[planet] for planet in planets)
+        yogas = evaluated.get(configuration)
+        if yogas is None:
+            chart_index = get_transit_chart_index({planet: signs[planet] for planet in planets}, ascendant_sign)
+            yogas = evaluated[configuration] = dict.fromkeys(
+                (category, yoga["name"], yoga["description"])
+                for category, category_yogas in evaluate_yogas(chart_index, categories).items()
+                for yoga in category_yogas)
+
+        for yoga in [yoga for yoga in active if yoga not in yogas]:
+            intervals.append(YogaInterval(*yoga, max(active.pop(yoga), jd_start), jd))
+        for yoga in yogas:
+            active.setdefault(yoga, jd)
+
+    for yoga, start_jd in active.items():
+        intervals.append(YogaInterval(*yoga, max(start_jd, jd_start), jd_end))
+    intervals.sort(key=lambda interval: interval.start_jd)
+    return intervals